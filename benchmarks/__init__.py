@@ -0,0 +1,3 @@
+"""
+Benchmarks for the assessor package, driven by a deterministic fake LLM gateway.
+"""
@@ -0,0 +1,103 @@
+"""
+Deterministic fake LLM gateway for benchmarking the assessor pipeline without a network.
+"""
+
+import random
+import threading
+import time
+
+from mojentic.llm.gateways.llm_gateway import LLMGateway
+from mojentic.llm.gateways.models import LLMGatewayResponse
+
+from assessor.config import Config
+
+
+class FakeGatewayError(RuntimeError):
+    """Raised by FakeGateway to simulate a failed request."""
+
+
+class FakeGateway(LLMGateway):
+    """
+    LLM gateway that answers every request with synthetic code after a simulated delay.
+
+    The delay is a base latency drawn from a normal distribution plus the time needed to
+    "generate" the response at a fixed token rate. All randomness comes from a seeded generator,
+    so the same settings always produce the same sequence of delays and failures.
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        tokens_per_second: float = 0.0,
+        output_tokens: int = 200,
+        failure_rate: float = 0.0,
+        seed: int = 0
+    ):
+        """
+        Initialize the gateway.
+
+        Args:
+            latency_ms: Mean time before the first token
+            jitter_ms: Standard deviation of the time before the first token
+            tokens_per_second: Simulated generation speed (0 means instantaneous)
+            output_tokens: Number of tokens in every response
+            failure_rate: Probability that a request raises FakeGatewayError
+            seed: Seed for the latency and failure draws
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.tokens_per_second = tokens_per_second
+        self.output_tokens = output_tokens
+        self.failure_rate = failure_rate
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def complete(self, model, messages, **kwargs) -> LLMGatewayResponse:
+        """Answer a request with synthetic code after the simulated delay."""
+        with self._lock:
+            self.requests += 1
+            latency = max(0.0, self._random.gauss(self.latency_ms, self.jitter_ms)) / 1000
+            failed = self._random.random() < self.failure_rate
+
+        generation = self.output_tokens / self.tokens_per_second if self.tokens_per_second else 0
+        time.sleep(latency + generation)
+
+        if failed:
+            raise FakeGatewayError(f"Simulated failure for {model}")
+
+        return LLMGatewayResponse(
+            content=_synthetic_response(model, self.output_tokens), object=None, tool_calls=[])
+
+
+class FakeConfig(Config):
+    """Config whose OpenAI and Ollama gateways are FakeGateway instances."""
+
+    def __init__(self, gateway: FakeGateway, **kwargs):
+        """
+        Initialize the configuration.
+
+        Args:
+            gateway: The fake gateway serving every model
+            **kwargs: Other Config settings
+        """
+        super().__init__(openai_api_key="fake", **kwargs)
+        self.gateway = gateway
+
+    def get_openai_gateway(self) -> FakeGateway:
+        """Get the fake gateway in place of the OpenAI gateway."""
+        return self.gateway
+
+    def get_ollama_gateway(self) -> FakeGateway:
+        """Get the fake gateway in place of the Ollama gateway."""
+        return self.gateway
+
+
+def _synthetic_response(model: str, output_tokens: int) -> str:
+    body = "\n".join(f"    total += {index}" for index in range(max(output_tokens // 4, 1)))
+    return (
+        f"<think>Planning the answer as {model}.</think>"
+        f"Here is the implementation.\n\n```python\ndef compute():\n    total = 0\n{body}\n"
+        f"    return total\n```\n"
+    )
@@ -0,0 +1,210 @@
+"""
+Pipeline benchmark for the assessor package.
+
+Builds synthetic prompt folders of increasing size and runs process_folder, generate_assessment
+and generate_cross_prompt_assessment against a FakeGateway, reporting wall-clock time, throughput,
+peak RSS (of the benchmark process so far) and per-phase timings. Use it to compare concurrency or
+caching changes before rolling them out.
+
+Usage:
+    python -m benchmarks.pipeline_benchmark [options]
+
+Options:
+    --sizes N [N ...]       Numbers of prompt files to benchmark (default: 10 100 1000)
+    --openai-models N       Number of fake OpenAI models (default: 2)
+    --ollama-models N       Number of fake Ollama models (default: 2)
+    --compare-styles N      Number of prompt styles in the cross-prompt assessment (default: 2)
+    --latency-ms MS         Mean simulated time before the first token (default: 0)
+    --jitter-ms MS          Standard deviation of that time (default: 0)
+    --tokens-per-second N   Simulated generation speed, 0 for instantaneous (default: 0)
+    --output-tokens N       Tokens in every simulated response (default: 200)
+    --failure-rate P        Probability that a simulated request fails; a failure ends the
+                            run just like a real provider error would (default: 0)
+    --seed N                Seed for the simulated latencies and failures (default: 0)
+    --json PATH             Also write the results as JSON to PATH
+
+Example usage:
+    # Measure the assessor's own overhead up to 10,000 prompt files
+    python -m benchmarks.pipeline_benchmark --sizes 10 100 1000 10000
+
+    # Measure scheduling efficiency with realistic provider latency
+    python -m benchmarks.pipeline_benchmark --sizes 10 100 --latency-ms 400 --jitter-ms 150 \\
+        --tokens-per-second 60
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import pathlib
+import resource
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from assessor.assessment import generate_assessment, generate_cross_prompt_assessment
+from assessor.processor import process_folder
+
+from benchmarks.fake_gateway import FakeConfig, FakeGateway
+
+
+def create_prompt_folder(folder: pathlib.Path, prompt_count: int) -> List[str]:
+    """
+    Fill a folder with synthetic prompt files following the pattern "prompt-{style}.md".
+
+    Args:
+        folder: Folder to create the prompt files in
+        prompt_count: Number of prompt files to create
+
+    Returns:
+        list: The prompt styles created
+    """
+    styles = [f"style{index:05d}" for index in range(prompt_count)]
+    for style in styles:
+        (folder / f"prompt-{style}.md").write_text(
+            f"Write a Python function for task {style}, following our {style} conventions.\n")
+    return styles
+
+
+def run_benchmark(prompt_count: int, settings: argparse.Namespace) -> Dict:
+    """
+    Run the whole pipeline over a synthetic folder and measure each phase.
+
+    Args:
+        prompt_count: Number of prompt files in the synthetic folder
+        settings: Parsed command line options
+
+    Returns:
+        dict: Timings, throughput and resource usage for the run
+    """
+    gateway = FakeGateway(
+        latency_ms=settings.latency_ms,
+        jitter_ms=settings.jitter_ms,
+        tokens_per_second=settings.tokens_per_second,
+        output_tokens=settings.output_tokens,
+        failure_rate=settings.failure_rate,
+        seed=settings.seed
+    )
+    config = FakeConfig(
+        gateway,
+        openai_models=[f"fake-openai-{index}" for index in range(settings.openai_models)],
+        ollama_models=[f"fake-ollama:{index}" for index in range(settings.ollama_models)],
+        assessment_model="fake-assessor"
+    )
+
+    phases = {}
+    with tempfile.TemporaryDirectory() as folder_name:
+        folder = pathlib.Path(folder_name)
+        styles = create_prompt_folder(folder, prompt_count)
+        started = time.perf_counter()
+
+        # The pipeline prints a line per file; keep it out of the report
+        with contextlib.redirect_stdout(io.StringIO()):
+            phase_started = time.perf_counter()
+            output_files = process_folder(
+                str(folder),
+                use_openai=settings.openai_models > 0,
+                use_ollama=settings.ollama_models > 0,
+                config=config
+            )
+            phases["process_folder"] = time.perf_counter() - phase_started
+
+            source_file, outputs = next(iter(output_files.items()))
+            phase_started = time.perf_counter()
+            generate_assessment(source_file, outputs, config)
+            phases["generate_assessment"] = time.perf_counter() - phase_started
+
+            phase_started = time.perf_counter()
+            generate_cross_prompt_assessment(
+                str(folder), styles[:settings.compare_styles], config)
+            phases["generate_cross_prompt_assessment"] = time.perf_counter() - phase_started
+
+        wall_clock = time.perf_counter() - started
+
+    generations = prompt_count * (settings.openai_models + settings.ollama_models)
+    return {
+        "prompt_files": prompt_count,
+        "generations": generations,
+        "requests": gateway.requests,
+        "wall_clock_seconds": wall_clock,
+        "generations_per_second": generations / phases["process_folder"],
+        "peak_rss_mb": _peak_rss_mb(),
+        "phase_seconds": phases,
+    }
+
+
+def format_report(results: List[Dict]) -> str:
+    """
+    Format benchmark results as a fixed-width table.
+
+    Args:
+        results: Results from run_benchmark
+
+    Returns:
+        str: The report table
+    """
+    header = (
+        f"{'prompts':>8} {'requests':>9} {'wall s':>9} {'gen/s':>9} {'peak MB':>8} "
+        f"{'process s':>10} {'assess s':>9} {'cross s':>9}"
+    )
+    rows = [header, "-" * len(header)]
+    for result in results:
+        phases = result["phase_seconds"]
+        rows.append(
+            f"{result['prompt_files']:>8} {result['requests']:>9} "
+            f"{result['wall_clock_seconds']:>9.3f} {result['generations_per_second']:>9.1f} "
+            f"{result['peak_rss_mb']:>8.1f} {phases['process_folder']:>10.3f} "
+            f"{phases['generate_assessment']:>9.3f} "
+            f"{phases['generate_cross_prompt_assessment']:>9.3f}"
+        )
+    return "\n".join(rows)
+
+
+def main():
+    """
+    Main entry point for the pipeline benchmark.
+    """
+    parser = argparse.ArgumentParser(
+        description='Benchmark the assessor pipeline against a fake gateway')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000],
+                        help='Numbers of prompt files to benchmark')
+    parser.add_argument('--openai-models', type=int, default=2, help='Number of fake OpenAI models')
+    parser.add_argument('--ollama-models', type=int, default=2, help='Number of fake Ollama models')
+    parser.add_argument('--compare-styles', type=int, default=2,
+                        help='Number of prompt styles in the cross-prompt assessment')
+    parser.add_argument('--latency-ms', type=float, default=0.0,
+                        help='Mean simulated time before the first token')
+    parser.add_argument('--jitter-ms', type=float, default=0.0,
+                        help='Standard deviation of the simulated time before the first token')
+    parser.add_argument('--tokens-per-second', type=float, default=0.0,
+                        help='Simulated generation speed, 0 for instantaneous')
+    parser.add_argument('--output-tokens', type=int, default=200,
+                        help='Tokens in every simulated response')
+    parser.add_argument('--failure-rate', type=float, default=0.0,
+                        help='Probability that a simulated request fails')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Seed for the simulated latencies and failures')
+    parser.add_argument('--json', type=str, help='Also write the results as JSON to this path')
+
+    settings = parser.parse_args()
+
+    results = []
+    for prompt_count in settings.sizes:
+        print(f"Benchmarking {prompt_count} prompt files...", file=sys.stderr)
+        results.append(run_benchmark(prompt_count, settings))
+
+    print(format_report(results))
+
+    if settings.json:
+        pathlib.Path(settings.json).write_text(json.dumps(results, indent=2))
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+if __name__ == "__main__":
+    main()
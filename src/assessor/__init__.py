@@ -1,19 +1,52 @@
 """
 Assessor package for processing prompt files with various LLM models and generating assessments.
+
+The public functions are imported from their modules on first access, so importing the package
+(or one of its lightweight modules) does not load the LLM clients.
 """
 
-from assessor.assessment import generate_assessment, generate_cross_prompt_assessment
-from assessor.cli import main
-from assessor.file_processor import get_available_prompt_styles, get_prompt_files
-from assessor.processor import process_folder
-from assessor.utils import strip_thinking
-
-__all__ = [
-    'process_folder',
-    'generate_assessment',
-    'generate_cross_prompt_assessment',
-    'get_available_prompt_styles',
-    'get_prompt_files',
-    'strip_thinking',
-    'main',
-]
\ No newline at end of file
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from assessor.assessment import (
+        agenerate_assessment,
+        agenerate_cross_prompt_assessment,
+        generate_assessment,
+        generate_cross_prompt_assessment,
+    )
+    from assessor.cli import main
+    from assessor.file_processor import get_available_prompt_styles, get_prompt_files
+    from assessor.llm_handler import aprocess_with_model, process_with_model
+    from assessor.processor import aprocess_folder, process_folder
+    from assessor.utils import strip_thinking
+
+# Module each public name is imported from
+_EXPORTS = {
+    'process_folder': 'assessor.processor',
+    'aprocess_folder': 'assessor.processor',
+    'process_with_model': 'assessor.llm_handler',
+    'aprocess_with_model': 'assessor.llm_handler',
+    'generate_assessment': 'assessor.assessment',
+    'agenerate_assessment': 'assessor.assessment',
+    'generate_cross_prompt_assessment': 'assessor.assessment',
+    'agenerate_cross_prompt_assessment': 'assessor.assessment',
+    'get_available_prompt_styles': 'assessor.file_processor',
+    'get_prompt_files': 'assessor.file_processor',
+    'strip_thinking': 'assessor.utils',
+    'main': 'assessor.cli',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted([*globals(), *__all__])
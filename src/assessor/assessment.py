@@ -2,33 +2,78 @@
 Assessment generation utilities for the assessor module.
 """
 
-import re
-from collections import defaultdict
+import asyncio
+from collections import Counter
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import Dict, Iterable, List, Optional, Union
 
-from mojentic.llm import MessageBuilder
+from mojentic.llm.gateways.models import LLMMessage
 
+from assessor.build_manifest import BuildManifest
 from assessor.config import default_config, Config
 from assessor.file_gateway import FileGateway
+from assessor.folder_index import SAMPLE_PATTERN, FolderIndex, parse_file_name
 from assessor.llm_handler import get_assessment_llm
-from assessor.utils import strip_thinking
+from assessor.metrics import RunMetrics, measure
+from assessor.run_journal import RunJournal
+from assessor.similarity import group_similar
+from assessor.token_budget import estimate_tokens, plan_groups
+from assessor.utils import run_in_thread, strip_thinking
+
+# Version of the assessment prompts below; bump it when they change so incremental runs
+# regenerate the assessments built from the old wording
+ASSESSMENT_TEMPLATE_VERSION = 3
+
+# Instructions every per-source assessment request starts with. They name no file, so requests
+# share a prefix the provider can serve from its prompt cache; the groups of one source's
+# outputs share the source file after it as well
+ASSESSMENT_GUIDELINES = """
+    Please assess the quality and differences between the outputs generated for a source 
+    document. The source document comes first, followed by the outputs.
+    In the assessment refer to each output by its filename.
+    """
+
+
+class CrossPromptComparison:
+    """Prompt styles to compare for each model, and the cross-prompt assessments written so far."""
+
+    def __init__(self, prompt_styles: List[str]):
+        """
+        Initialize the comparison.
+
+        Args:
+            prompt_styles: List of prompt styles to compare (e.g., ["plain", "fancy"])
+        """
+        self.prompt_styles = prompt_styles
+        self.assessment_files: Dict[str, Path] = {}
 
 
 def generate_assessment(
     source_file: Union[str, Path], 
     output_files: List[Union[str, Path]],
     config: Optional[Config] = None,
-    file_gateway: Optional[FileGateway] = None
+    file_gateway: Optional[FileGateway] = None,
+    metrics: Optional[RunMetrics] = None,
+    group_concurrency: Optional[int] = None
 ):
     """
     Generate an assessment for a source file and its outputs.
 
+    Near-identical outputs are compared locally first, and only one representative of each group
+    is attached; the request lists the outputs each representative stands for. When the source
+    file and representatives exceed the configured assessment token budget, they are split into
+    groups that each fit, the groups are assessed in parallel and a final request merges the
+    partial assessments.
+
     Args:
         source_file: Path to the source file
         output_files: List of paths to output files
         config: Optional Config instance (defaults to default_config)
         file_gateway: Optional FileGateway instance (defaults to a new instance)
+        metrics: Optional RunMetrics the timings and token counts of each request are added to
+        group_concurrency: Optional number of groups assessed at once (defaults to
+                           config.assessment_concurrency); pass 1 when the call already holds
+                           one of the caller's assessment slots, so the caller's cap holds
 
     Returns:
         str: The assessment text
@@ -42,30 +87,329 @@ def generate_assessment(
     # Use provided file gateway or create a new one
     file_gateway = file_gateway or FileGateway()
 
-    # Create assessment prompt
-    assessment_prompt = f"""
-    Please assess the quality and differences between the following outputs generated for the 
-    source document '{Path(source_file).name}'.
-    In the assessment refer to each output by its filename.
+    # Only attach one output of each group of near-identical outputs
+    similar_outputs = group_similar_outputs(output_files, config, file_gateway)
+    representatives = list(similar_outputs)
+
+    groups = plan_assessment_groups(
+        source_file, representatives, config, file_gateway, similar_outputs)
+    if len(groups) == 1:
+        return _assess(
+            build_assessment_message(source_file, representatives, file_gateway, similar_outputs),
+            config, metrics, "assessment", source_file)
+
+    # Assess each group of outputs separately, then merge the partial assessments
+    partial_assessments = asyncio.run(_aassess_groups(
+        source_file, groups, config, file_gateway, metrics, similar_outputs,
+        group_concurrency or config.assessment_concurrency))
+    return _assess(
+        build_merge_message(source_file, groups, partial_assessments), config, metrics,
+        "merge", source_file)
+
+def plan_assessment_groups(
+    source_file: Union[str, Path],
+    output_files: List[Union[str, Path]],
+    config: Config,
+    file_gateway: FileGateway,
+    similar_outputs: Optional[Dict[Union[str, Path], List[Union[str, Path]]]] = None
+) -> List[List[Union[str, Path]]]:
+    """
+    Split a source file's outputs into groups whose assessment requests fit the token budget.
+
+    Args:
+        source_file: Path to the source file
+        output_files: List of paths to output files
+        config: Config instance providing the assessment token budget
+        file_gateway: FileGateway instance used to read the files
+        similar_outputs: Optional dictionary mapping output files to the near-identical outputs
+                         they stand for, listed in every request's instructions
+
+    Returns:
+        list: Groups of output files, in order; a single group when one request fits
+    """
+    fixed_tokens = (
+        estimate_tokens(ASSESSMENT_GUIDELINES)
+        # Every group's note lists at most the left-out outputs of all the representatives
+        + estimate_tokens(assessment_prompt(source_file, output_files, similar_outputs))
+        + estimate_tokens(file_section(source_file, file_gateway))
+    )
+    output_tokens = [
+        estimate_tokens(file_section(output_file, file_gateway)) for output_file in output_files
+    ]
+    groups = plan_groups(output_tokens, config.assessment_token_budget, fixed_tokens)
+    return [[output_files[index] for index in group] for group in groups]
+
+def group_similar_outputs(
+    output_files: List[Union[str, Path]],
+    config: Config,
+    file_gateway: FileGateway
+) -> Dict[Union[str, Path], List[Union[str, Path]]]:
+    """
+    Group near-identical outputs under the first output of each group, which represents them.
+
+    Args:
+        output_files: List of paths to output files
+        config: Config instance providing the similarity threshold
+        file_gateway: FileGateway instance used to read the files
+
+    Returns:
+        dict: Each representative output, in order, mapped to the other outputs of its group
+    """
+    contents = [file_gateway.read_file(output_file) for output_file in output_files]
+    groups = group_similar(contents, config.similarity_threshold)
+    return {
+        output_files[group[0]]: [output_files[index] for index in group[1:]] for group in groups
+    }
+
+def assessment_prompt(
+    source_file: Union[str, Path],
+    output_files: List[Union[str, Path]] = (),
+    similar_outputs: Optional[Dict[Union[str, Path], List[Union[str, Path]]]] = None
+) -> str:
+    """
+    Get the instructions of one assessment request, which follow the guidelines and source file.
+
+    Args:
+        source_file: Path to the source file
+        output_files: Optional list of the output files, used to explain replicate samples
+        similar_outputs: Optional dictionary mapping attached outputs to the near-identical
+                         outputs they stand for
+
+    Returns:
+        str: The request's instructions
+    """
+    similar_outputs = similar_outputs or {}
+    left_out = [output for outputs in similar_outputs.values() for output in outputs]
+    return f"""
+    The following outputs were generated for the source document '{Path(source_file).name}'.
+    {replicates_note([*output_files, *left_out])}{similar_outputs_note(similar_outputs)}"""
+
+def replicates_note(output_files: List[Union[str, Path]]) -> str:
     """
+    Explain the replicate samples among a set of outputs to the assessment model.
 
-    mb = MessageBuilder(assessment_prompt)
-    mb.add_file(source_file)
-    mb.add_files(*output_files)
+    Args:
+        output_files: List of paths to output files
 
-    llm = get_assessment_llm(config)
-    assessment = llm.generate(messages=[mb.build()])
+    Returns:
+        str: Instructions for assessing replicates as a group, or "" if there are none
+    """
+    # Replicates are outputs of one style and model numbered -s1, -s2, ...; a lone "-s{k}"
+    # output is a model whose name happens to end that way
+    replicates = Counter()
+    for output_file in output_files:
+        record = parse_file_name(output_file)
+        replicate = SAMPLE_PATTERN.match(record.model) if record and record.model else None
+        if replicate:
+            replicates[record.style, replicate.group("model")] += 1
+    if not any(count > 1 for count in replicates.values()):
+        return ""
+    return (
+        "Outputs whose filenames end in -s1, -s2, ... are independent samples of the same "
+        "model and prompt. Judge each model by its samples as a group, and note how much the "
+        "samples vary.\n"
+    )
+
+def similar_outputs_note(similar_outputs: Dict[Union[str, Path], List[Union[str, Path]]]) -> str:
+    """
+    Explain the near-identical outputs left out of an assessment request to the assessment model.
 
-    # Strip out thinking text
-    assessment = strip_thinking(assessment)
+    Args:
+        similar_outputs: Dictionary mapping attached outputs to the outputs they stand for
+
+    Returns:
+        str: The left-out outputs listed under their representatives, or "" if there are none
+    """
+    lines = [
+        f"- {Path(representative).name}: {', '.join(Path(output).name for output in outputs)}"
+        for representative, outputs in similar_outputs.items() if outputs
+    ]
+    if not lines:
+        return ""
+    return (
+        "The outputs listed after each attached output below are near-identical to it and were "
+        "not attached. Assess them as sharing its strengths and weaknesses, and include them in "
+        "any ranking or comparison.\n" + "\n".join(lines) + "\n"
+    )
+
+def build_assessment_message(
+    source_file: Union[str, Path],
+    output_files: List[Union[str, Path]],
+    file_gateway: Optional[FileGateway] = None,
+    similar_outputs: Optional[Dict[Union[str, Path], List[Union[str, Path]]]] = None
+):
+    """
+    Build the message asking the assessment model to compare a source file's outputs.
+
+    The message starts with the shared guidelines and the source file, and ends with the parts
+    that differ between requests, so consecutive requests share as long a prefix as possible.
+
+    Args:
+        source_file: Path to the source file
+        output_files: List of paths to output files
+        file_gateway: Optional FileGateway instance used to read the files (defaults to a new
+                      instance; pass a CachingFileGateway to read each file once per run)
+        similar_outputs: Optional dictionary mapping output files to the near-identical outputs
+                         they stand for, which are listed but not attached
+
+    Returns:
+        LLMMessage: The assessment request, with the source and output files attached
+    """
+    file_gateway = file_gateway or FileGateway()
+
+    # Only list the left-out outputs of the representatives attached to this request
+    similar_outputs = {
+        output_file: (similar_outputs or {}).get(output_file, []) for output_file in output_files
+    }
+    sections = [
+        ASSESSMENT_GUIDELINES,
+        file_section(source_file, file_gateway),
+        assessment_prompt(source_file, output_files, similar_outputs),
+    ]
+    for output_file in output_files:
+        sections.append(file_section(output_file, file_gateway))
+
+    return LLMMessage(content="\n\n".join(sections))
+
+def file_section(file_path: Union[str, Path], file_gateway: FileGateway) -> str:
+    """
+    Format a file for inclusion in an assessment message.
+
+    Args:
+        file_path: Path to the file
+        file_gateway: FileGateway instance used to read the file
+
+    Returns:
+        str: The file name followed by its contents in a fenced block
+    """
+    content = file_gateway.read_file(file_path)
+    return f"File: {Path(file_path).name}\n```markdown\n{content.strip()}\n```"
+
+def build_merge_message(
+    source_file: Union[str, Path],
+    groups: List[List[Union[str, Path]]],
+    partial_assessments: List[str]
+):
+    """
+    Build the message asking the assessment model to merge the assessments of output groups.
+
+    Args:
+        source_file: Path to the source file
+        groups: Groups of output files, in the order they were assessed
+        partial_assessments: Assessment of each group, in the same order
+
+    Returns:
+        LLMMessage: The merge request, with every partial assessment attached
+    """
+    merge_prompt = f"""
+    The outputs generated for the source document '{Path(source_file).name}' were assessed in 
+    {len(groups)} groups. Please merge the following partial assessments into a single assessment 
+    of the quality and differences between all of the outputs.
+    In the assessment refer to each output by its filename.
+    """
+
+    sections = [merge_prompt]
+    for number, (group, partial_assessment) in enumerate(zip(groups, partial_assessments), 1):
+        file_names = ", ".join(Path(output_file).name for output_file in group)
+        sections.append(
+            f"Assessment of group {number} ({file_names}):\n"
+            f"```markdown\n{partial_assessment.strip()}\n```"
+        )
+
+    return LLMMessage(content="\n\n".join(sections))
+
+async def _aassess_groups(
+    source_file: Union[str, Path],
+    groups: List[List[Union[str, Path]]],
+    config: Config,
+    file_gateway: FileGateway,
+    metrics: Optional[RunMetrics],
+    similar_outputs: Dict[Union[str, Path], List[Union[str, Path]]],
+    concurrency: int
+) -> List[str]:
+    semaphore = asyncio.Semaphore(concurrency)
+    return await asyncio.gather(*(
+        run_in_thread(
+            _assess_group, source_file, group, config, file_gateway, metrics, similar_outputs,
+            semaphore=semaphore)
+        for group in groups
+    ))
+
+def _assess_group(
+    source_file: Union[str, Path],
+    group: List[Union[str, Path]],
+    config: Config,
+    file_gateway: FileGateway,
+    metrics: Optional[RunMetrics],
+    similar_outputs: Dict[Union[str, Path], List[Union[str, Path]]]
+) -> str:
+    return _assess(
+        build_assessment_message(source_file, group, file_gateway, similar_outputs), config,
+        metrics, "assessment", source_file)
+
+def _assess(
+    message,
+    config: Config,
+    metrics: Optional[RunMetrics],
+    phase: str,
+    subject: Union[str, Path]
+) -> str:
+    with measure(metrics, phase, config.assessment_model, subject) as call:
+        call.input_tokens = estimate_tokens(message.content)
+        if metrics is not None:
+            call.cached_input_tokens = metrics.sent_prompts.cached_tokens(
+                config.assessment_model, message.content)
+
+        llm = get_assessment_llm(config)
+        raw_assessment = llm.generate(messages=[message])
+
+        # Strip out thinking text
+        assessment = strip_thinking(raw_assessment)
+        call.output_tokens = estimate_tokens(assessment)
+        call.thinking_tokens = max(0, estimate_tokens(raw_assessment) - call.output_tokens)
 
     return assessment
 
+async def agenerate_assessment(
+    source_file: Union[str, Path],
+    output_files: List[Union[str, Path]],
+    config: Optional[Config] = None,
+    file_gateway: Optional[FileGateway] = None,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    metrics: Optional[RunMetrics] = None
+):
+    """
+    Generate an assessment for a source file and its outputs without blocking the event loop.
+
+    With a semaphore, the groups of an oversized assessment are assessed one after another in
+    the slot the call holds, so the semaphore bounds every request sent.
+
+    Args:
+        source_file: Path to the source file
+        output_files: List of paths to output files
+        config: Optional Config instance (defaults to default_config)
+        file_gateway: Optional FileGateway instance (defaults to a new instance)
+        semaphore: Optional asyncio.Semaphore limiting concurrent assessment requests
+        metrics: Optional RunMetrics the timings and token counts of each request are added to
+
+    Returns:
+        str: The assessment text
+    """
+    return await run_in_thread(
+        generate_assessment, source_file, output_files, config, file_gateway, metrics,
+        group_concurrency=1 if semaphore is not None else None, semaphore=semaphore)
+
 def generate_cross_prompt_assessment(
     folder_path: str, 
     prompt_styles: List[str],
     config: Optional[Config] = None,
-    file_gateway: Optional[FileGateway] = None
+    file_gateway: Optional[FileGateway] = None,
+    manifest: Optional[BuildManifest] = None,
+    exclude_models: Optional[Iterable[str]] = None,
+    index: Optional[FolderIndex] = None,
+    journal: Optional[RunJournal] = None,
+    metrics: Optional[RunMetrics] = None,
+    samples: int = 1
 ):
     """
     Generate a comparative assessment between different prompt styles across all models.
@@ -75,6 +419,53 @@ def generate_cross_prompt_assessment(
         prompt_styles: List of prompt styles to compare (e.g., ["plain", "fancy"])
         config: Optional Config instance (defaults to default_config)
         file_gateway: Optional FileGateway instance (defaults to a new instance)
+        manifest: Optional BuildManifest used to skip assessments whose inputs are unchanged
+        exclude_models: Optional model names (as they appear in output filenames) whose
+                        assessments were already written, e.g. by a pipelined process_folder
+        index: Optional FolderIndex of the folder (defaults to scanning the folder)
+        journal: Optional RunJournal used to record and skip completed assessments
+        metrics: Optional RunMetrics the timings and token counts of each request are added to
+        samples: Number of replicate generations per prompt file and model, used when
+                 scanning the folder
+
+    Returns:
+        dict: Dictionary mapping model names to their assessment file paths
+    """
+    return asyncio.run(agenerate_cross_prompt_assessment(
+        folder_path, prompt_styles, config, file_gateway, manifest=manifest,
+        exclude_models=exclude_models, index=index, journal=journal, metrics=metrics,
+        samples=samples))
+
+async def agenerate_cross_prompt_assessment(
+    folder_path: str,
+    prompt_styles: List[str],
+    config: Optional[Config] = None,
+    file_gateway: Optional[FileGateway] = None,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    manifest: Optional[BuildManifest] = None,
+    exclude_models: Optional[Iterable[str]] = None,
+    index: Optional[FolderIndex] = None,
+    journal: Optional[RunJournal] = None,
+    metrics: Optional[RunMetrics] = None,
+    samples: int = 1
+):
+    """
+    Generate the cross-prompt assessments for all models concurrently.
+
+    Args:
+        folder_path: Path to the folder containing output files
+        prompt_styles: List of prompt styles to compare (e.g., ["plain", "fancy"])
+        config: Optional Config instance (defaults to default_config)
+        file_gateway: Optional FileGateway instance (defaults to a new instance)
+        semaphore: Optional asyncio.Semaphore limiting concurrent assessment requests
+                   (defaults to one sized by config.assessment_concurrency)
+        manifest: Optional BuildManifest used to skip assessments whose inputs are unchanged
+        exclude_models: Optional model names (as they appear in output filenames) to leave out
+        index: Optional FolderIndex of the folder (defaults to scanning the folder)
+        journal: Optional RunJournal used to record and skip completed assessments
+        metrics: Optional RunMetrics the timings and token counts of each request are added to
+        samples: Number of replicate generations per prompt file and model, used when
+                 scanning the folder
 
     Returns:
         dict: Dictionary mapping model names to their assessment file paths
@@ -86,90 +477,193 @@ def generate_cross_prompt_assessment(
     file_gateway = file_gateway or FileGateway()
 
     folder = Path(folder_path)
-    assessment_files = {}
-
-    # Ensure the folder exists
-    if not file_gateway.folder_exists(folder):
-        raise ValueError(f"The path {folder_path} does not exist or is not a directory")
-
-    # Dictionary to store output files for each model and prompt style
-    model_outputs = defaultdict(lambda: defaultdict(list))
-
-    # Find all output files and organize them by model and prompt style
-    for file_path in file_gateway.list_files_with_pattern(
-        folder, 
-        suffix='.md', 
-        exclude_patterns=["assessment"]
-    ):
-        if "output" in str(file_path):
-            # Extract model name and prompt style from filename
-            file_name = file_path.stem
-
-            # Extract style names from output filenames
-            # Output filenames are derived from prompt filenames, which follow the pattern "prompt-{style}.md"
-            # So we need to extract the style from the output filename
-            style_match = None
-            for style in prompt_styles:
-                if f"prompt-{style}" in file_name:
-                    style_match = style
-                    break
-
-            if not style_match:
-                continue
-
-            prompt_style = style_match
-
-            # Extract model name (between "output-" and end of filename)
-            model_match = re.search(r'output-(.*)', file_name)
-            if model_match:
-                model_name = model_match.group(1)
-                model_outputs[model_name][prompt_style].append(file_path)
-
-    # For each model, generate a comparative assessment between prompt styles
-    for model_name, style_outputs in model_outputs.items():
-        # Only generate assessment if we have outputs for all prompt styles
-        if all(style in style_outputs for style in prompt_styles):
-            # Create assessment prompt
-            assessment_prompt = f"""
-            Please compare the outputs generated by the {model_name} model for different prompt styles ({", ".join(prompt_styles)}).
-
-            First, provide a tabular super-condensed comparison of the prompt styles, highlighting key differences and strengths/weaknesses of each style. Format this as a markdown table.
-
-            Then, provide a more extensive qualitative analysis focusing on these questions:
-            1. Which prompt style gives the best results overall?
-            2. What aspects of the model's response differ between the different prompt styles?
-            3. What aspects of the model's response are consistent across all prompt styles?
-
-            In your assessment, refer to each output by its prompt style (e.g., {", ".join(f'"{style}"' for style in prompt_styles)}).
-            """
-
-            # Create message builder
-            mb = MessageBuilder(assessment_prompt)
-
-            # Add source files for each prompt style
-            for style in prompt_styles:
-                for output_file in style_outputs[style]:
-                    # Find the original prompt file
-                    # Output filename is derived from prompt filename, which follows the pattern "prompt-{style}.md"
-                    prompt_file_path = folder / f"prompt-{style}.md"
-
-                    if file_gateway.file_exists(prompt_file_path):
-                        mb.add_file(prompt_file_path)
-
-                    # Add the output file
-                    mb.add_file(output_file)
-
-            # Generate assessment
-            llm = get_assessment_llm(config)
-            assessment = llm.generate(messages=[mb.build()])
-
-            # Strip out thinking text
-            assessment = strip_thinking(assessment)
-
-            # Create assessment file path
-            assessment_file_path = folder / f"cross-prompt-assessment-{model_name}.md"
-            file_gateway.write_file(assessment_file_path, assessment)
-
-            assessment_files[model_name] = assessment_file_path
-
-    return assessment_files
+
+    # Use provided index or scan the folder
+    index = index or FolderIndex.from_folder(folder, file_gateway, samples)
+
+    semaphore = semaphore or asyncio.Semaphore(config.assessment_concurrency)
+
+    model_outputs = index.outputs_by_model(prompt_styles)
+
+    # Look up each style's prompt file once for every model's assessment
+    prompt_files = {
+        style: index.prompt_file(style) for style in prompt_styles
+        if index.prompt_file(style) is not None
+    }
+
+    # Only generate assessment if we have outputs for all prompt styles
+    excluded = set(exclude_models or [])
+    model_names = [
+        model_name for model_name, style_outputs in model_outputs.items()
+        if all(style in style_outputs for style in prompt_styles) and model_name not in excluded
+    ]
+
+    assessment_paths = await asyncio.gather(*(
+        run_in_thread(
+            write_cross_prompt_assessment,
+            folder,
+            model_name,
+            prompt_styles,
+            model_outputs[model_name],
+            config,
+            file_gateway,
+            manifest,
+            prompt_files,
+            journal,
+            metrics,
+            semaphore=semaphore
+        )
+        for model_name in model_names
+    ))
+
+    # Every assessment is on disk before the manifest vouches for it
+    await run_in_thread(file_gateway.flush)
+
+    if manifest is not None:
+        manifest.save()
+
+    return dict(zip(model_names, assessment_paths))
+
+def write_cross_prompt_assessment(
+    folder: Path,
+    model_name: str,
+    prompt_styles: List[str],
+    style_outputs,
+    config: Config,
+    file_gateway: FileGateway,
+    manifest: Optional[BuildManifest] = None,
+    prompt_files: Optional[Dict[str, Path]] = None,
+    journal: Optional[RunJournal] = None,
+    metrics: Optional[RunMetrics] = None
+) -> Path:
+    """
+    Generate and write the comparative assessment of prompt styles for a single model.
+
+    Args:
+        folder: Folder containing the prompt and output files
+        model_name: Name of the model whose outputs are compared
+        prompt_styles: List of prompt styles to compare
+        style_outputs: Dictionary mapping each prompt style to its output files
+        config: Config instance
+        file_gateway: FileGateway instance
+        manifest: Optional BuildManifest used to skip an assessment whose inputs are unchanged
+        prompt_files: Optional dictionary mapping each prompt style to its existing prompt file
+                      (defaults to checking the folder for "prompt-{style}.md")
+        journal: Optional RunJournal used to skip an assessment completed earlier in the run
+        metrics: Optional RunMetrics the request's timings and token counts are added to
+
+    Returns:
+        Path: The cross-prompt assessment file path
+    """
+    assessment_file_path = folder / f"cross-prompt-assessment-{model_name}.md"
+
+    # Keep an assessment finished before an interrupted run stopped
+    if journal is not None and journal.is_complete(assessment_file_path):
+        return assessment_file_path
+
+    # Output filenames are derived from prompt filenames, which follow the pattern "prompt-{style}.md"
+    if prompt_files is None:
+        prompt_files = {
+            style: folder / f"prompt-{style}.md" for style in prompt_styles
+            if file_gateway.file_exists(folder / f"prompt-{style}.md")
+        }
+
+    # Keep the existing assessment if the prompts, outputs and assessor are unchanged
+    if manifest is not None:
+        fingerprint = manifest.fingerprint(
+            prompts=file_hashes(
+                [prompt_files[style] for style in prompt_styles if style in prompt_files],
+                file_gateway
+            ),
+            outputs={
+                style: file_hashes(style_outputs[style], file_gateway) for style in prompt_styles
+            },
+            model=config.assessment_model,
+            template=ASSESSMENT_TEMPLATE_VERSION
+        )
+        if manifest.is_current(assessment_file_path, fingerprint):
+            return assessment_file_path
+
+    # Generate assessment
+    assessment = _assess(
+        build_cross_prompt_message(
+            model_name, prompt_styles, style_outputs, prompt_files, file_gateway),
+        config, metrics, "cross-prompt", assessment_file_path)
+
+    # Write the assessment to its file
+    file_gateway.write_file(assessment_file_path, assessment)
+
+    if manifest is not None:
+        manifest.record(assessment_file_path, fingerprint)
+    if journal is not None:
+        journal.record(assessment_file_path, assessment)
+
+    return assessment_file_path
+
+def build_cross_prompt_message(
+    model_name: str,
+    prompt_styles: List[str],
+    style_outputs,
+    prompt_files: Dict[str, Path],
+    file_gateway: FileGateway
+):
+    """
+    Build the message asking the assessment model to compare one model's prompt styles.
+
+    The guidelines and the prompt files, in style order, are the same for every model and come
+    first, so the cross-prompt assessments of a run share that prefix and the provider can serve
+    it from its prompt cache; the model's outputs follow.
+
+    Args:
+        model_name: Name of the model whose outputs are compared
+        prompt_styles: List of prompt styles to compare
+        style_outputs: Dictionary mapping each prompt style to its output files
+        prompt_files: Dictionary mapping each prompt style to its existing prompt file
+        file_gateway: FileGateway instance used to read the files
+
+    Returns:
+        LLMMessage: The cross-prompt assessment request, with the prompt and output files attached
+    """
+    styles = sorted(prompt_styles)
+    guidelines = f"""
+    Please compare the outputs generated by a model for different prompt styles ({", ".join(styles)}).
+    The prompt file of each style comes first, followed by the model's outputs.
+
+    First, provide a tabular super-condensed comparison of the prompt styles, highlighting key differences and strengths/weaknesses of each style. Format this as a markdown table.
+
+    Then, provide a more extensive qualitative analysis focusing on these questions:
+    1. Which prompt style gives the best results overall?
+    2. What aspects of the model's response differ between the different prompt styles?
+    3. What aspects of the model's response are consistent across all prompt styles?
+
+    In your assessment, refer to each output by its prompt style (e.g., {", ".join(f'"{style}"' for style in styles)}).
+    """
+    outputs = [output for style in styles for output in style_outputs[style]]
+    model_prompt = f"""
+    The following outputs were generated by the {model_name} model.
+    {replicates_note(outputs)}"""
+
+    sections = [guidelines]
+    for style in styles:
+        if style in prompt_files:
+            sections.append(file_section(prompt_files[style], file_gateway))
+    sections.append(model_prompt)
+    for output_file in outputs:
+        sections.append(file_section(output_file, file_gateway))
+
+    return LLMMessage(content="\n\n".join(sections))
+
+def file_hashes(file_paths: List[Union[str, Path]], file_gateway: FileGateway) -> List[str]:
+    """
+    Hash the contents of files so they can be part of a build manifest fingerprint.
+
+    Args:
+        file_paths: Paths of the files to hash, in a stable order
+        file_gateway: FileGateway instance used to read the files
+
+    Returns:
+        list: Content hashes, in the same order as the paths
+    """
+    return [
+        BuildManifest.content_hash(file_gateway.read_file(file_path)) for file_path in file_paths
+    ]
@@ -0,0 +1,132 @@
+"""
+Assessment pipeline module for the assessor package.
+
+This module tracks which generation jobs have finished, so each assessment can start the moment
+the last output it depends on lands instead of waiting for the whole model x prompt matrix.
+"""
+
+import asyncio
+from collections import defaultdict
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from assessor.folder_index import FileKind, parse_file_name
+
+# A generation job is a (prompt file, model name, sample) triple; the sample is None unless the
+# run generates several replicates per prompt file and model
+Job = Tuple[Path, str, Optional[int]]
+
+
+class AssessmentPipeline:
+    """Dispatches per-source and per-model assessments as their outputs complete."""
+
+    def __init__(
+        self,
+        jobs: List[Job],
+        on_source_complete: Optional[Callable[[Path, List[Path]], Awaitable]] = None,
+        on_model_complete: Optional[Callable[[str, Dict[str, List[Path]]], Awaitable]] = None,
+        compare_styles: Optional[List[str]] = None
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            jobs: Every generation job of the run, in submission order
+            on_source_complete: Coroutine function called with a prompt file and its outputs
+                                once every model has processed that prompt file
+            on_model_complete: Coroutine function called with a model name and its outputs per
+                               prompt style once the model has processed every compared style,
+                               with every replicate of a multi-sample run
+            compare_styles: Prompt styles compared for each model; models are only tracked
+                            when the run includes a prompt file for every one of them
+        """
+        self.jobs = jobs
+        self.on_source_complete = on_source_complete
+        self.on_model_complete = on_model_complete
+        self._results: Dict[Job, Optional[Path]] = {}
+        self._tasks: List[asyncio.Future] = []
+
+        self._source_jobs = defaultdict(list)
+        for job in jobs:
+            self._source_jobs[job[0]].append(job)
+        self._sources_remaining = {
+            source: len(source_jobs) for source, source_jobs in self._source_jobs.items()
+        }
+
+        # Only models with a job for every compared style get a cross-prompt assessment
+        self._model_jobs: Dict[str, Dict[str, List[Job]]] = {}
+        if on_model_complete is not None and compare_styles:
+            style_jobs_by_model = defaultdict(lambda: defaultdict(list))
+            for job in jobs:
+                file_path, model_name = job[0], job[1]
+                style = _prompt_style(file_path)
+                if style in compare_styles:
+                    style_jobs_by_model[model_name][style].append(job)
+            self._model_jobs = {
+                model_name: dict(style_jobs)
+                for model_name, style_jobs in style_jobs_by_model.items()
+                if len(style_jobs) == len(compare_styles)
+            }
+        self._models_remaining = {
+            model_name: sum(len(jobs) for jobs in style_jobs.values())
+            for model_name, style_jobs in self._model_jobs.items()
+        }
+
+    def output_ready(self, job: Job, output_path: Optional[Path]) -> None:
+        """
+        Record a finished generation job and dispatch any assessment it completes.
+
+        Must be called from the event loop running the pipeline.
+
+        Args:
+            job: The finished (prompt file, model name, sample) job
+            output_path: Its output file, or None if no output was produced
+        """
+        self._results[job] = output_path
+        file_path, model_name = job[0], job[1]
+
+        self._sources_remaining[file_path] -= 1
+        if self._sources_remaining[file_path] == 0 and self.on_source_complete is not None:
+            outputs = self._completed_outputs(self._source_jobs[file_path])
+            if outputs:
+                self._dispatch(self.on_source_complete(file_path, outputs))
+
+        style_jobs = self._model_jobs.get(model_name, {})
+        if job in style_jobs.get(_prompt_style(file_path), []):
+            self._models_remaining[model_name] -= 1
+            if self._models_remaining[model_name] == 0:
+                style_outputs = {
+                    style: self._completed_outputs(jobs)
+                    for style, jobs in style_jobs.items()
+                }
+                if all(style_outputs.values()):
+                    self._dispatch(self.on_model_complete(model_name, style_outputs))
+
+    def output_files(self) -> Dict[Path, List[Path]]:
+        """
+        Get the output files produced so far for each prompt file.
+
+        Returns:
+            dict: Dictionary mapping source files to their output files, in job order
+        """
+        output_files = defaultdict(list)
+        for job in self.jobs:
+            output_path = self._results.get(job)
+            if output_path is not None:
+                output_files[job[0]].append(output_path)
+        return output_files
+
+    async def wait(self) -> None:
+        """Wait for every dispatched assessment to finish."""
+        await asyncio.gather(*self._tasks)
+
+    def _completed_outputs(self, jobs: List[Job]) -> List[Path]:
+        return [self._results[job] for job in jobs if self._results.get(job) is not None]
+
+    def _dispatch(self, assessment: Awaitable) -> None:
+        self._tasks.append(asyncio.ensure_future(assessment))
+
+
+def _prompt_style(file_path: Path) -> Optional[str]:
+    record = parse_file_name(file_path)
+    return record.style if record is not None and record.kind == FileKind.PROMPT else None
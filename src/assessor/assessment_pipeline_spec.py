@@ -0,0 +1,100 @@
+"""
+Tests for the assessment_pipeline module.
+"""
+
+import asyncio
+from pathlib import Path
+
+from assessor.assessment_pipeline import AssessmentPipeline
+
+PLAIN = Path("prompt-plain.md")
+FANCY = Path("prompt-fancy.md")
+
+
+def _run(pipeline, finished_jobs):
+    async def finish_jobs():
+        for job, output_path in finished_jobs:
+            pipeline.output_ready(job, output_path)
+        await pipeline.wait()
+    asyncio.run(finish_jobs())
+
+
+def _recorder(calls):
+    async def record(*args):
+        calls.append(args)
+    return record
+
+
+class DescribeAssessmentPipeline:
+    """Tests for the AssessmentPipeline class."""
+
+    def should_assess_a_source_once_all_of_its_outputs_are_ready(self):
+        """It should dispatch a source's assessment without waiting for other sources."""
+        calls = []
+        jobs = [(PLAIN, "gpt-4o"), (FANCY, "gpt-4o"), (PLAIN, "o3-mini")]
+        pipeline = AssessmentPipeline(jobs, on_source_complete=_recorder(calls))
+
+        _run(pipeline, [
+            ((PLAIN, "gpt-4o"), Path("plain-gpt-4o.md")),
+            ((PLAIN, "o3-mini"), Path("plain-o3-mini.md")),
+        ])
+
+        assert calls == [(PLAIN, [Path("plain-gpt-4o.md"), Path("plain-o3-mini.md")])]
+
+    def should_assess_a_model_once_every_compared_style_is_ready(self):
+        """It should dispatch a model's cross-prompt assessment after its last compared output."""
+        calls = []
+        jobs = [(PLAIN, "gpt-4o"), (FANCY, "gpt-4o"), (PLAIN, "o3-mini"), (FANCY, "o3-mini")]
+        pipeline = AssessmentPipeline(
+            jobs, on_model_complete=_recorder(calls), compare_styles=["plain", "fancy"])
+
+        _run(pipeline, [
+            ((PLAIN, "gpt-4o"), Path("plain-gpt-4o.md")),
+            ((FANCY, "gpt-4o"), Path("fancy-gpt-4o.md")),
+            ((PLAIN, "o3-mini"), Path("plain-o3-mini.md")),
+        ])
+
+        assert calls == [(
+            "gpt-4o",
+            {"plain": [Path("plain-gpt-4o.md")], "fancy": [Path("fancy-gpt-4o.md")]}
+        )]
+
+    def should_list_output_files_in_job_order(self):
+        """It should map outputs in submission order whatever order they finished in."""
+        jobs = [(PLAIN, "gpt-4o"), (PLAIN, "o3-mini")]
+        pipeline = AssessmentPipeline(jobs)
+
+        _run(pipeline, [
+            ((PLAIN, "o3-mini"), Path("plain-o3-mini.md")),
+            ((PLAIN, "gpt-4o"), Path("plain-gpt-4o.md")),
+        ])
+
+        assert pipeline.output_files() == {
+            PLAIN: [Path("plain-gpt-4o.md"), Path("plain-o3-mini.md")]
+        }
+
+    def should_assess_a_model_once_every_replicate_is_ready(self):
+        """It should wait for every sample of a multi-sample run and pass them as a group."""
+        calls = []
+        jobs = [
+            (PLAIN, "gpt-4o", 1), (PLAIN, "gpt-4o", 2), (FANCY, "gpt-4o", 1), (FANCY, "gpt-4o", 2)
+        ]
+        pipeline = AssessmentPipeline(
+            jobs, on_model_complete=_recorder(calls), compare_styles=["plain", "fancy"])
+
+        _run(pipeline, [
+            ((PLAIN, "gpt-4o", 1), Path("plain-gpt-4o-s1.md")),
+            ((FANCY, "gpt-4o", 2), Path("fancy-gpt-4o-s2.md")),
+            ((FANCY, "gpt-4o", 1), Path("fancy-gpt-4o-s1.md")),
+        ])
+        assert calls == []
+
+        _run(pipeline, [((PLAIN, "gpt-4o", 2), Path("plain-gpt-4o-s2.md"))])
+
+        assert calls == [(
+            "gpt-4o",
+            {
+                "plain": [Path("plain-gpt-4o-s1.md"), Path("plain-gpt-4o-s2.md")],
+                "fancy": [Path("fancy-gpt-4o-s1.md"), Path("fancy-gpt-4o-s2.md")],
+            }
+        )]
@@ -0,0 +1,39 @@
+"""
+Tests for the assessment module.
+"""
+
+from assessor.assessment import ASSESSMENT_GUIDELINES, assessment_prompt, file_section, \
+    plan_assessment_groups
+from assessor.config import Config
+from assessor.file_gateway import FileGateway
+from assessor.token_budget import estimate_tokens
+
+
+class DescribePlanAssessmentGroups:
+    """Tests for the plan_assessment_groups function."""
+
+    def should_count_the_similar_outputs_note_towards_the_budget(self, tmp_path):
+        """It should split outputs that only fit the budget without the note listing left-outs."""
+        file_gateway = FileGateway()
+        source_file = tmp_path / "prompt-plain.md"
+        source_file.write_text("Write a haiku")
+        outputs = []
+        for model in ("model-a", "model-b"):
+            outputs.append(tmp_path / f"prompt-plain-output-{model}.md")
+            outputs[-1].write_text(f"{model} says " * 50)
+        similar_outputs = {
+            outputs[0]: [tmp_path / f"prompt-plain-output-model-{n}.md" for n in range(40)],
+            outputs[1]: [],
+        }
+        budget = (
+            estimate_tokens(ASSESSMENT_GUIDELINES)
+            + estimate_tokens(assessment_prompt(source_file, outputs))
+            + estimate_tokens(file_section(source_file, file_gateway))
+            + sum(estimate_tokens(file_section(output, file_gateway)) for output in outputs)
+        )
+        config = Config(assessment_token_budget=budget)
+
+        result = plan_assessment_groups(
+            source_file, outputs, config, file_gateway, similar_outputs)
+
+        assert result == [[outputs[0]], [outputs[1]]]
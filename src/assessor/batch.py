@@ -0,0 +1,218 @@
+"""
+Batch submission module for the assessor package.
+
+This module sends many chat completion requests to OpenAI as a single batch job, which is billed
+at batch pricing and does not count against the per-minute rate limits, and collects the results
+once the job completes. A local stand-in gateway simulates the batch lifecycle for offline runs.
+"""
+
+import io
+import itertools
+import json
+import time
+from typing import Callable, Dict, List, Optional
+
+from assessor.utils import strip_thinking
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_COMPLETION_WINDOW = "24h"
+
+# Batch statuses after which no more results will arrive
+COMPLETED_STATUS = "completed"
+FAILED_STATUSES = {"failed", "expired", "cancelled"}
+
+
+def make_batch_request(custom_id: str, model_name: str, content: str, max_tokens: int) -> Dict:
+    """
+    Build one line of a batch submission.
+
+    Args:
+        custom_id: Identifier used to match the result to its request
+        model_name: Name of the model to use
+        content: Text of the single user message
+        max_tokens: Upper bound on the tokens the model may generate
+
+    Returns:
+        dict: The request in the batch API's JSONL line format
+    """
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": BATCH_ENDPOINT,
+        "body": {
+            "model": model_name,
+            "messages": [{"role": "user", "content": content}],
+            "max_completion_tokens": max_tokens,
+        },
+    }
+
+
+class OpenAIBatchGateway:
+    """Gateway submitting batch jobs to the OpenAI Batch API."""
+
+    def __init__(self, api_key: Optional[str] = None):
+        """
+        Initialize the gateway.
+
+        Args:
+            api_key: OpenAI API key
+        """
+        from openai import OpenAI
+
+        self.client = OpenAI(api_key=api_key)
+
+    def submit(self, requests: List[Dict]) -> str:
+        """
+        Upload the requests as a JSONL file and create a batch job for them.
+
+        Args:
+            requests: Batch request lines from make_batch_request
+
+        Returns:
+            str: The batch id
+        """
+        jsonl = "\n".join(json.dumps(request) for request in requests)
+        input_file = self.client.files.create(
+            file=("assessor-batch.jsonl", io.BytesIO(jsonl.encode("utf-8"))),
+            purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=BATCH_COMPLETION_WINDOW
+        )
+        return batch.id
+
+    def status(self, batch_id: str) -> str:
+        """Get the current status of a batch job."""
+        return self.client.batches.retrieve(batch_id).status
+
+    def results(self, batch_id: str) -> Dict[str, str]:
+        """
+        Download the responses of a completed batch job.
+
+        Args:
+            batch_id: The batch id
+
+        Returns:
+            dict: Response text for each custom_id that succeeded
+        """
+        batch = self.client.batches.retrieve(batch_id)
+        if batch.output_file_id is None:
+            return {}
+
+        output = self.client.files.content(batch.output_file_id).text
+        return _parse_results(output)
+
+
+class LocalBatchGateway:
+    """Stand-in for the batch API that answers requests locally, for offline runs and tests."""
+
+    def __init__(
+        self,
+        responder: Optional[Callable[[Dict], str]] = None,
+        polls_until_complete: int = 1
+    ):
+        """
+        Initialize the gateway.
+
+        Args:
+            responder: Produces the response text for a request body (defaults to echoing the
+                       model name)
+            polls_until_complete: Number of status checks that report the batch as in progress
+                                  before it completes
+        """
+        self.responder = responder or (lambda body: f"Response from {body['model']}")
+        self.polls_until_complete = polls_until_complete
+        self._batches: Dict[str, str] = {}
+        self._polls: Dict[str, int] = {}
+        self._ids = itertools.count(1)
+
+    def submit(self, requests: List[Dict]) -> str:
+        """Accept a batch, serialized to JSONL just as it would be uploaded."""
+        batch_id = f"batch_local_{next(self._ids)}"
+        self._batches[batch_id] = "\n".join(json.dumps(request) for request in requests)
+        self._polls[batch_id] = 0
+        return batch_id
+
+    def status(self, batch_id: str) -> str:
+        """Report the batch as in progress until the configured number of polls has passed."""
+        self._polls[batch_id] += 1
+        if self._polls[batch_id] <= self.polls_until_complete:
+            return "in_progress"
+        return COMPLETED_STATUS
+
+    def results(self, batch_id: str) -> Dict[str, str]:
+        """Answer every request in the batch, going through the batch API's output format."""
+        output_lines = []
+        for line in self._batches[batch_id].splitlines():
+            request = json.loads(line)
+            content = self.responder(request["body"])
+            output_lines.append(json.dumps({
+                "custom_id": request["custom_id"],
+                "response": {
+                    "status_code": 200,
+                    "body": {"choices": [{"message": {"content": content}}]},
+                },
+            }))
+        return _parse_results("\n".join(output_lines))
+
+
+def run_batch(
+    requests: List[Dict],
+    batch_gateway,
+    poll_seconds: float,
+    sleep: Callable[[float], None] = time.sleep
+) -> Dict[str, str]:
+    """
+    Submit a batch, wait for it to finish and collect its responses.
+
+    Args:
+        requests: Batch request lines from make_batch_request
+        batch_gateway: OpenAIBatchGateway or LocalBatchGateway
+        poll_seconds: Time to wait between status checks
+        sleep: Function used to wait between status checks
+
+    Returns:
+        dict: Response text, with thinking removed, for each custom_id that succeeded
+    """
+    if not requests:
+        return {}
+
+    batch_id = batch_gateway.submit(requests)
+    print(f"Submitted batch {batch_id} with {len(requests)} requests")
+
+    status = batch_gateway.status(batch_id)
+    while status != COMPLETED_STATUS:
+        if status in FAILED_STATUSES:
+            raise RuntimeError(f"Batch {batch_id} ended with status {status}")
+        sleep(poll_seconds)
+        status = batch_gateway.status(batch_id)
+
+    return {
+        custom_id: strip_thinking(content)
+        for custom_id, content in batch_gateway.results(batch_id).items()
+        if content is not None
+    }
+
+
+def _parse_results(output: str) -> Dict[str, str]:
+    # Errored, refused and empty results are reported and left out, so the caller treats their
+    # requests as failed just like requests the batch did not answer
+    results = {}
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        result = json.loads(line)
+        response = result.get("response") or {}
+        choices = (response.get("body") or {}).get("choices") or [{}]
+        message = choices[0].get("message") or {}
+        content = message.get("content")
+        if response.get("status_code") != 200 or result.get("error") or not content:
+            reason = (
+                (result.get("error") or {}).get("message") or message.get("refusal")
+                or f"status {response.get('status_code')}, no text in the response")
+            print(f"Batch request {result.get('custom_id')} failed: {reason}")
+            continue
+        results[result["custom_id"]] = content
+    return results
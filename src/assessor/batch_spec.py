@@ -0,0 +1,90 @@
+"""
+Tests for the batch module.
+"""
+
+import json
+
+import pytest
+
+from assessor.batch import LocalBatchGateway, OpenAIBatchGateway, make_batch_request, run_batch
+
+
+class DescribeRunBatch:
+    """Tests for the run_batch function."""
+
+    def should_return_responses_keyed_by_custom_id(self):
+        """It should match every response to the request that produced it."""
+        requests = [
+            make_batch_request("a-output-gpt-4o.md", "gpt-4o", "prompt a", 100),
+            make_batch_request("b-output-o3-mini.md", "o3-mini", "prompt b", 100),
+        ]
+
+        result = run_batch(requests, LocalBatchGateway(), poll_seconds=0, sleep=lambda _: None)
+
+        assert result == {
+            "a-output-gpt-4o.md": "Response from gpt-4o",
+            "b-output-o3-mini.md": "Response from o3-mini",
+        }
+
+    def should_poll_until_the_batch_completes(self, mocker):
+        """It should wait between status checks while the batch is still in progress."""
+        sleep = mocker.Mock()
+        requests = [make_batch_request("a-output-gpt-4o.md", "gpt-4o", "prompt a", 100)]
+
+        run_batch(requests, LocalBatchGateway(polls_until_complete=3), 5, sleep=sleep)
+
+        assert sleep.call_count == 3
+
+    def should_strip_thinking_from_responses(self):
+        """It should remove thinking sections just like interactive generations."""
+        gateway = LocalBatchGateway(responder=lambda body: "<think>plan</think>code")
+        requests = [make_batch_request("a-output-o1.md", "o1", "prompt a", 100)]
+
+        result = run_batch(requests, gateway, poll_seconds=0, sleep=lambda _: None)
+
+        assert result == {"a-output-o1.md": "code"}
+
+    def should_raise_when_the_batch_fails(self, mocker):
+        """It should stop waiting and report a batch that can no longer complete."""
+        gateway = mocker.Mock()
+        gateway.submit.return_value = "batch_1"
+        gateway.status.return_value = "expired"
+        requests = [make_batch_request("a-output-gpt-4o.md", "gpt-4o", "prompt a", 100)]
+
+        with pytest.raises(RuntimeError):
+            run_batch(requests, gateway, poll_seconds=0, sleep=lambda _: None)
+
+    def should_leave_out_requests_without_a_text_response(self):
+        """It should skip a request the model answered without text instead of failing."""
+        gateway = LocalBatchGateway(
+            responder=lambda body: None if body["model"] == "o3-mini" else "code")
+        requests = [
+            make_batch_request("a-output-gpt-4o.md", "gpt-4o", "prompt a", 100),
+            make_batch_request("b-output-o3-mini.md", "o3-mini", "prompt b", 100),
+        ]
+
+        result = run_batch(requests, gateway, poll_seconds=0, sleep=lambda _: None)
+
+        assert result == {"a-output-gpt-4o.md": "code"}
+
+
+class DescribeOpenAIBatchGateway:
+    """Tests for the OpenAIBatchGateway class."""
+
+    def should_report_errored_and_refused_results_per_request(self, mocker):
+        """It should return the answered requests and leave out errored or refused ones."""
+        gateway = OpenAIBatchGateway.__new__(OpenAIBatchGateway)
+        gateway.client = mocker.Mock()
+        gateway.client.files.content.return_value.text = "\n".join(json.dumps(line) for line in [
+            {"custom_id": "a", "response": {"status_code": 200, "body": {
+                "choices": [{"message": {"content": "code"}}]}}},
+            {"custom_id": "b", "response": {"status_code": 200, "body": {
+                "choices": [{"message": {"content": None, "refusal": "I can't help"}}]}}},
+            {"custom_id": "c", "response": None,
+             "error": {"code": "server_error", "message": "Internal error"}},
+            {"custom_id": "d", "response": {"status_code": 200, "body": {"choices": []}}},
+        ])
+
+        result = gateway.results("batch_1")
+
+        assert result == {"a": "code"}
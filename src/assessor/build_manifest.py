@@ -0,0 +1,110 @@
+"""
+Build manifest module for the assessor package.
+
+This module records, for every generated file, a fingerprint of the inputs it was built from,
+so that an incremental run only regenerates files whose upstream inputs actually changed.
+"""
+
+import hashlib
+import json
+import pathlib
+import threading
+from typing import Any, Dict, Union
+
+MANIFEST_FILE_NAME = ".assessor-manifest.json"
+
+
+class BuildManifest:
+    """Make-style record of the inputs each output, assessment and cross-prompt assessment used."""
+
+    def __init__(self, folder_path: Union[str, pathlib.Path]):
+        """
+        Initialize the manifest, loading any fingerprints recorded by a previous run.
+
+        Args:
+            folder_path: Folder holding the generated files and the manifest
+        """
+        self.path = pathlib.Path(folder_path) / MANIFEST_FILE_NAME
+        self.skipped = 0
+        self.built = 0
+        self._fingerprints = self._load()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def content_hash(content: str) -> str:
+        """
+        Hash file contents for use as a fingerprint input.
+
+        Args:
+            content: The file contents
+
+        Returns:
+            Hex digest of the contents
+        """
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def fingerprint(**inputs: Any) -> str:
+        """
+        Build the fingerprint of everything a generated file depends on.
+
+        Args:
+            **inputs: JSON-serializable inputs, such as content hashes, model name and
+                      prompt template version
+
+        Returns:
+            Hex digest identifying the inputs
+        """
+        encoded = json.dumps(inputs, sort_keys=True)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def is_current(self, target: Union[str, pathlib.Path], fingerprint: str) -> bool:
+        """
+        Check whether a generated file exists and was built from the given inputs.
+
+        Counts the target as skipped when it is current.
+
+        Args:
+            target: Path to the generated file
+            fingerprint: Fingerprint of the inputs the file would be built from now
+
+        Returns:
+            True if the file can be reused, False if it must be regenerated
+        """
+        target = pathlib.Path(target)
+        with self._lock:
+            current = (
+                self._fingerprints.get(target.name) == fingerprint and target.is_file()
+            )
+            if current:
+                self.skipped += 1
+            return current
+
+    def record(self, target: Union[str, pathlib.Path], fingerprint: str) -> None:
+        """
+        Record the fingerprint of the inputs a generated file was just built from.
+
+        Args:
+            target: Path to the generated file
+            fingerprint: Fingerprint of the inputs it was built from
+        """
+        with self._lock:
+            self._fingerprints[pathlib.Path(target).name] = fingerprint
+            self.built += 1
+
+    def save(self) -> None:
+        """Write the recorded fingerprints to the manifest file."""
+        with self._lock:
+            temporary = self.path.with_suffix(".tmp")
+            temporary.write_text(json.dumps(self._fingerprints, indent=2, sort_keys=True))
+            temporary.replace(self.path)
+
+    def stats(self) -> str:
+        """Describe the skipped and rebuilt counts for display."""
+        return f"{self.skipped} up to date, {self.built} rebuilt"
+
+    def _load(self) -> Dict[str, str]:
+        if not self.path.is_file():
+            return {}
+        return json.loads(self.path.read_text())
+
@@ -0,0 +1,44 @@
+"""
+Tests for the build_manifest module.
+"""
+
+from assessor.build_manifest import BuildManifest
+
+
+class DescribeBuildManifest:
+    """Tests for the BuildManifest class."""
+
+    def should_treat_target_as_current_when_inputs_are_unchanged(self, tmp_path):
+        """It should reuse an existing target built from the same inputs in a previous run."""
+        target = tmp_path / "prompt-plain-output-model.md"
+        target.write_text("output")
+        fingerprint = BuildManifest.fingerprint(prompt="hash", model="model")
+        manifest = BuildManifest(tmp_path)
+        manifest.record(target, fingerprint)
+        manifest.save()
+
+        result = BuildManifest(tmp_path).is_current(target, fingerprint)
+
+        assert result is True
+
+    def should_rebuild_target_when_an_input_changed(self, tmp_path):
+        """It should not reuse a target whose recorded inputs differ from the current ones."""
+        target = tmp_path / "prompt-plain-output-model.md"
+        target.write_text("output")
+        manifest = BuildManifest(tmp_path)
+        manifest.record(target, BuildManifest.fingerprint(prompt="old", model="model"))
+
+        result = manifest.is_current(target, BuildManifest.fingerprint(prompt="new", model="model"))
+
+        assert result is False
+
+    def should_rebuild_target_that_was_deleted(self, tmp_path):
+        """It should not reuse a target that no longer exists even if its inputs are unchanged."""
+        target = tmp_path / "prompt-plain-output-model.md"
+        fingerprint = BuildManifest.fingerprint(prompt="hash", model="model")
+        manifest = BuildManifest(tmp_path)
+        manifest.record(target, fingerprint)
+
+        result = manifest.is_current(target, fingerprint)
+
+        assert result is False
@@ -9,6 +9,10 @@ to answer questions like:
 
 Usage:
     assessor [options]
+    assessor coordinate [options]
+    assessor worker [options]
+    assessor styles [--folder FOLDER]
+    assessor plan [options]
 
 Options:
     --folder FOLDER     Folder containing prompt files (default: 'prompts')
@@ -18,6 +22,22 @@ Options:
                         Files are expected to follow the pattern "prompt-{style}.md"
     --compare STYLES    Generate cross-prompt assessments for specified prompt styles
                         Example: --compare plain fancy
+    --no-cache          Neither read nor write the model response cache
+    --refresh           Regenerate every output, replacing its cached response
+    --incremental       Only regenerate outputs and assessments whose inputs changed
+                        since the last run
+    --resume            Continue an interrupted run, keeping the files it completed
+    --stream            Write each response to its output file as it arrives
+    --samples N         Generate N replicates per prompt and model, named
+                        "-output-{model}-s{k}.md", and assess them as a group (default: 1)
+    --assess-every-output
+                        Attach every output to its assessment instead of one of each
+                        group of near-identical outputs
+    --code-metrics      Measure the code in every output (function length, nesting,
+                        comments, type hints, tests, complexity) and write the table
+                        to code-metrics.csv
+    --batch             Submit OpenAI generations and assessments as batch jobs
+    --local-batch       Simulate batch submission locally instead of calling the batch API
 
 Example usage:
     # Process all prompts with both OpenAI and Ollama models
@@ -28,22 +48,97 @@ Example usage:
 
     # Compare plain and fancy prompts across all models
     assessor --compare plain fancy
+
+    # Regenerate every output even if a cached response exists
+    assessor --refresh
+
+    # Nightly sweep at batch pricing
+    assessor --batch
+
+    # After editing prompt-fancy.md, regenerate only what depends on it
+    assessor --incremental
+
+    # Pick up a sweep that died halfway
+    assessor --resume
+
+    # Compare prompt styles over three samples per model
+    assessor --compare plain fancy --samples 3
+
+    # Compare the code style of each model and prompt style without waiting on assessments
+    assessor --code-metrics
+
+Quick commands:
+    These read only the folder's filenames and never load the LLM clients, so scripts and hooks
+    can call them often.
+
+    # List the prompt styles in the folder, one per line
+    assessor styles --folder prompts
+
+    # Show which outputs and assessments a sweep would write, and which already exist
+    assessor plan --folder prompts --compare plain fancy --samples 3
+
+Distributed runs:
+    A sweep can be split into jobs kept in a queue file in the folder. The coordinator enqueues
+    the generations, waits for them, then enqueues and waits for the assessments; any number
+    of worker processes run the jobs. The queue uses SQLite file locks, so keep the folder on
+    the coordinator's local filesystem (not NFS or SMB). Workers on other machines reach the
+    queue through the coordinator's --serve port and the prompt files through a shared folder;
+    set the same ASSESSOR_QUEUE_TOKEN on every machine to keep others off the queue.
+
+    # Enqueue the sweep and wait for it (--resume keeps the jobs of an interrupted sweep and
+    # tries its failed jobs again), serving the queue to other machines on port 8765
+    assessor coordinate --folder prompts --compare plain fancy --serve 8765
+
+    # Run jobs on the coordinator's machine, four at a time, until none arrived for ten minutes
+    assessor worker --folder prompts --concurrency 4 --idle-exit 600
+
+    # Run jobs on another machine, which mounts the prompt folder at /mnt/prompts
+    assessor worker --folder /mnt/prompts --queue-url http://coordinator:8765
 """
 
 import argparse
 import sys
+from pathlib import Path
 
-from assessor.assessment import generate_cross_prompt_assessment
-from assessor.config import default_config
-from assessor.file_gateway import FileGateway
+from assessor.code_metrics import CODE_METRICS_FILE_NAME, CodeMetricsTable
+from assessor.config import DEFAULT_JOB_QUEUE_PORT, default_config
 from assessor.file_processor import get_available_prompt_styles
-from assessor.processor import process_folder
+from assessor.folder_index import FolderIndex
+from assessor.metrics import RunMetrics
+from assessor.sweep_plan import format_plan, plan_sweep
+
+
+def positive_int(value: str) -> int:
+    """
+    Parse a command line value that must be a whole number of at least one.
+
+    Args:
+        value: The value as given on the command line
+
+    Returns:
+        int: The parsed number
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not a whole number of at least one
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
 
 
 def main():
     """
     Main entry point for the assessor CLI.
     """
+    # Subcommands come first, e.g. "assessor worker --folder prompts"
+    if len(sys.argv) > 1 and sys.argv[1] in SUBCOMMANDS:
+        SUBCOMMANDS[sys.argv[1]](sys.argv[2:])
+        return
+
     # Set up argument parser
     parser = argparse.ArgumentParser(description='Process prompts with LLMs and generate assessments')
     parser.add_argument('--folder', type=str, default='prompts', help='Folder containing prompt files')
@@ -51,23 +146,57 @@ def main():
     parser.add_argument('--ollama', action='store_true', default=True, help='Use Ollama models')
     parser.add_argument('--prompt', type=str, help='Filter prompts by comma-separated style names (e.g., "plain,fancy"). Files are expected to follow the pattern "prompt-{style}.md"')
     parser.add_argument('--compare', nargs='+', help='Generate cross-prompt assessments for specified prompt styles')
+    parser.add_argument('--no-cache', action='store_true', help='Neither read nor write the model response cache')
+    parser.add_argument('--refresh', action='store_true', help='Regenerate every output, replacing its cached response')
+    parser.add_argument('--incremental', action='store_true', help='Only regenerate outputs and assessments whose inputs changed since the last run')
+    parser.add_argument('--resume', action='store_true', help='Continue an interrupted run, keeping the files it completed')
+    parser.add_argument('--stream', action='store_true', help='Write each response to its output file as it arrives')
+    parser.add_argument('--samples', type=positive_int, default=1,
+                        help='Number of replicate generations per prompt and model, '
+                             'assessed as a group')
+    parser.add_argument('--assess-every-output', action='store_true', help='Attach every output to its assessment instead of one of each group of near-identical outputs')
+    parser.add_argument('--code-metrics', action='store_true', help=f'Measure the code in every output and write the table to {CODE_METRICS_FILE_NAME}')
+    parser.add_argument('--batch', action='store_true', help='Submit OpenAI generations and assessments as batch jobs')
+    parser.add_argument('--local-batch', action='store_true', help='Simulate batch submission locally instead of calling the batch API')
 
     args = parser.parse_args()
 
-    # Create file gateway and use default config
-    file_gateway = FileGateway()
+    # The processing and assessment modules load the LLM clients, so only commands that call a
+    # model import them
+    from assessor.assessment import CrossPromptComparison, generate_cross_prompt_assessment
+    from assessor.batch import LocalBatchGateway
+    from assessor.processor import process_folder
+
+    # Use default config, read each prompt and output file once for the whole run, and write
+    # files in the background
     config = default_config
+    file_gateway = config.get_file_gateway()
 
-    # Process prompts with LLMs
-    process_folder(
-        folder_path=args.folder, 
-        use_openai=args.openai, 
-        use_ollama=args.ollama, 
-        prompt_pattern=args.prompt,
-        config=config,
-        file_gateway=file_gateway
-    )
-    print(f"Successfully processed files in {args.folder}")
+    # Near-identical outputs are assessed through one representative unless told otherwise
+    if args.assess_every_output:
+        config.similarity_threshold = None
+
+    # Reuse cached responses for unchanged prompts unless told otherwise
+    cache = None if args.no_cache else config.get_response_cache(refresh=args.refresh)
+
+    # Track the inputs of every generated file so unchanged ones can be kept
+    manifest = config.get_build_manifest(args.folder) if args.incremental else None
+
+    # Time every model call of the run and count its tokens
+    metrics = RunMetrics()
+
+    # Journal every completed file so an interrupted run can be resumed
+    journal = config.get_run_journal(args.folder, resume=args.resume, file_gateway=file_gateway)
+
+    # Send OpenAI traffic as batch jobs when asked to
+    batch_gateway = None
+    if args.local_batch:
+        batch_gateway = LocalBatchGateway()
+    elif args.batch:
+        batch_gateway = config.get_openai_batch_gateway()
+
+    # Scan the folder once; every phase shares the index
+    index = FolderIndex.from_folder(args.folder, file_gateway, args.samples)
 
     # Determine which prompt styles to compare
     styles_to_compare = []
@@ -80,21 +209,61 @@ def main():
         styles_to_compare = [style.strip() for style in args.prompt.split(',')]
     else:
         # Use all available styles
-        styles_to_compare = get_available_prompt_styles(args.folder, file_gateway)
+        styles_to_compare = get_available_prompt_styles(args.folder, file_gateway, index)
+
+    # Cross-prompt assessments start during processing, as soon as a model's outputs are complete
+    comparison = CrossPromptComparison(styles_to_compare) if len(styles_to_compare) >= 2 else None
+
+    # Process prompts with LLMs
+    process_folder(
+        folder_path=args.folder, 
+        use_openai=args.openai, 
+        use_ollama=args.ollama, 
+        prompt_pattern=args.prompt,
+        config=config,
+        file_gateway=file_gateway,
+        cache=cache,
+        manifest=manifest,
+        stream=args.stream,
+        batch_gateway=batch_gateway,
+        comparison=comparison,
+        index=index,
+        journal=journal,
+        metrics=metrics,
+        samples=args.samples
+    )
+    print(f"Successfully processed files in {args.folder}")
+    if cache is not None:
+        print(f"Response cache: {cache.stats()}")
+
+    # Compare the code of every model and style locally, before the slow cross-prompt assessments
+    if args.code_metrics:
+        code_metrics = CodeMetricsTable.from_index(index, file_gateway)
+        print(code_metrics.summary())
+        print(f"Code metrics written to "
+              f"{code_metrics.write_csv(Path(args.folder) / CODE_METRICS_FILE_NAME, file_gateway)}")
 
     # Ensure we have at least two styles to compare
     if len(styles_to_compare) < 2:
+        file_gateway.close()
+        print(f"Metrics written to {metrics.write(args.folder)}")
         print("Error: At least two prompt styles are required for comparison.")
         sys.exit(1)
 
-    # Generate cross-prompt assessments
+    # Generate the cross-prompt assessments not already written during processing
     print(f"Generating cross-prompt assessments for styles: {', '.join(styles_to_compare)}")
-    assessment_files = generate_cross_prompt_assessment(
+    assessment_files = dict(comparison.assessment_files)
+    assessment_files.update(generate_cross_prompt_assessment(
         folder_path=args.folder, 
         prompt_styles=styles_to_compare,
         config=config,
-        file_gateway=file_gateway
-    )
+        file_gateway=file_gateway,
+        manifest=manifest,
+        exclude_models=comparison.assessment_files,
+        index=index,
+        journal=journal,
+        metrics=metrics
+    ))
 
     if assessment_files:
         print(f"Created {len(assessment_files)} cross-prompt assessments")
@@ -105,5 +274,169 @@ def main():
 
     print("Cross-prompt assessments completed")
 
+    # Wait for the background writer to put the last files on disk
+    file_gateway.close()
+    if manifest is not None:
+        print(f"Incremental build: {manifest.stats()}")
+    if args.resume:
+        print(f"Resumed run: {journal.stats()}")
+    print(f"File contents: {file_gateway.stats()}")
+
+    # Report which models dominated the run's time and tokens
+    print(metrics.summary())
+    print(f"Metrics written to {metrics.write(args.folder)}")
+
+def coordinate(argv):
+    """
+    Run a sweep through the job queue, waiting for workers to run its jobs.
+
+    Args:
+        argv: Command-line arguments following "coordinate"
+    """
+    parser = argparse.ArgumentParser(
+        prog='assessor coordinate', description='Enqueue a sweep and wait for workers to run it')
+    parser.add_argument('--folder', type=str, default='prompts', help='Folder containing prompt files, on a local filesystem')
+    parser.add_argument('--openai', action='store_true', default=True, help='Use OpenAI models')
+    parser.add_argument('--ollama', action='store_true', default=True, help='Use Ollama models')
+    parser.add_argument('--prompt', type=str, help='Filter prompts by comma-separated style names')
+    parser.add_argument('--compare', nargs='+', help='Generate cross-prompt assessments for specified prompt styles')
+    parser.add_argument('--samples', type=positive_int, default=1,
+                        help='Number of replicate generations per prompt and model')
+    parser.add_argument('--resume', action='store_true', help='Keep the jobs of an interrupted sweep, retrying its failed jobs, instead of starting over')
+    parser.add_argument('--serve', type=positive_int, nargs='?', const=DEFAULT_JOB_QUEUE_PORT,
+                        metavar='PORT',
+                        help='Serve the job queue to workers on other machines '
+                             f'(default port: {DEFAULT_JOB_QUEUE_PORT})')
+    args = parser.parse_args(argv)
+
+    from assessor.distributed import run_coordinator
+
+    config = default_config
+    file_gateway = config.get_file_gateway()
+
+    if args.compare:
+        styles_to_compare = args.compare
+    elif args.prompt:
+        styles_to_compare = [style.strip() for style in args.prompt.split(',')]
+    else:
+        styles_to_compare = get_available_prompt_styles(args.folder, file_gateway)
+
+    summary = run_coordinator(
+        folder_path=args.folder,
+        use_openai=args.openai,
+        use_ollama=args.ollama,
+        prompt_pattern=args.prompt,
+        config=config,
+        file_gateway=file_gateway,
+        samples=args.samples,
+        compare_styles=styles_to_compare,
+        resume=args.resume,
+        serve_port=args.serve
+    )
+    file_gateway.close()
+
+    for kind, counts in summary.items():
+        print(f"{kind}: {counts['done']} done, {counts['failed']} failed")
+    if any(counts['failed'] for counts in summary.values()):
+        sys.exit(1)
+
+def worker(argv):
+    """
+    Run jobs from the job queue of a folder.
+
+    Args:
+        argv: Command-line arguments following "worker"
+    """
+    parser = argparse.ArgumentParser(
+        prog='assessor worker', description='Run the jobs a coordinator enqueued')
+    parser.add_argument('--folder', type=str, default='prompts', help='Folder containing prompt files and the job queue')
+    parser.add_argument('--queue-url', type=str,
+                        help="URL of a coordinator's served job queue on another machine "
+                             "(default: the queue in the folder)")
+    parser.add_argument('--concurrency', type=positive_int, default=1,
+                        help='Number of jobs to run at once')
+    parser.add_argument('--idle-exit', type=float, help='Exit after this many seconds without a job (default: wait forever)')
+    parser.add_argument('--name', type=str, help='Name recorded with the leases (default: host name and process ID)')
+    parser.add_argument('--no-cache', action='store_true', help='Neither read nor write the model response cache')
+    args = parser.parse_args(argv)
+
+    from assessor.distributed import run_worker
+
+    config = default_config
+    metrics = RunMetrics()
+    completed = run_worker(
+        folder_path=args.folder,
+        config=config,
+        file_gateway=config.get_file_gateway(),
+        queue=config.get_job_queue(args.folder, args.queue_url),
+        cache=None if args.no_cache else config.get_response_cache(),
+        metrics=metrics,
+        worker_name=args.name,
+        concurrency=args.concurrency,
+        idle_exit_seconds=args.idle_exit
+    )
+    print(f"Completed {completed} jobs")
+    print(metrics.summary())
+
+def styles(argv):
+    """
+    List the prompt styles of a folder.
+
+    Args:
+        argv: Command-line arguments following "styles"
+    """
+    parser = argparse.ArgumentParser(
+        prog='assessor styles', description='List the prompt styles in a folder')
+    parser.add_argument('--folder', type=str, default='prompts', help='Folder containing prompt files')
+    args = parser.parse_args(argv)
+
+    for style in get_available_prompt_styles(args.folder):
+        print(style)
+
+def plan(argv):
+    """
+    Show the files a sweep would write and which of them already exist.
+
+    Args:
+        argv: Command-line arguments following "plan"
+    """
+    parser = argparse.ArgumentParser(
+        prog='assessor plan', description='Show the outputs and assessments a sweep would write')
+    parser.add_argument('--folder', type=str, default='prompts', help='Folder containing prompt files')
+    parser.add_argument('--openai', action='store_true', default=True, help='Use OpenAI models')
+    parser.add_argument('--ollama', action='store_true', default=True, help='Use Ollama models')
+    parser.add_argument('--prompt', type=str, help='Filter prompts by comma-separated style names')
+    parser.add_argument('--compare', nargs='+', help='Plan cross-prompt assessments for specified prompt styles')
+    parser.add_argument('--samples', type=positive_int, default=1,
+                        help='Number of replicate generations per prompt and model')
+    args = parser.parse_args(argv)
+
+    index = FolderIndex.from_folder(args.folder, samples=args.samples)
+
+    if args.compare:
+        styles_to_compare = args.compare
+    elif args.prompt:
+        styles_to_compare = [style.strip() for style in args.prompt.split(',')]
+    else:
+        styles_to_compare = index.prompt_styles()
+
+    print(format_plan(plan_sweep(
+        folder_path=args.folder,
+        use_openai=args.openai,
+        use_ollama=args.ollama,
+        prompt_pattern=args.prompt,
+        samples=args.samples,
+        compare_styles=styles_to_compare,
+        index=index
+    )))
+
+# Commands run as "assessor <command> [options]"; without one, a whole sweep runs in this process
+SUBCOMMANDS = {
+    'coordinate': coordinate,
+    'worker': worker,
+    'styles': styles,
+    'plan': plan,
+}
+
 if __name__ == "__main__":
     main()
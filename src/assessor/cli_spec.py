@@ -0,0 +1,30 @@
+"""
+Tests for the cli module.
+"""
+
+import argparse
+
+import pytest
+
+from assessor.cli import positive_int
+
+
+class DescribePositiveInt:
+    """Tests for the positive_int function."""
+
+    def should_parse_a_whole_number_of_at_least_one(self):
+        """It should return the number given on the command line."""
+        result = positive_int("3")
+
+        assert result == 3
+
+    def should_reject_numbers_below_one(self):
+        """It should not accept zero or negative counts."""
+        for value in ("0", "-2"):
+            with pytest.raises(argparse.ArgumentTypeError):
+                positive_int(value)
+
+    def should_reject_a_value_that_is_not_a_number(self):
+        """It should report a value that is not a whole number."""
+        with pytest.raises(argparse.ArgumentTypeError):
+            positive_int("three")
@@ -0,0 +1,339 @@
+"""
+Code metrics module for the assessor package.
+
+This module extracts the fenced code blocks of every output file and measures their style
+(function length, nesting depth, comment density, type-hint usage, test presence and cyclomatic
+complexity) into a columnar table across all models and prompt styles, so the styles can be
+compared quantitatively in seconds, without waiting on the assessment model.
+"""
+
+import ast
+import csv
+import io
+import re
+from collections import defaultdict
+from pathlib import Path
+from statistics import fmean
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+from assessor.file_gateway import FileGateway
+from assessor.folder_index import FileKind, FolderIndex
+
+CODE_METRICS_FILE_NAME = "code-metrics.csv"
+
+# A fenced code block: its language tag and its body
+FENCE_PATTERN = re.compile(r"^```[ \t]*([\w+#.-]*)[^\n]*\n(.*?)^```", re.MULTILINE | re.DOTALL)
+
+PYTHON_LANGUAGES = {"", "py", "python", "python3"}
+
+# Heuristics for code that is not Python, or Python that does not parse
+FUNCTION_PATTERN = re.compile(
+    r"^\s*(?:(?:export|public|private|protected|static|async|pub)\s+)*"
+    r"(?:def|function|func|fn|fun|sub)\s+\w+", re.MULTILINE)
+BRANCH_PATTERN = re.compile(r"\b(?:if|elif|for|while|case|catch|except)\b|&&|\|\|")
+TEST_PATTERN = re.compile(
+    r"\bdef (?:test_|should_)|\b(?:describe|it|test)\(|@Test\b|\bassert", re.IGNORECASE)
+COMMENT_PREFIXES = ("#", "//", "/*", "*", "--", "<!--")
+
+# Python statements that open a nested block
+BLOCK_NODES = (ast.If, ast.For, ast.AsyncFor, ast.While, ast.With, ast.AsyncWith, ast.Try,
+               ast.Match, ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+BRANCH_NODES = (ast.If, ast.IfExp, ast.For, ast.AsyncFor, ast.While, ast.ExceptHandler,
+                ast.comprehension, ast.match_case)
+# Nodes whose branches count towards their own complexity rather than the enclosing function's
+SCOPE_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)
+
+KEY_COLUMNS = ("file", "model", "style", "sample")
+METRIC_COLUMNS = (
+    "code_blocks", "code_lines", "functions", "function_length", "nesting_depth",
+    "comment_density", "type_hint_ratio", "has_tests", "complexity",
+)
+
+
+class CodeBlock(NamedTuple):
+    """A fenced code block of an output file."""
+
+    language: str
+    code: str
+
+
+def extract_code_blocks(text: str) -> List[CodeBlock]:
+    """
+    Extract the fenced code blocks of a markdown text.
+
+    Args:
+        text: The markdown text
+
+    Returns:
+        list: The code blocks, in order, with their lowercased language tags
+    """
+    return [
+        CodeBlock(language.lower(), code) for language, code in FENCE_PATTERN.findall(text)
+    ]
+
+
+def measure_code(text: str) -> Dict[str, Optional[float]]:
+    """
+    Measure the style of the code in a markdown text.
+
+    Python blocks are measured from their syntax tree; other languages, and Python that does
+    not parse, are measured with line-based heuristics and have no type-hint ratio.
+
+    Args:
+        text: The markdown text, e.g. a model's output
+
+    Returns:
+        dict: A value for each of METRIC_COLUMNS; averages are None when there is nothing to
+              average, e.g. the function length of code without functions
+    """
+    blocks = extract_code_blocks(text)
+    function_lengths: List[int] = []
+    complexities: List[int] = []
+    hinted = annotatable = 0
+    code_lines = comment_lines = nesting_depth = 0
+    has_tests = False
+
+    for block in blocks:
+        lines = [line for line in block.code.splitlines() if line.strip()]
+        code_lines += len(lines)
+        comment_lines += sum(line.strip().startswith(COMMENT_PREFIXES) for line in lines)
+
+        tree = _parse_python(block)
+        if tree is not None:
+            functions = [
+                node for node in ast.walk(tree)
+                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+            ]
+            for function in functions:
+                function_lengths.append(function.end_lineno - function.lineno + 1)
+                complexities.append(_complexity(function))
+                block_hinted, block_annotatable = _type_hints(function)
+                hinted += block_hinted
+                annotatable += block_annotatable
+            nesting_depth = max(nesting_depth, _nesting_depth(tree))
+            has_tests = has_tests or any(
+                isinstance(node, ast.Assert) for node in ast.walk(tree)
+            ) or any(function.name.startswith(("test_", "should_")) for function in functions)
+        else:
+            functions = FUNCTION_PATTERN.findall(block.code)
+            if functions:
+                function_lengths.append(len(lines) // len(functions))
+            complexities.append(1 + len(BRANCH_PATTERN.findall(block.code)))
+            nesting_depth = max(nesting_depth, _text_nesting_depth(lines))
+            has_tests = has_tests or bool(TEST_PATTERN.search(block.code))
+
+    return {
+        "code_blocks": len(blocks),
+        "code_lines": code_lines,
+        "functions": len(function_lengths),
+        "function_length": fmean(function_lengths) if function_lengths else None,
+        "nesting_depth": nesting_depth,
+        "comment_density": comment_lines / code_lines if code_lines else None,
+        "type_hint_ratio": hinted / annotatable if annotatable else None,
+        "has_tests": int(has_tests),
+        "complexity": fmean(complexities) if complexities else None,
+    }
+
+
+class CodeMetricsTable:
+    """Columnar table of the code metrics of every output, one row per output file."""
+
+    def __init__(self):
+        """Initialize an empty table."""
+        self.columns: Dict[str, list] = {name: [] for name in (*KEY_COLUMNS, *METRIC_COLUMNS)}
+
+    @classmethod
+    def from_index(
+        cls,
+        index: FolderIndex,
+        file_gateway: Optional[FileGateway] = None,
+        prompt_styles: Optional[List[str]] = None
+    ) -> "CodeMetricsTable":
+        """
+        Measure the code of every output file in a folder index.
+
+        Args:
+            index: FolderIndex of the folder
+            file_gateway: Optional FileGateway instance (defaults to a new instance)
+            prompt_styles: Optional prompt styles to limit the table to (defaults to all)
+
+        Returns:
+            CodeMetricsTable: The table, with one row per output file
+        """
+        file_gateway = file_gateway or FileGateway()
+        table = cls()
+        for record in index.files(FileKind.OUTPUT):
+            if prompt_styles is not None and record.style not in prompt_styles:
+                continue
+            table.append(
+                {"file": record.path.name, "model": record.model, "style": record.style,
+                 "sample": record.sample},
+                measure_code(file_gateway.read_file(record.path))
+            )
+        return table
+
+    def __len__(self) -> int:
+        return len(self.columns["file"])
+
+    def append(self, keys: Dict[str, object], metrics: Dict[str, Optional[float]]) -> None:
+        """
+        Add the row of one output file.
+
+        Args:
+            keys: Value of each of KEY_COLUMNS
+            metrics: Value of each of METRIC_COLUMNS, as returned by measure_code
+        """
+        for name in KEY_COLUMNS:
+            self.columns[name].append(keys.get(name))
+        for name in METRIC_COLUMNS:
+            self.columns[name].append(metrics.get(name))
+
+    def aggregate(
+        self,
+        by: Tuple[str, ...] = ("model", "style")
+    ) -> Dict[Tuple, Dict[str, Optional[float]]]:
+        """
+        Average every metric column over the rows sharing the same key values.
+
+        The rows are grouped once, and each metric column is then averaged for all groups at
+        once; missing values are left out of the averages.
+
+        Args:
+            by: Key columns to group by
+
+        Returns:
+            dict: Group key tuple -> metric name -> mean value (None when every value is
+                  missing), plus the number of rows as "outputs", in sorted key order
+        """
+        groups: Dict[Tuple, List[int]] = defaultdict(list)
+        for row, key in enumerate(zip(*(self.columns[name] for name in by))):
+            groups[key].append(row)
+
+        keys = sorted(groups, key=lambda key: tuple(str(part) for part in key))
+        aggregates = {key: {"outputs": len(groups[key])} for key in keys}
+        for name in METRIC_COLUMNS:
+            column = self.columns[name]
+            for key in keys:
+                values = [column[row] for row in groups[key] if column[row] is not None]
+                aggregates[key][name] = fmean(values) if values else None
+        return aggregates
+
+    def write_csv(
+        self,
+        file_path: Union[str, Path],
+        file_gateway: Optional[FileGateway] = None
+    ) -> Path:
+        """
+        Write the table as a CSV file with one row per output file.
+
+        Args:
+            file_path: Path of the CSV file
+            file_gateway: Optional FileGateway instance used to write the file (defaults to a
+                          new instance)
+
+        Returns:
+            Path: The CSV file path
+        """
+        # Use provided file gateway or create a new one
+        file_gateway = file_gateway or FileGateway()
+
+        # The gateway writes text, which translates newlines itself
+        content = io.StringIO()
+        writer = csv.writer(content, lineterminator="\n")
+        writer.writerow(self.columns)
+        writer.writerows(zip(*self.columns.values()))
+        path = Path(file_path)
+        file_gateway.write_file(path, content.getvalue())
+        return path
+
+    def summary(self, by: Tuple[str, ...] = ("model", "style")) -> str:
+        """
+        Format the aggregated metrics as a fixed-width table.
+
+        Args:
+            by: Key columns to group by
+
+        Returns:
+            str: The summary table
+        """
+        header = (
+            f"{'model':<28} {'style':<12} {'outputs':>7} {'fn len':>7} {'nesting':>7} "
+            f"{'comments':>8} {'hints':>6} {'tests':>6} {'complexity':>10}"
+        )
+        rows = [header, "-" * len(header)]
+        for key, values in self.aggregate(by).items():
+            parts = dict(zip(by, key))
+            rows.append(
+                f"{str(parts.get('model', '*')):<28} {str(parts.get('style', '*')):<12} "
+                f"{values['outputs']:>7} {_format(values['function_length'], 7, '.1f')} "
+                f"{_format(values['nesting_depth'], 7, '.1f')} "
+                f"{_format(values['comment_density'], 8, '.0%')} "
+                f"{_format(values['type_hint_ratio'], 6, '.0%')} "
+                f"{_format(values['has_tests'], 6, '.0%')} "
+                f"{_format(values['complexity'], 10, '.1f')}"
+            )
+        return "\n".join(rows)
+
+
+def _format(value: Optional[float], width: int, spec: str) -> str:
+    return f"{'-':>{width}}" if value is None else f"{value:>{width}{spec}}"
+
+
+def _parse_python(block: CodeBlock) -> Optional[ast.AST]:
+    if block.language not in PYTHON_LANGUAGES:
+        return None
+    try:
+        return ast.parse(block.code)
+    except (SyntaxError, ValueError):
+        return None
+
+
+def _complexity(function: ast.AST) -> int:
+    # McCabe complexity: one path plus one for every branch and extra boolean operand, leaving
+    # out nested functions, which are measured on their own
+    complexity = 1
+    nodes = list(ast.iter_child_nodes(function))
+    while nodes:
+        node = nodes.pop()
+        if isinstance(node, SCOPE_NODES):
+            continue
+        if isinstance(node, BRANCH_NODES):
+            complexity += 1
+        elif isinstance(node, ast.BoolOp):
+            complexity += len(node.values) - 1
+        nodes.extend(ast.iter_child_nodes(node))
+    return complexity
+
+
+def _type_hints(function: ast.AST) -> Tuple[int, int]:
+    arguments = [
+        *function.args.posonlyargs, *function.args.args, *function.args.kwonlyargs,
+        *filter(None, (function.args.vararg, function.args.kwarg)),
+    ]
+    arguments = [argument for argument in arguments if argument.arg not in ("self", "cls")]
+    hinted = sum(argument.annotation is not None for argument in arguments)
+    hinted += function.returns is not None
+    return hinted, len(arguments) + 1
+
+
+def _nesting_depth(node: ast.AST, depth: int = 0) -> int:
+    deepest = depth
+    for child in ast.iter_child_nodes(node):
+        child_depth = depth + 1 if isinstance(child, BLOCK_NODES) else depth
+        deepest = max(deepest, _nesting_depth(child, child_depth))
+    return deepest
+
+
+def _text_nesting_depth(lines: List[str]) -> int:
+    # Deepest brace nesting, or indentation in steps of four spaces for brace-less languages
+    depth = deepest_brace = deepest_indent = 0
+    for line in lines:
+        expanded = line.expandtabs(4)
+        deepest_indent = max(deepest_indent, (len(expanded) - len(expanded.lstrip())) // 4)
+        for character in line:
+            if character == "{":
+                depth += 1
+                deepest_brace = max(deepest_brace, depth)
+            elif character == "}":
+                depth = max(0, depth - 1)
+    return max(deepest_brace, deepest_indent)
@@ -0,0 +1,145 @@
+"""
+Tests for the code_metrics module.
+"""
+
+from assessor.code_metrics import CodeMetricsTable, extract_code_blocks, measure_code
+from assessor.file_gateway import FileGateway
+from assessor.folder_index import FolderIndex
+
+PYTHON_OUTPUT = '''Here is the function:
+
+```python
+def classify(value: int) -> str:
+    # Sign of the value
+    if value > 0 and value < 10:
+        return "small"
+    for _ in range(3):
+        if value:
+            return "other"
+    return "zero"
+```
+'''
+
+NESTED_PYTHON_OUTPUT = '''```python
+def outer(values):
+    def inner(value):
+        if value:
+            return value
+        return 0
+    return [inner(value) for value in values]
+```
+'''
+
+JAVASCRIPT_OUTPUT = '''```javascript
+function add(a, b) {
+    if (a) {
+        return a + b;
+    }
+    return b;
+}
+
+test("adds", () => {
+    expect(add(1, 2)).toBe(3);
+});
+```
+'''
+
+
+class DescribeExtractCodeBlocks:
+    """Tests for the extract_code_blocks function."""
+
+    def should_extract_each_fenced_block_with_its_language(self):
+        """It should return the language and body of every fenced block."""
+        result = extract_code_blocks(PYTHON_OUTPUT + "\n" + JAVASCRIPT_OUTPUT)
+
+        assert [block.language for block in result] == ["python", "javascript"]
+        assert result[0].code.startswith("def classify")
+
+
+class DescribeMeasureCode:
+    """Tests for the measure_code function."""
+
+    def should_measure_python_from_its_syntax_tree(self):
+        """It should count functions, branches, nesting, comments and type hints."""
+        result = measure_code(PYTHON_OUTPUT)
+
+        assert result["functions"] == 1
+        assert result["function_length"] == 8
+        assert result["complexity"] == 5
+        assert result["nesting_depth"] == 3
+        assert result["comment_density"] == 1 / 8
+        assert result["type_hint_ratio"] == 1.0
+        assert result["has_tests"] == 0
+
+    def should_count_the_branches_of_a_nested_function_once(self):
+        """It should count a nested function's branches towards its own complexity only."""
+        result = measure_code(NESTED_PYTHON_OUTPUT)
+
+        assert result["functions"] == 2
+        assert result["complexity"] == 2
+
+    def should_measure_other_languages_with_heuristics(self):
+        """It should measure code that is not Python without a type-hint ratio."""
+        result = measure_code(JAVASCRIPT_OUTPUT)
+
+        assert result["functions"] == 1
+        assert result["nesting_depth"] == 2
+        assert result["type_hint_ratio"] is None
+        assert result["has_tests"] == 1
+
+    def should_leave_averages_of_prose_empty(self):
+        """It should report no averages for an output without code."""
+        result = measure_code("No code here.")
+
+        assert result["code_blocks"] == 0
+        assert result["function_length"] is None
+
+
+class DescribeCodeMetricsTable:
+    """Tests for the CodeMetricsTable class."""
+
+    def should_measure_every_output_in_the_index(self, tmp_path):
+        """It should add a row for each output file, keyed by its model and style."""
+        (tmp_path / "prompt-plain-output-model-a.md").write_text(PYTHON_OUTPUT)
+        (tmp_path / "prompt-fancy-output-model-a.md").write_text(JAVASCRIPT_OUTPUT)
+        (tmp_path / "prompt-plain.md").write_text("Write a function")
+
+        result = CodeMetricsTable.from_index(FolderIndex.from_folder(tmp_path))
+
+        assert len(result) == 2
+        assert sorted(result.columns["style"]) == ["fancy", "plain"]
+
+    def should_average_each_metric_per_group(self):
+        """It should average the metrics of the rows sharing a key, skipping missing values."""
+        table = CodeMetricsTable()
+        table.append({"model": "model-a", "style": "plain"}, measure_code(PYTHON_OUTPUT))
+        table.append({"model": "model-a", "style": "plain"}, measure_code("No code here."))
+
+        result = table.aggregate(by=("model",))
+
+        assert result[("model-a",)]["outputs"] == 2
+        assert result[("model-a",)]["function_length"] == 8
+        assert result[("model-a",)]["code_blocks"] == 0.5
+
+    def should_write_one_csv_row_per_output(self, tmp_path):
+        """It should write a header and a row for each output file."""
+        table = CodeMetricsTable()
+        table.append({"file": "prompt-plain-output-model-a.md"}, measure_code(PYTHON_OUTPUT))
+
+        path = table.write_csv(tmp_path / "code-metrics.csv")
+
+        lines = path.read_text().splitlines()
+        assert lines[0].startswith("file,model,style,sample,code_blocks")
+        assert len(lines) == 2
+
+    def should_write_the_csv_through_the_file_gateway(self, mocker):
+        """It should hand the whole table to the file gateway as one write."""
+        file_gateway = mocker.Mock(spec=FileGateway)
+        table = CodeMetricsTable()
+        table.append({"file": "prompt-plain-output-model-a.md"}, measure_code(PYTHON_OUTPUT))
+
+        table.write_csv("code-metrics.csv", file_gateway)
+
+        path, content = file_gateway.write_file.call_args.args
+        assert path.name == "code-metrics.csv"
+        assert content.count("\n") == 2
@@ -2,14 +2,28 @@
 Configuration module for the assessor package.
 
 This module centralizes configuration settings and provides factory functions
-for creating gateway instances, making the system more testable.
+for creating gateway instances, making the system more testable. The LLM clients are only
+imported when the first gateway or broker is created, so importing the configuration (and
+commands that never call a model) stays fast.
 """
 
 import os
-from typing import Dict, List, Optional, Any
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, List, Optional, Tuple, Union
 
-from mojentic.llm import LLMBroker
-from mojentic.llm.gateways import OpenAIGateway, OllamaGateway
+from assessor.build_manifest import BuildManifest
+from assessor.file_gateway import CachingFileGateway, FileGateway, WriteBehindFileGateway
+from assessor.job_queue import JobQueue
+from assessor.ollama_pool import OllamaEndpoint, OllamaHostPool, ollama_endpoint
+from assessor.rate_limiter import RateLimitedGateway, RateLimiter
+from assessor.response_cache import ResponseCache
+from assessor.run_journal import RunJournal
+
+if TYPE_CHECKING:
+    from mojentic.llm import LLMBroker
+
+    from assessor.batch import OpenAIBatchGateway
+    from assessor.queue_server import RemoteJobQueue
 
 # Default model configurations
 DEFAULT_OPENAI_MODELS = [
@@ -34,6 +48,108 @@ DEFAULT_OLLAMA_MODELS = [
 
 DEFAULT_ASSESSMENT_MODEL = "o1"
 
+# Default number of concurrent requests per provider
+DEFAULT_OPENAI_CONCURRENCY = 4
+DEFAULT_OLLAMA_CONCURRENCY = 1
+DEFAULT_ASSESSMENT_CONCURRENCY = 2
+
+# Default number of Ollama models that fit in memory at once, and how long Ollama keeps a
+# preloaded model resident
+DEFAULT_OLLAMA_RESIDENT_MODELS = 1
+DEFAULT_OLLAMA_KEEP_ALIVE = "10m"
+
+# Default time between status checks of a submitted batch job
+DEFAULT_BATCH_POLL_SECONDS = 60
+
+# Default upper bound on the estimated tokens of one assessment request; larger output sets
+# are assessed in groups whose partial assessments are then merged
+DEFAULT_ASSESSMENT_TOKEN_BUDGET = 100_000
+
+# Default n-gram similarity above which outputs of the same prompt count as near-identical; only
+# one output of each near-identical group is sent to the assessment model
+DEFAULT_SIMILARITY_THRESHOLD = 0.9
+
+# Default pace of OpenAI requests; set them to the limits of your account's usage tier. Ollama
+# is paced only by its concurrency unless limits are configured
+DEFAULT_OPENAI_REQUESTS_PER_MINUTE = 500
+DEFAULT_OPENAI_TOKENS_PER_MINUTE = 200_000
+
+# Default retries of rate-limited and transiently failing requests
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_RETRY_BASE_SECONDS = 1.0
+DEFAULT_RETRY_MAX_SECONDS = 60.0
+
+# Default location and size budget for cached model responses
+DEFAULT_CACHE_FOLDER = ".assessor-cache"
+DEFAULT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# Default lease of a distributed job, renewed by the worker's heartbeats every third of it; the
+# time between checks of the job queue; and the attempts before a failing job is given up
+DEFAULT_JOB_LEASE_SECONDS = 120
+DEFAULT_JOB_POLL_SECONDS = 5
+DEFAULT_JOB_MAX_ATTEMPTS = 3
+
+# Default port the coordinator serves its job queue on for workers on other machines
+DEFAULT_JOB_QUEUE_PORT = 8765
+
+# Default size budget for file contents kept in memory during a run
+DEFAULT_CONTENT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Default number of file writes queued for the background writer before writers wait
+DEFAULT_MAX_PENDING_WRITES = 64
+
+class ClientPool:
+    """
+    Thread-safe registry of long-lived gateways and brokers.
+
+    Gateways hold HTTP clients, so sharing one per provider for the whole run reuses their
+    connections and TLS sessions instead of paying client setup on every request.
+    """
+
+    def __init__(self):
+        self._instances: Dict[Hashable, Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Get the instance registered under a key, creating it on first use.
+
+        Args:
+            key: Identifies the instance, e.g. a (provider, model) tuple
+            factory: Creates the instance when none is registered yet
+
+        Returns:
+            The shared instance
+        """
+        with self._lock:
+            if key not in self._instances:
+                self._instances[key] = factory()
+            return self._instances[key]
+
+    def clear(self) -> None:
+        """Forget every registered instance."""
+        with self._lock:
+            self._instances.clear()
+
+# Gateways and brokers shared by every Config in the process
+client_pool = ClientPool()
+
+def get_llm_broker(model_name: str, gateway) -> "LLMBroker":
+    """
+    Get the shared LLM broker for a model served by a gateway.
+
+    Args:
+        model_name: Name of the model
+        gateway: LLM gateway serving the model
+
+    Returns:
+        LLMBroker: A broker reused by every call for the same gateway and model
+    """
+    from mojentic.llm import LLMBroker
+
+    return client_pool.get(
+        ("broker", gateway, model_name), lambda: LLMBroker(model=model_name, gateway=gateway))
+
 class Config:
     """Configuration class for the assessor package."""
     
@@ -43,6 +159,31 @@ class Config:
         openai_models: Optional[List[str]] = None,
         ollama_models: Optional[List[str]] = None,
         assessment_model: str = DEFAULT_ASSESSMENT_MODEL,
+        openai_concurrency: int = DEFAULT_OPENAI_CONCURRENCY,
+        ollama_concurrency: int = DEFAULT_OLLAMA_CONCURRENCY,
+        assessment_concurrency: int = DEFAULT_ASSESSMENT_CONCURRENCY,
+        assessment_token_budget: int = DEFAULT_ASSESSMENT_TOKEN_BUDGET,
+        similarity_threshold: Optional[float] = DEFAULT_SIMILARITY_THRESHOLD,
+        ollama_resident_models: int = DEFAULT_OLLAMA_RESIDENT_MODELS,
+        ollama_preload: bool = False,
+        ollama_keep_alive: str = DEFAULT_OLLAMA_KEEP_ALIVE,
+        ollama_hosts: Optional[List[Union[str, Dict[str, Any], OllamaEndpoint]]] = None,
+        openai_requests_per_minute: Optional[float] = DEFAULT_OPENAI_REQUESTS_PER_MINUTE,
+        openai_tokens_per_minute: Optional[float] = DEFAULT_OPENAI_TOKENS_PER_MINUTE,
+        ollama_requests_per_minute: Optional[float] = None,
+        ollama_tokens_per_minute: Optional[float] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        retry_base_seconds: float = DEFAULT_RETRY_BASE_SECONDS,
+        retry_max_seconds: float = DEFAULT_RETRY_MAX_SECONDS,
+        cache_folder: str = DEFAULT_CACHE_FOLDER,
+        cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        content_cache_max_bytes: int = DEFAULT_CONTENT_CACHE_MAX_BYTES,
+        max_pending_writes: int = DEFAULT_MAX_PENDING_WRITES,
+        batch_poll_seconds: float = DEFAULT_BATCH_POLL_SECONDS,
+        job_lease_seconds: float = DEFAULT_JOB_LEASE_SECONDS,
+        job_poll_seconds: float = DEFAULT_JOB_POLL_SECONDS,
+        job_max_attempts: int = DEFAULT_JOB_MAX_ATTEMPTS,
+        job_queue_token: Optional[str] = None,
         custom_config: Optional[Dict[str, Any]] = None
     ):
         """
@@ -53,25 +194,210 @@ class Config:
             openai_models: List of OpenAI models to use
             ollama_models: List of Ollama models to use
             assessment_model: Model to use for assessments
+            openai_concurrency: Maximum number of simultaneous OpenAI requests
+            ollama_concurrency: Maximum number of simultaneous Ollama requests
+            assessment_concurrency: Maximum number of simultaneous assessment requests
+            assessment_token_budget: Maximum estimated tokens of one assessment request
+            similarity_threshold: Similarity above which outputs are assessed through a single
+                                  representative (None to send every output)
+            ollama_resident_models: Number of Ollama models that fit in memory at once
+            ollama_preload: Whether to load each Ollama model before its first request, while
+                            the previous model finishes
+            ollama_keep_alive: How long Ollama keeps a preloaded model resident
+            ollama_hosts: Optional Ollama hosts to spread requests over, each a URL or an
+                          OllamaEndpoint (or dictionary of its fields) with the host's models,
+                          capacity and resident models (defaults to the local host, limited by
+                          ollama_concurrency and ollama_resident_models)
+            openai_requests_per_minute: OpenAI request rate to stay under (None for no limit)
+            openai_tokens_per_minute: OpenAI token rate to stay under (None for no limit)
+            ollama_requests_per_minute: Ollama request rate to stay under (None for no limit)
+            ollama_tokens_per_minute: Ollama token rate to stay under (None for no limit)
+            max_retries: Number of times a rate-limited or transiently failing request is retried
+            retry_base_seconds: Backoff before the first retry, doubled for every further one
+            retry_max_seconds: Upper bound on a single retry backoff
+            cache_folder: Folder for the persistent response cache
+            cache_max_bytes: Size budget for the response cache
+            content_cache_max_bytes: Size budget for file contents kept in memory during a run
+            max_pending_writes: Number of file writes queued for the background writer (0 to
+                                write on the calling thread)
+            batch_poll_seconds: Time between status checks of a submitted batch job
+            job_lease_seconds: Time a worker holds a distributed job without a heartbeat
+            job_poll_seconds: Time between checks of the job queue
+            job_max_attempts: Number of times a failing distributed job is tried
+            job_queue_token: Secret shared by a served job queue and its remote workers
+                             (defaults to ASSESSOR_QUEUE_TOKEN env var)
             custom_config: Additional custom configuration options
         """
         self.openai_api_key = openai_api_key or os.getenv("OPENAI_API_KEY")
         self.openai_models = openai_models or DEFAULT_OPENAI_MODELS
         self.ollama_models = ollama_models or DEFAULT_OLLAMA_MODELS
         self.assessment_model = assessment_model
+        self.openai_concurrency = openai_concurrency
+        self.ollama_concurrency = ollama_concurrency
+        self.assessment_concurrency = assessment_concurrency
+        self.assessment_token_budget = assessment_token_budget
+        self.similarity_threshold = similarity_threshold
+        self.ollama_resident_models = ollama_resident_models
+        self.ollama_preload = ollama_preload
+        self.ollama_keep_alive = ollama_keep_alive
+        self.ollama_hosts = (
+            tuple(ollama_endpoint(host) for host in ollama_hosts) if ollama_hosts else None
+        )
+        self.openai_requests_per_minute = openai_requests_per_minute
+        self.openai_tokens_per_minute = openai_tokens_per_minute
+        self.ollama_requests_per_minute = ollama_requests_per_minute
+        self.ollama_tokens_per_minute = ollama_tokens_per_minute
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.cache_folder = cache_folder
+        self.cache_max_bytes = cache_max_bytes
+        self.content_cache_max_bytes = content_cache_max_bytes
+        self.max_pending_writes = max_pending_writes
+        self.batch_poll_seconds = batch_poll_seconds
+        self.job_lease_seconds = job_lease_seconds
+        self.job_poll_seconds = job_poll_seconds
+        self.job_max_attempts = job_max_attempts
+        self.job_queue_token = job_queue_token or os.getenv("ASSESSOR_QUEUE_TOKEN")
         self.custom_config = custom_config or {}
         
-    def get_openai_gateway(self) -> OpenAIGateway:
-        """Get an instance of the OpenAI gateway."""
-        return OpenAIGateway(api_key=self.openai_api_key)
+    def get_openai_gateway(self) -> RateLimitedGateway:
+        """Get the shared, rate-limited OpenAI gateway for the configured API key."""
+        from mojentic.llm.gateways import OpenAIGateway
+
+        return client_pool.get(
+            ("openai", self.openai_api_key,
+             *self.get_rate_limit_key(
+                 self.openai_requests_per_minute, self.openai_tokens_per_minute)),
+            lambda: RateLimitedGateway(
+                OpenAIGateway(api_key=self.openai_api_key),
+                self.get_rate_limiter(
+                    self.openai_requests_per_minute, self.openai_tokens_per_minute)
+            )
+        )
         
-    def get_ollama_gateway(self) -> OllamaGateway:
-        """Get an instance of the Ollama gateway."""
-        return OllamaGateway()
+    def get_ollama_gateway(self) -> RateLimitedGateway:
+        """
+        Get the shared, rate-limited Ollama gateway, spreading requests over the configured
+        hosts if there are any.
+        """
+        from mojentic.llm.gateways import OllamaGateway
+
+        if self.ollama_hosts:
+            return client_pool.get(
+                ("ollama", self.ollama_hosts,
+                 *self.get_rate_limit_key(
+                     self.ollama_requests_per_minute, self.ollama_tokens_per_minute)),
+                lambda: RateLimitedGateway(
+                    OllamaHostPool(self.ollama_hosts),
+                    self.get_rate_limiter(
+                        self.ollama_requests_per_minute, self.ollama_tokens_per_minute)
+                )
+            )
+        return client_pool.get(
+            ("ollama",
+             *self.get_rate_limit_key(
+                 self.ollama_requests_per_minute, self.ollama_tokens_per_minute)),
+            lambda: RateLimitedGateway(
+                OllamaGateway(),
+                self.get_rate_limiter(
+                    self.ollama_requests_per_minute, self.ollama_tokens_per_minute)
+            )
+        )
+
+    def get_ollama_concurrency(self) -> int:
+        """Get the number of simultaneous Ollama requests: the hosts' total capacity, if any."""
+        if self.ollama_hosts:
+            return sum(host.capacity for host in self.ollama_hosts)
+        return self.ollama_concurrency
+
+    def get_ollama_resident_models(self) -> int:
+        """Get the number of Ollama models loaded at once: the hosts' total, if any."""
+        if self.ollama_hosts:
+            return sum(host.resident_models for host in self.ollama_hosts)
+        return self.ollama_resident_models
+
+    def get_rate_limiter(
+        self,
+        requests_per_minute: Optional[float],
+        tokens_per_minute: Optional[float]
+    ) -> RateLimiter:
+        """Get a rate limiter for a provider, retrying as configured."""
+        return RateLimiter(
+            requests_per_minute,
+            tokens_per_minute,
+            max_retries=self.max_retries,
+            retry_base_seconds=self.retry_base_seconds,
+            retry_max_seconds=self.retry_max_seconds
+        )
+        
+    def get_rate_limit_key(
+        self,
+        requests_per_minute: Optional[float],
+        tokens_per_minute: Optional[float]
+    ) -> Tuple:
+        """Get the settings of a provider's rate limiter, to tell its shared gateways apart."""
+        return (
+            requests_per_minute,
+            tokens_per_minute,
+            self.max_retries,
+            self.retry_base_seconds,
+            self.retry_max_seconds
+        )
+
+    def get_openai_batch_gateway(self) -> "OpenAIBatchGateway":
+        """Get the shared gateway for submitting OpenAI batch jobs."""
+        from assessor.batch import OpenAIBatchGateway
+
+        return client_pool.get(
+            ("openai-batch", self.openai_api_key),
+            lambda: OpenAIBatchGateway(api_key=self.openai_api_key)
+        )
         
-    def get_assessment_llm(self) -> LLMBroker:
-        """Get an LLM broker for generating assessments."""
-        return LLMBroker(model=self.assessment_model, gateway=self.get_openai_gateway())
+    def get_assessment_llm(self) -> "LLMBroker":
+        """Get the shared LLM broker for generating assessments."""
+        return get_llm_broker(self.assessment_model, self.get_openai_gateway())
+
+    def get_response_cache(self, refresh: bool = False) -> ResponseCache:
+        """Get a response cache backed by the configured cache folder."""
+        return ResponseCache(self.cache_folder, self.cache_max_bytes, refresh=refresh)
+
+    def get_file_gateway(self) -> CachingFileGateway:
+        """
+        Get a file gateway that reads each file once per run, within the content budget, and
+        writes files on a background thread unless max_pending_writes is 0.
+        """
+        if self.max_pending_writes <= 0:
+            return CachingFileGateway(self.content_cache_max_bytes)
+        return WriteBehindFileGateway(self.content_cache_max_bytes, self.max_pending_writes)
+
+    def get_build_manifest(self, folder_path: str) -> BuildManifest:
+        """Get the build manifest recording the inputs of the files generated in a folder."""
+        return BuildManifest(folder_path)
+
+    def get_job_queue(
+        self,
+        folder_path: str,
+        queue_url: Optional[str] = None
+    ) -> Union[JobQueue, "RemoteJobQueue"]:
+        """
+        Get the queue of distributed jobs kept in a folder, or served by a coordinator on
+        another machine if its URL is given.
+        """
+        if queue_url is not None:
+            from assessor.queue_server import RemoteJobQueue
+
+            return RemoteJobQueue(queue_url, token=self.job_queue_token)
+        return JobQueue(folder_path, max_attempts=self.job_max_attempts)
+
+    def get_run_journal(
+        self,
+        folder_path: str,
+        resume: bool = False,
+        file_gateway: Optional[FileGateway] = None
+    ) -> RunJournal:
+        """Get the journal recording the files a run writes through a gateway in a folder."""
+        return RunJournal(folder_path, resume=resume, file_gateway=file_gateway)
 
 # Default configuration instance
 default_config = Config()
\ No newline at end of file
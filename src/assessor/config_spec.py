@@ -0,0 +1,55 @@
+"""
+Tests for the config module.
+"""
+
+from assessor.config import ClientPool, Config
+
+
+class DescribeClientPool:
+    """Tests for the ClientPool class."""
+
+    def should_return_the_same_instance_for_the_same_key(self):
+        """It should hand out the instance created on first use for later requests."""
+        pool = ClientPool()
+        first = pool.get(("openai", "gpt-4.1-nano"), object)
+
+        second = pool.get(("openai", "gpt-4.1-nano"), object)
+
+        assert second is first
+
+    def should_create_separate_instances_for_different_keys(self):
+        """It should not share an instance between different providers or models."""
+        pool = ClientPool()
+        first = pool.get(("openai", "gpt-4.1-nano"), object)
+
+        second = pool.get(("ollama", "qwen3:32b"), object)
+
+        assert second is not first
+
+    def should_call_the_factory_only_once_per_key(self, mocker):
+        """It should not construct a new client for a key that is already registered."""
+        pool = ClientPool()
+        factory = mocker.Mock()
+        pool.get(("ollama",), factory)
+
+        pool.get(("ollama",), factory)
+
+        factory.assert_called_once_with()
+
+
+class DescribeConfig:
+    """Tests for the Config class."""
+
+    def should_not_share_a_gateway_between_different_rate_limits(self, mocker):
+        """It should give Configs with different limits or retries gateways of their own."""
+        mocker.patch("mojentic.llm.gateways.OpenAIGateway")
+        first = Config(openai_api_key="sk-limits", openai_requests_per_minute=60)
+        second = Config(openai_api_key="sk-limits", openai_requests_per_minute=600)
+        third = Config(openai_api_key="sk-limits", openai_requests_per_minute=60, max_retries=0)
+
+        gateways = [config.get_openai_gateway() for config in (first, second, third)]
+
+        assert len({id(gateway) for gateway in gateways}) == 3
+        assert Config(
+            openai_api_key="sk-limits", openai_requests_per_minute=60
+        ).get_openai_gateway() is gateways[0]
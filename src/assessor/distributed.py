@@ -0,0 +1,422 @@
+"""
+Distributed run module for the assessor package.
+
+This module runs a sweep as jobs on a JobQueue instead of in a single process. The coordinator
+enqueues the generation matrix, waits for the workers to finish it, then enqueues the
+per-source and cross-prompt assessments and waits for those. Workers, any number of processes
+on any number of machines, lease the jobs and run each with the same functions a
+single-process run uses. The queue file relies on SQLite file locking, which is not reliable on
+network filesystems such as NFS or SMB, so it stays on the coordinator's local filesystem:
+workers on the coordinator's machine open it directly, and workers on other machines reach it
+through the JobQueueServer the coordinator runs, while sharing the prompt folder.
+"""
+
+import os
+import socket
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Union
+
+from assessor.assessment import write_cross_prompt_assessment
+from assessor.config import default_config, Config
+from assessor.file_gateway import FileGateway
+from assessor.file_processor import create_assessment_file_path, create_output_file_path, \
+    get_prompt_files
+from assessor.folder_index import FolderIndex
+from assessor.job_queue import DONE, FAILED, LEASED, PENDING, Job, JobQueue
+from assessor.metrics import RunMetrics
+from assessor.processor import generate_output, write_assessment
+from assessor.queue_server import JobQueueServer, RemoteJobQueue
+from assessor.response_cache import ResponseCache
+
+# Kinds of job, in the order the coordinator runs their phases
+GENERATE = "generate"
+ASSESS = "assess"
+CROSS_ASSESS = "cross-assess"
+
+
+def run_coordinator(
+    folder_path: str,
+    use_openai: bool = True,
+    use_ollama: bool = True,
+    prompt_pattern: Optional[str] = None,
+    config: Optional[Config] = None,
+    file_gateway: Optional[FileGateway] = None,
+    queue: Optional[JobQueue] = None,
+    samples: int = 1,
+    compare_styles: Optional[List[str]] = None,
+    resume: bool = False,
+    serve_port: Optional[int] = None
+) -> Dict[str, Dict[str, int]]:
+    """
+    Run a sweep through the job queue, phase by phase, and wait for the workers to finish it.
+
+    Args:
+        folder_path: Path to the folder containing the prompt files, on a local filesystem
+        use_openai: Whether to use OpenAI models
+        use_ollama: Whether to use Ollama models
+        prompt_pattern: Optional comma-separated list of style names to filter prompt files
+        config: Optional Config instance (defaults to default_config)
+        file_gateway: Optional FileGateway instance (defaults to a new instance)
+        queue: Optional JobQueue (defaults to the queue in the folder)
+        samples: Number of replicate generations per prompt file and model
+        compare_styles: Optional prompt styles to compare in cross-prompt assessments
+        resume: Whether to keep the jobs of an interrupted sweep, trying its failed jobs again;
+                otherwise the queue is cleared and every job runs again
+        serve_port: Optional port to serve the queue on while the sweep runs, so workers on
+                    other machines can reach it (defaults to only local workers)
+
+    Returns:
+        dict: Number of jobs per state, for each kind of job
+    """
+    config = config or default_config
+    file_gateway = file_gateway or FileGateway()
+    queue = queue or config.get_job_queue(folder_path)
+    if resume:
+        queue.retry_failed()
+    else:
+        queue.clear()
+
+    server = None
+    if serve_port is not None:
+        server = JobQueueServer(queue, serve_port, token=config.job_queue_token).start()
+        print(f"Serving the job queue on port {server.port}")
+    try:
+        return _run_phases(
+            queue, folder_path, use_openai, use_ollama, prompt_pattern, config, file_gateway,
+            samples, compare_styles)
+    finally:
+        if server is not None:
+            server.close()
+
+
+def _run_phases(
+    queue: JobQueue,
+    folder_path: str,
+    use_openai: bool,
+    use_ollama: bool,
+    prompt_pattern: Optional[str],
+    config: Config,
+    file_gateway: FileGateway,
+    samples: int,
+    compare_styles: Optional[List[str]]
+) -> Dict[str, Dict[str, int]]:
+    summary = {}
+
+    # Generate every output of the matrix
+    enqueue_generation(
+        queue, folder_path, use_openai, use_ollama, prompt_pattern, config, file_gateway, samples)
+    summary[GENERATE] = _wait(queue, GENERATE, config)
+
+    # Assess each source file's outputs
+    output_files: Dict[str, List[str]] = {}
+    for result in queue.results(GENERATE).values():
+        if result["output"] is not None:
+            output_files.setdefault(result["source"], []).append(result["output"])
+    for source, outputs in output_files.items():
+        queue.enqueue(
+            ASSESS, {"source": source, "outputs": outputs},
+            f"{ASSESS}:{create_assessment_file_path(source).name}")
+
+    # Compare the prompt styles of each model whose outputs cover every compared style
+    if compare_styles and len(compare_styles) >= 2:
+        index = FolderIndex.from_folder(folder_path, file_gateway, samples)
+        for model_name, style_outputs in index.outputs_by_model(compare_styles).items():
+            if not all(style in style_outputs for style in compare_styles):
+                continue
+            queue.enqueue(CROSS_ASSESS, {
+                "model": model_name,
+                "styles": compare_styles,
+                "style_outputs": {
+                    style: [output.name for output in style_outputs[style]]
+                    for style in compare_styles
+                },
+            }, f"{CROSS_ASSESS}:{model_name}")
+
+    summary[ASSESS] = _wait(queue, ASSESS, config)
+    summary[CROSS_ASSESS] = _wait(queue, CROSS_ASSESS, config)
+    return summary
+
+
+def enqueue_generation(
+    queue: JobQueue,
+    folder_path: str,
+    use_openai: bool,
+    use_ollama: bool,
+    prompt_pattern: Optional[str],
+    config: Config,
+    file_gateway: FileGateway,
+    samples: int = 1
+) -> int:
+    """
+    Enqueue a generation job for every prompt file, model and sample.
+
+    Args:
+        queue: The JobQueue
+        folder_path: Path to the folder containing the prompt files
+        use_openai: Whether to use OpenAI models
+        use_ollama: Whether to use Ollama models
+        prompt_pattern: Optional comma-separated list of style names to filter prompt files
+        config: Config instance providing the models
+        file_gateway: FileGateway instance used to list the prompt files
+        samples: Number of replicate generations per prompt file and model
+
+    Returns:
+        int: The number of jobs added
+    """
+    prompt_files = get_prompt_files(folder_path, prompt_pattern, file_gateway)
+    sample_numbers = [None] if samples == 1 else list(range(1, samples + 1))
+    providers = [
+        ("openai", config.openai_models if use_openai else []),
+        ("ollama", config.ollama_models if use_ollama else []),
+    ]
+    added = 0
+    for provider, model_names in providers:
+        for model_name in model_names:
+            for file_path in prompt_files:
+                for sample in sample_numbers:
+                    output_name = create_output_file_path(file_path, model_name, sample).name
+                    added += queue.enqueue(GENERATE, {
+                        "provider": provider,
+                        "model": model_name,
+                        "prompt": Path(file_path).name,
+                        "sample": sample,
+                    }, f"{GENERATE}:{output_name}")
+    return added
+
+
+def run_worker(
+    folder_path: str,
+    config: Optional[Config] = None,
+    file_gateway: Optional[FileGateway] = None,
+    queue: Optional[Union[JobQueue, RemoteJobQueue]] = None,
+    cache: Optional[ResponseCache] = None,
+    metrics: Optional[RunMetrics] = None,
+    worker_name: Optional[str] = None,
+    concurrency: int = 1,
+    idle_exit_seconds: Optional[float] = None
+) -> int:
+    """
+    Lease and run jobs from the queue until told to stop.
+
+    Each of the worker's threads runs one job at a time and sends heartbeats while it works, so
+    a job whose worker died is leased again once its lease runs out. A thread that cannot reach
+    the queue waits and tries again rather than stopping.
+
+    Args:
+        folder_path: Path to the folder containing the prompt files and the queue
+        config: Optional Config instance (defaults to default_config)
+        file_gateway: Optional FileGateway instance (defaults to a new instance)
+        queue: Optional JobQueue, or RemoteJobQueue of a coordinator on another machine
+               (defaults to the queue in the folder)
+        cache: Optional ResponseCache consulted before calling a model
+        metrics: Optional RunMetrics collecting the timings and token counts of every request
+        worker_name: Optional name recorded with the worker's leases (defaults to the host
+                     name and process ID)
+        concurrency: Number of jobs the worker runs at once
+        idle_exit_seconds: Optional time after which a worker with nothing to do exits
+                           (defaults to waiting for new jobs forever)
+
+    Returns:
+        int: The number of jobs the worker completed
+    """
+    config = config or default_config
+    file_gateway = file_gateway or FileGateway()
+    queue = queue or config.get_job_queue(folder_path)
+    worker_name = worker_name or f"{socket.gethostname()}-{os.getpid()}"
+    folder = Path(folder_path)
+    completed = []
+
+    def work(thread_name: str):
+        idle_since = time.monotonic()
+        queue_errors = 0
+        while True:
+            try:
+                job = queue.lease(thread_name, config.job_lease_seconds)
+            except (sqlite3.Error, OSError) as error:
+                # A busy or briefly unreachable queue file is tried again after a growing pause
+                queue_errors += 1
+                print(f"Could not lease a job ({error}); retrying")
+                time.sleep(min(
+                    config.job_poll_seconds * 2 ** queue_errors, config.job_lease_seconds / 3))
+                continue
+            queue_errors = 0
+            if job is None:
+                if (idle_exit_seconds is not None
+                        and time.monotonic() - idle_since >= idle_exit_seconds):
+                    return
+                time.sleep(config.job_poll_seconds)
+                continue
+            if run_job(queue, job, thread_name, folder, config, file_gateway, cache, metrics):
+                completed.append(job.key)
+            idle_since = time.monotonic()
+
+    threads = [
+        threading.Thread(
+            target=work, args=(f"{worker_name}-{number}",), name=f"worker-{number}", daemon=True)
+        for number in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    file_gateway.close()
+    return len(completed)
+
+
+def run_job(
+    queue: Union[JobQueue, RemoteJobQueue],
+    job: Job,
+    worker: str,
+    folder: Path,
+    config: Config,
+    file_gateway: FileGateway,
+    cache: Optional[ResponseCache] = None,
+    metrics: Optional[RunMetrics] = None
+) -> bool:
+    """
+    Run a leased job, keeping its lease alive, and record its result or failure in the queue.
+
+    The files the job wrote are flushed to disk before it is reported done, so other workers
+    never see a finished job whose files are missing. Only this job's writes are waited for, so
+    a failed write is blamed on the job that made it even when several jobs share the gateway.
+
+    Args:
+        queue: The JobQueue the job was leased from
+        job: The leased job
+        worker: Name the job was leased under
+        folder: Folder containing the job's files
+        config: Config instance
+        file_gateway: FileGateway instance used to read and write the files
+        cache: Optional ResponseCache consulted before calling a model
+        metrics: Optional RunMetrics the job's requests are added to
+
+    Returns:
+        bool: True if the job completed, False if it failed or its lease passed to another
+              worker
+    """
+    stop_heartbeat = threading.Event()
+    lease_lost = threading.Event()
+
+    def heartbeat():
+        interval = config.job_lease_seconds / 3
+        while not stop_heartbeat.wait(interval):
+            try:
+                held = queue.heartbeat(job, worker, config.job_lease_seconds)
+            except (sqlite3.Error, OSError) as error:
+                # A busy queue file is tried again soon, before the lease runs out
+                print(f"Could not extend the lease on {job.key} ({error}); retrying")
+                interval = min(config.job_poll_seconds, config.job_lease_seconds / 3)
+                continue
+            if not held:
+                lease_lost.set()
+                return
+            interval = config.job_lease_seconds / 3
+
+    heartbeat_thread = threading.Thread(target=heartbeat, name="heartbeat", daemon=True)
+    heartbeat_thread.start()
+    job_files = _JobFileGateway(file_gateway)
+    try:
+        result = JOB_RUNNERS[job.kind](job.payload, folder, config, job_files, cache, metrics)
+        file_gateway.flush(job_files.written)
+    except Exception as error:
+        queue.fail(job, worker, f"{type(error).__name__}: {error}")
+        print(f"Failed {job.key} (attempt {job.attempts}): {error}")
+        return False
+    finally:
+        stop_heartbeat.set()
+        heartbeat_thread.join()
+    if lease_lost.is_set() or not queue.complete(job, worker, result):
+        print(f"Lost the lease on {job.key}; another worker runs it")
+        return False
+    print(f"Completed {job.key}")
+    return True
+
+
+class _JobFileGateway:
+    """File gateway recording the files one job writes, delegating everything to a shared one."""
+
+    def __init__(self, file_gateway: FileGateway):
+        self.file_gateway = file_gateway
+        self.written: Set[Path] = set()
+
+    def write_file(self, file_path: Union[str, Path], content: str) -> None:
+        self.written.add(Path(file_path))
+        self.file_gateway.write_file(file_path, content)
+
+    def append_file(self, file_path: Union[str, Path], content: str) -> None:
+        self.written.add(Path(file_path))
+        self.file_gateway.append_file(file_path, content)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.file_gateway, name)
+
+
+def _run_generation(
+    payload: Dict[str, Any],
+    folder: Path,
+    config: Config,
+    file_gateway: FileGateway,
+    cache: Optional[ResponseCache],
+    metrics: Optional[RunMetrics]
+) -> Dict[str, Optional[str]]:
+    gateway = (
+        config.get_openai_gateway() if payload["provider"] == "openai"
+        else config.get_ollama_gateway()
+    )
+    output_file_path = generate_output(
+        folder / payload["prompt"], payload["model"], gateway, file_gateway, cache, None,
+        metrics=metrics, sample=payload["sample"])
+    return {
+        "source": payload["prompt"],
+        "output": output_file_path.name if output_file_path is not None else None,
+    }
+
+
+def _run_assessment(
+    payload: Dict[str, Any],
+    folder: Path,
+    config: Config,
+    file_gateway: FileGateway,
+    cache: Optional[ResponseCache],
+    metrics: Optional[RunMetrics]
+) -> Optional[str]:
+    assessment_file_path = write_assessment(
+        folder / payload["source"], [folder / output for output in payload["outputs"]], config,
+        file_gateway, None, metrics=metrics)
+    return assessment_file_path.name if assessment_file_path is not None else None
+
+
+def _run_cross_assessment(
+    payload: Dict[str, Any],
+    folder: Path,
+    config: Config,
+    file_gateway: FileGateway,
+    cache: Optional[ResponseCache],
+    metrics: Optional[RunMetrics]
+) -> str:
+    style_outputs = {
+        style: [folder / output for output in outputs]
+        for style, outputs in payload["style_outputs"].items()
+    }
+    assessment_file_path = write_cross_prompt_assessment(
+        folder, payload["model"], payload["styles"], style_outputs, config, file_gateway,
+        metrics=metrics)
+    return assessment_file_path.name
+
+
+# The function running each kind of job
+JOB_RUNNERS: Dict[str, Callable] = {
+    GENERATE: _run_generation,
+    ASSESS: _run_assessment,
+    CROSS_ASSESS: _run_cross_assessment,
+}
+
+
+def _wait(queue: JobQueue, kind: str, config: Config) -> Dict[str, int]:
+    def report(counts):
+        print(f"{kind}: {counts[DONE]} done, {counts[FAILED]} failed, "
+              f"{counts[LEASED]} running, {counts[PENDING]} waiting")
+    return queue.wait(kind, config.job_poll_seconds, on_progress=report)
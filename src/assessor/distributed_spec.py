@@ -0,0 +1,242 @@
+"""
+Tests for the distributed module.
+"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from assessor.config import Config
+from assessor.distributed import ASSESS, GENERATE, enqueue_generation, run_coordinator, \
+    run_job, run_worker
+from assessor.file_gateway import FileGateway, WriteBehindFileGateway
+from assessor.job_queue import DONE, PENDING, JobQueue
+from assessor.queue_server import JobQueueServer, RemoteJobQueue
+
+
+def _write_output(file_path, model_name, gateway, file_gateway, cache, manifest, metrics=None,
+                  sample=None):
+    output_file_path = file_path.with_name(f"{file_path.stem}-output-{model_name}.md")
+    file_gateway.write_file(output_file_path, f"{model_name} response")
+    return output_file_path
+
+
+class DescribeEnqueueGeneration:
+    """Tests for the enqueue_generation function."""
+
+    def should_enqueue_a_job_per_prompt_model_and_sample(self, tmp_path):
+        """It should add one generation job for every cell of the sweep's matrix."""
+        (tmp_path / "prompt-plain.md").write_text("Write a haiku")
+        (tmp_path / "prompt-fancy.md").write_text("Compose a haiku")
+        config = Config(openai_models=["gpt-4.1-nano"], ollama_models=["qwen3:32b"])
+        queue = JobQueue(tmp_path)
+
+        result = enqueue_generation(
+            queue, str(tmp_path), True, True, None, config, FileGateway(), samples=2)
+
+        assert result == 8
+        assert queue.counts(GENERATE)[PENDING] == 8
+
+
+class DescribeRunJob:
+    """Tests for the run_job function."""
+
+    def should_record_the_result_of_a_finished_job(self, tmp_path, mocker):
+        """It should run the job with its kind's function and store the result in the queue."""
+        (tmp_path / "prompt-plain.md").write_text("Write a haiku")
+        mocker.patch("assessor.distributed.generate_output", side_effect=_write_output)
+        queue = JobQueue(tmp_path)
+        queue.enqueue(GENERATE, {
+            "provider": "openai", "model": "gpt-4.1-nano", "prompt": "prompt-plain.md",
+            "sample": None,
+        }, "generate:a")
+        config = mocker.Mock(spec=Config, job_lease_seconds=60)
+
+        result = run_job(
+            queue, queue.lease("worker-1", 60), "worker-1", tmp_path, config, FileGateway())
+
+        assert result is True
+        assert queue.results(GENERATE) == {
+            "generate:a": {"source": "prompt-plain.md",
+                           "output": "prompt-plain-output-gpt-4.1-nano.md"},
+        }
+
+    def should_not_blame_a_job_for_another_job_s_failed_write(self, tmp_path, mocker):
+        """It should complete a job whose files reached the disk though another job's did not."""
+        (tmp_path / "prompt-plain.md").write_text("Write a haiku")
+        mocker.patch("assessor.distributed.generate_output", side_effect=_write_output)
+        queue = JobQueue(tmp_path)
+        queue.enqueue(GENERATE, {
+            "provider": "openai", "model": "gpt-4.1-nano", "prompt": "prompt-plain.md",
+            "sample": None,
+        }, "generate:a")
+        config = mocker.Mock(spec=Config, job_lease_seconds=60)
+        file_gateway = WriteBehindFileGateway(max_bytes=1024, max_pending_writes=4)
+        file_gateway.write_file(tmp_path / "missing-folder" / "prompt-fancy.md", "Response")
+
+        result = run_job(
+            queue, queue.lease("worker-1", 60), "worker-1", tmp_path, config, file_gateway)
+
+        assert result is True
+        assert (tmp_path / "prompt-plain-output-gpt-4.1-nano.md").exists()
+        with pytest.raises(FileNotFoundError):
+            file_gateway.close()
+
+    def should_keep_the_lease_alive_after_a_heartbeat_error(self, tmp_path, mocker):
+        """It should retry a heartbeat the locked queue refused and complete the job."""
+        (tmp_path / "prompt-plain.md").write_text("Write a haiku")
+        finished = threading.Event()
+
+        def slow_write_output(*args, **kwargs):
+            finished.wait(1)
+            return _write_output(*args, **kwargs)
+
+        mocker.patch("assessor.distributed.generate_output", side_effect=slow_write_output)
+        queue = JobQueue(tmp_path)
+        queue.enqueue(GENERATE, {
+            "provider": "openai", "model": "gpt-4.1-nano", "prompt": "prompt-plain.md",
+            "sample": None,
+        }, "generate:a")
+        heartbeat = queue.heartbeat
+        beats = []
+
+        def heartbeat_after_an_error(*args):
+            beats.append(args)
+            if len(beats) == 1:
+                raise sqlite3.OperationalError("database is locked")
+            finished.set()
+            return heartbeat(*args)
+
+        queue.heartbeat = heartbeat_after_an_error
+        config = mocker.Mock(spec=Config, job_lease_seconds=0.03, job_poll_seconds=0.01)
+
+        result = run_job(
+            queue, queue.lease("worker-1", 60), "worker-1", tmp_path, config, FileGateway())
+
+        assert result is True
+        assert len(beats) >= 2
+        assert queue.counts(GENERATE)[DONE] == 1
+
+    def should_not_complete_a_job_whose_lease_was_lost(self, tmp_path, mocker):
+        """It should not count a job as completed once another worker took over its lease."""
+        (tmp_path / "prompt-plain.md").write_text("Write a haiku")
+        queue = JobQueue(tmp_path)
+        queue.enqueue(GENERATE, {
+            "provider": "openai", "model": "gpt-4.1-nano", "prompt": "prompt-plain.md",
+            "sample": None,
+        }, "generate:a")
+        job = queue.lease("worker-1", 60)
+
+        def write_output_after_a_takeover(*args, **kwargs):
+            queue.fail(job, "worker-1", "Lease expired")
+            queue.lease("worker-2", 60)
+            return _write_output(*args, **kwargs)
+
+        mocker.patch(
+            "assessor.distributed.generate_output", side_effect=write_output_after_a_takeover)
+        config = mocker.Mock(spec=Config, job_lease_seconds=60, job_poll_seconds=0.01)
+
+        result = run_job(queue, job, "worker-1", tmp_path, config, FileGateway())
+
+        assert result is False
+        assert queue.counts(GENERATE)[DONE] == 0
+
+    def should_put_a_failed_job_back_in_the_queue(self, tmp_path, mocker):
+        """It should record a failure so the job is leased again."""
+        mocker.patch(
+            "assessor.distributed.generate_output", side_effect=ConnectionError("reset"))
+        queue = JobQueue(tmp_path)
+        queue.enqueue(GENERATE, {
+            "provider": "ollama", "model": "qwen3:32b", "prompt": "prompt-plain.md",
+            "sample": None,
+        }, "generate:a")
+        config = mocker.Mock(spec=Config, job_lease_seconds=60)
+
+        result = run_job(
+            queue, queue.lease("worker-1", 60), "worker-1", tmp_path, config, FileGateway())
+
+        assert result is False
+        assert queue.counts(GENERATE)[PENDING] == 1
+
+
+class DescribeRunWorker:
+    """Tests for the run_worker function."""
+
+    def should_keep_working_after_the_queue_was_locked(self, tmp_path, mocker):
+        """It should retry leasing after a queue error instead of stopping the thread."""
+        queue = JobQueue(tmp_path)
+        queue.enqueue(GENERATE, {
+            "provider": "openai", "model": "gpt-4.1-nano", "prompt": "prompt-plain.md",
+            "sample": None,
+        }, "generate:a")
+        lease = queue.lease
+        errors = [sqlite3.OperationalError("database is locked")]
+
+        def lease_after_an_error(*args):
+            if errors:
+                raise errors.pop()
+            return lease(*args)
+
+        queue.lease = lease_after_an_error
+        mocker.patch("assessor.distributed.generate_output", side_effect=_write_output)
+        config = Config(job_poll_seconds=0.01, max_pending_writes=0)
+        config.get_openai_gateway = mocker.Mock()
+
+        result = run_worker(str(tmp_path), config, queue=queue, idle_exit_seconds=0.1)
+
+        assert result == 1
+
+    def should_run_the_jobs_of_a_queue_served_from_another_machine(self, tmp_path, mocker):
+        """It should lease jobs from a coordinator's server and record them there."""
+        (tmp_path / "prompt-plain.md").write_text("Write a haiku")
+        queue = JobQueue(tmp_path)
+        queue.enqueue(GENERATE, {
+            "provider": "openai", "model": "gpt-4.1-nano", "prompt": "prompt-plain.md",
+            "sample": None,
+        }, "generate:a")
+        mocker.patch("assessor.distributed.generate_output", side_effect=_write_output)
+        config = Config(job_poll_seconds=0.01, max_pending_writes=0)
+        config.get_openai_gateway = mocker.Mock()
+
+        with JobQueueServer(queue, 0, host="127.0.0.1") as server:
+            result = run_worker(
+                str(tmp_path), config, queue=RemoteJobQueue(f"http://127.0.0.1:{server.port}"),
+                idle_exit_seconds=0.1)
+
+        assert result == 1
+        assert queue.results(GENERATE) == {
+            "generate:a": {"source": "prompt-plain.md",
+                           "output": "prompt-plain-output-gpt-4.1-nano.md"},
+        }
+
+
+class DescribeRunCoordinator:
+    """Tests for the run_coordinator function."""
+
+    def should_run_the_sweep_phase_by_phase_on_the_workers(self, tmp_path, mocker):
+        """It should wait for the generations, then have the workers assess their outputs."""
+        (tmp_path / "prompt-plain.md").write_text("Write a haiku")
+        mocker.patch("assessor.distributed.generate_output", side_effect=_write_output)
+        write_assessment = mocker.patch(
+            "assessor.distributed.write_assessment",
+            return_value=tmp_path / "prompt-plain-assessment.md")
+        config = Config(
+            openai_models=["gpt-4.1-nano", "gpt-4.1-mini"], job_poll_seconds=0.01,
+            max_pending_writes=0)
+        config.get_openai_gateway = mocker.Mock()
+        worker = threading.Thread(target=run_worker, args=(str(tmp_path), config), kwargs={
+            "concurrency": 2, "idle_exit_seconds": 0.5,
+        })
+        worker.start()
+
+        result = run_coordinator(str(tmp_path), use_ollama=False, config=config)
+        worker.join()
+
+        assert result[GENERATE][DONE] == 2
+        assert result[ASSESS][DONE] == 1
+        source, outputs = write_assessment.call_args.args[:2]
+        assert source == tmp_path / "prompt-plain.md"
+        assert sorted(output.name for output in outputs) == [
+            "prompt-plain-output-gpt-4.1-mini.md", "prompt-plain-output-gpt-4.1-nano.md",
+        ]
@@ -5,8 +5,14 @@ This module provides a gateway for file operations, making the system more testa
 by isolating I/O operations behind a mockable interface.
 """
 
+import os
 import pathlib
-from typing import List, Optional, Union
+import queue
+import itertools
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
 
 class FileGateway:
@@ -27,15 +33,48 @@ class FileGateway:
             
     def write_file(self, file_path: Union[str, pathlib.Path], content: str) -> None:
         """
-        Write content to a file.
+        Write content to a file, atomically.
+
+        The content goes to a temporary file beside the target, which is then renamed over it,
+        so a crash mid-write never leaves a truncated file for later phases to read.
         
         Args:
             file_path: Path to the file to write
             content: Content to write to the file
         """
-        with open(file_path, 'w') as file:
+        path = pathlib.Path(file_path)
+        temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            with open(temp_path, 'x') as file:
+                file.write(content)
+            os.replace(temp_path, path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+    def append_file(self, file_path: Union[str, pathlib.Path], content: str) -> None:
+        """
+        Append content to the end of a file, creating it if necessary.
+        
+        Args:
+            file_path: Path to the file to append to
+            content: Content to append to the file
+        """
+        with open(file_path, 'a') as file:
             file.write(content)
             
+    def flush(self, file_paths: Optional[Iterable[Union[str, pathlib.Path]]] = None) -> None:
+        """
+        Wait until writes have reached the disk; writes here finish before returning.
+
+        Args:
+            file_paths: Optional files whose writes to wait for (defaults to every file)
+        """
+
+    def close(self) -> None:
+        """Flush the gateway and release its resources."""
+        self.flush()
+            
     def list_files(self, folder_path: Union[str, pathlib.Path]) -> List[pathlib.Path]:
         """
         List all files in a folder.
@@ -77,13 +116,30 @@ class FileGateway:
             if suffix and file_path.suffix.lower() != suffix.lower():
                 continue
                 
-            if any(pattern in str(file_path) for pattern in exclude_patterns):
+            if any(pattern in file_path.name for pattern in exclude_patterns):
                 continue
                 
             files.append(file_path)
             
         return files
         
+    def scan_folder(self, folder_path: Union[str, pathlib.Path]) -> List[pathlib.Path]:
+        """
+        List all files in a folder in a single directory read.
+        
+        Uses os.scandir, whose entries carry the file type from the directory listing, so no
+        separate stat call is made per file.
+        
+        Args:
+            folder_path: Path to the folder to scan
+            
+        Returns:
+            List of pathlib.Path objects for files in the folder
+        """
+        folder = pathlib.Path(folder_path)
+        with os.scandir(folder) as entries:
+            return [folder / entry.name for entry in entries if entry.is_file()]
+        
     def ensure_folder_exists(self, folder_path: Union[str, pathlib.Path]) -> pathlib.Path:
         """
         Ensure a folder exists, creating it if necessary.
@@ -120,4 +176,256 @@ class FileGateway:
         Returns:
             True if the folder exists, False otherwise
         """
-        return pathlib.Path(folder_path).exists() and pathlib.Path(folder_path).is_dir()
\ No newline at end of file
+        return pathlib.Path(folder_path).exists() and pathlib.Path(folder_path).is_dir()
+
+
+class CachingFileGateway(FileGateway):
+    """
+    File gateway that keeps recently read and written file contents in memory.
+
+    A prompt file is read from disk once and then shared by every model that processes it and
+    every assessment that includes it, and outputs are remembered as they are written so the
+    assessments do not read them back. The least recently used contents are dropped once their
+    total size exceeds the byte budget.
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        Initialize the gateway.
+
+        Args:
+            max_bytes: Total size of the contents kept in memory
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._contents = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def read_file(self, file_path: Union[str, pathlib.Path]) -> str:
+        """
+        Read the contents of a file, from memory if it was read or written before.
+
+        Args:
+            file_path: Path to the file to read
+
+        Returns:
+            The contents of the file as a string
+        """
+        key = pathlib.Path(file_path)
+        with self._lock:
+            if key in self._contents:
+                self.hits += 1
+                self._contents.move_to_end(key)
+                content, _ = self._contents[key]
+                return content
+            self.misses += 1
+
+        content = super().read_file(file_path)
+        self._remember(key, content)
+        return content
+
+    def write_file(self, file_path: Union[str, pathlib.Path], content: str) -> None:
+        """
+        Write content to a file and remember it for later reads.
+
+        Args:
+            file_path: Path to the file to write
+            content: Content to write to the file
+        """
+        super().write_file(file_path, content)
+        self._remember(pathlib.Path(file_path), content)
+
+    def append_file(self, file_path: Union[str, pathlib.Path], content: str) -> None:
+        """
+        Append content to the end of a file, forgetting its remembered contents.
+
+        Args:
+            file_path: Path to the file to append to
+            content: Content to append to the file
+        """
+        super().append_file(file_path, content)
+        self._forget(pathlib.Path(file_path))
+
+    def stats(self) -> str:
+        """Describe the hit and miss counts for display."""
+        return f"{self.hits} hits, {self.misses} misses"
+
+    def _remember(self, key: pathlib.Path, content: str) -> None:
+        size = len(content.encode("utf-8"))
+        with self._lock:
+            self._discard(key)
+            if size > self.max_bytes:
+                return
+            self._contents[key] = (content, size)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, (_, evicted_size) = self._contents.popitem(last=False)
+                self._size -= evicted_size
+
+    def _forget(self, key: pathlib.Path) -> None:
+        with self._lock:
+            self._discard(key)
+
+    def _discard(self, key: pathlib.Path) -> None:
+        if key in self._contents:
+            _, size = self._contents.pop(key)
+            self._size -= size
+
+
+class WriteBehindFileGateway(CachingFileGateway):
+    """
+    Caching file gateway that writes files on a background thread.
+
+    write_file queues the contents and returns at once, keeping disk latency out of the
+    generation loop. The queue is bounded, so a slow disk holds writers back instead of
+    buffering without limit. Reads, appends and existence checks of a file still waiting to be
+    written see its queued contents; once its write fails they see the disk again, not contents
+    that never reached it. Call flush at phase boundaries and close at the end of a
+    run; both raise the first error a background write hit. Flushing some files waits for and
+    reports the writes of those files alone, so concurrent jobs sharing the gateway are not
+    blamed for each other's failures.
+    """
+
+    def __init__(self, max_bytes: int, max_pending_writes: int):
+        """
+        Initialize the gateway.
+
+        Args:
+            max_bytes: Total size of the contents kept in memory
+            max_pending_writes: Number of queued writes after which write_file waits
+        """
+        super().__init__(max_bytes)
+        self._queue = queue.Queue(maxsize=max_pending_writes)
+        # Each queued write is numbered, so the writer can tell whether a newer one replaced it
+        self._pending: Dict[pathlib.Path, Tuple[int, str]] = {}
+        self._sequence = itertools.count()
+        self._pending_changed = threading.Condition()
+        self._errors: Dict[pathlib.Path, BaseException] = {}
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+
+    def read_file(self, file_path: Union[str, pathlib.Path]) -> str:
+        """
+        Read the contents of a file, including a file still waiting to be written.
+
+        Args:
+            file_path: Path to the file to read
+
+        Returns:
+            The contents of the file as a string
+        """
+        with self._pending_changed:
+            pending = self._pending.get(pathlib.Path(file_path))
+        if pending is not None:
+            return pending[1]
+        return super().read_file(file_path)
+
+    def write_file(self, file_path: Union[str, pathlib.Path], content: str) -> None:
+        """
+        Queue content to be written to a file, and remember it for later reads.
+
+        Args:
+            file_path: Path to the file to write
+            content: Content to write to the file
+        """
+        key = pathlib.Path(file_path)
+        self._remember(key, content)
+        with self._pending_changed:
+            sequence = next(self._sequence)
+            self._pending[key] = (sequence, content)
+        self._start_writer()
+        self._queue.put((key, sequence, content))
+
+    def append_file(self, file_path: Union[str, pathlib.Path], content: str) -> None:
+        """
+        Append content to the end of a file once its queued writes have reached the disk.
+
+        Args:
+            file_path: Path to the file to append to
+            content: Content to append to the file
+        """
+        key = pathlib.Path(file_path)
+        with self._pending_changed:
+            while key in self._pending:
+                self._pending_changed.wait()
+        super().append_file(file_path, content)
+
+    def file_exists(self, file_path: Union[str, pathlib.Path]) -> bool:
+        """
+        Check if a file exists or is waiting to be written.
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            True if the file exists or is queued, False otherwise
+        """
+        with self._pending_changed:
+            if pathlib.Path(file_path) in self._pending:
+                return True
+        return super().file_exists(file_path)
+
+    def flush(self, file_paths: Optional[Iterable[Union[str, pathlib.Path]]] = None) -> None:
+        """
+        Wait until queued writes have reached the disk, raising the first failure among them.
+
+        Args:
+            file_paths: Optional files whose writes to wait for (defaults to every file)
+        """
+        if file_paths is None:
+            self._queue.join()
+            with self._pending_changed:
+                errors, self._errors = list(self._errors.values()), {}
+        else:
+            keys = {pathlib.Path(file_path) for file_path in file_paths}
+            with self._pending_changed:
+                while keys & self._pending.keys():
+                    self._pending_changed.wait()
+                errors = [self._errors.pop(key) for key in keys if key in self._errors]
+        if errors:
+            raise errors[0]
+
+    def close(self) -> None:
+        """Flush the queued writes and stop the background writer."""
+        try:
+            self.flush()
+        finally:
+            with self._writer_lock:
+                if self._writer is not None:
+                    self._queue.put(None)
+                    self._writer.join()
+                    self._writer = None
+
+    def _start_writer(self) -> None:
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._write_queued, name="file-writer", daemon=True)
+                self._writer.start()
+
+    def _write_queued(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                key, sequence, content = item
+                failure = None
+                try:
+                    FileGateway.write_file(self, key, content)
+                except Exception as error:
+                    failure = error
+                with self._pending_changed:
+                    if failure is not None:
+                        self._errors.setdefault(key, failure)
+                    # A newer write of the same file stays pending until it is written too
+                    if self._pending.get(key, (None,))[0] == sequence:
+                        del self._pending[key]
+                        if failure is not None:
+                            # Later reads must not see contents that never reached the disk
+                            self._forget(key)
+                    self._pending_changed.notify_all()
+            finally:
+                self._queue.task_done()
@@ -0,0 +1,164 @@
+"""
+Tests for the file_gateway module.
+"""
+
+import pytest
+
+from assessor.file_gateway import CachingFileGateway, FileGateway, WriteBehindFileGateway
+
+
+class DescribeFileGateway:
+    """Tests for the FileGateway class."""
+
+    def should_replace_a_file_without_leaving_temporary_files(self, tmp_path):
+        """It should write through a temporary file renamed over the target."""
+        output_file = tmp_path / "prompt-plain-output-model.md"
+        output_file.write_text("Old response")
+
+        FileGateway().write_file(output_file, "New response")
+
+        assert output_file.read_text() == "New response"
+        assert list(tmp_path.iterdir()) == [output_file]
+
+    def should_keep_the_old_file_when_a_write_fails(self, tmp_path, mocker):
+        """It should leave the previous contents in place if writing the new ones fails."""
+        output_file = tmp_path / "prompt-plain-output-model.md"
+        output_file.write_text("Old response")
+        mocker.patch("assessor.file_gateway.os.replace", side_effect=OSError("disk full"))
+
+        with pytest.raises(OSError):
+            FileGateway().write_file(output_file, "New response")
+
+        assert output_file.read_text() == "Old response"
+        assert list(tmp_path.iterdir()) == [output_file]
+
+
+class DescribeCachingFileGateway:
+    """Tests for the CachingFileGateway class."""
+
+    def should_read_a_file_from_disk_once(self, tmp_path):
+        """It should serve repeated reads of a file from memory."""
+        prompt_file = tmp_path / "prompt-plain.md"
+        prompt_file.write_text("Write a haiku")
+        gateway = CachingFileGateway(max_bytes=1024)
+
+        gateway.read_file(prompt_file)
+        prompt_file.write_text("Changed behind the gateway's back")
+        result = gateway.read_file(str(prompt_file))
+
+        assert result == "Write a haiku"
+        assert gateway.stats() == "1 hits, 1 misses"
+
+    def should_remember_written_contents(self, tmp_path):
+        """It should serve a file it wrote without reading it back from disk."""
+        output_file = tmp_path / "prompt-plain-output-model.md"
+        gateway = CachingFileGateway(max_bytes=1024)
+
+        gateway.write_file(output_file, "Response")
+        result = gateway.read_file(output_file)
+
+        assert result == "Response"
+        assert gateway.misses == 0
+
+    def should_read_an_appended_file_from_disk(self, tmp_path):
+        """It should not serve stale contents after a file was appended to."""
+        output_file = tmp_path / "prompt-plain-output-model.md"
+        gateway = CachingFileGateway(max_bytes=1024)
+        gateway.write_file(output_file, "Partial")
+
+        gateway.append_file(output_file, " response")
+        result = gateway.read_file(output_file)
+
+        assert result == "Partial response"
+
+    def should_drop_least_recently_used_contents_over_budget(self, tmp_path):
+        """It should keep the remembered contents within the byte budget."""
+        first_file = tmp_path / "prompt-first.md"
+        second_file = tmp_path / "prompt-second.md"
+        first_file.write_text("a" * 6)
+        second_file.write_text("b" * 6)
+        gateway = CachingFileGateway(max_bytes=10)
+
+        gateway.read_file(first_file)
+        gateway.read_file(second_file)
+        gateway.read_file(first_file)
+
+        assert gateway.misses == 3
+
+
+class DescribeWriteBehindFileGateway:
+    """Tests for the WriteBehindFileGateway class."""
+
+    def should_write_queued_files_by_the_flush(self, tmp_path):
+        """It should have every queued file on disk once flush returns."""
+        gateway = WriteBehindFileGateway(max_bytes=1024, max_pending_writes=2)
+        output_files = [tmp_path / f"prompt-plain-output-model-{number}.md" for number in range(5)]
+
+        for output_file in output_files:
+            gateway.write_file(output_file, output_file.name)
+        gateway.flush()
+
+        assert [output_file.read_text() for output_file in output_files] == [
+            output_file.name for output_file in output_files
+        ]
+        gateway.close()
+
+    def should_read_a_file_still_waiting_to_be_written(self, tmp_path):
+        """It should serve the queued contents even when they are not kept in memory."""
+        output_file = tmp_path / "prompt-plain-output-model.md"
+        gateway = WriteBehindFileGateway(max_bytes=0, max_pending_writes=2)
+
+        gateway.write_file(output_file, "Response")
+        result = gateway.read_file(output_file)
+
+        assert result == "Response"
+        assert gateway.file_exists(output_file)
+        gateway.close()
+
+    def should_append_after_the_queued_write(self, tmp_path):
+        """It should append to a file only once its queued contents are on disk."""
+        output_file = tmp_path / "prompt-plain-output-model.md"
+        gateway = WriteBehindFileGateway(max_bytes=1024, max_pending_writes=2)
+
+        gateway.write_file(output_file, "Partial")
+        gateway.append_file(output_file, " response")
+        gateway.close()
+
+        assert output_file.read_text() == "Partial response"
+
+    def should_raise_a_failed_write_at_the_flush(self, tmp_path):
+        """It should report a background write that failed when the caller flushes."""
+        gateway = WriteBehindFileGateway(max_bytes=1024, max_pending_writes=2)
+
+        gateway.write_file(tmp_path / "missing-folder" / "prompt-plain.md", "Response")
+
+        with pytest.raises(FileNotFoundError):
+            gateway.flush()
+        gateway.close()
+
+    def should_only_report_the_failures_of_the_flushed_files(self, tmp_path):
+        """It should wait for and report the writes of the given files alone."""
+        gateway = WriteBehindFileGateway(max_bytes=1024, max_pending_writes=2)
+        output_file = tmp_path / "prompt-plain-output-model.md"
+
+        gateway.write_file(tmp_path / "missing-folder" / "prompt-fancy.md", "Response")
+        gateway.write_file(output_file, "Response")
+        gateway.flush([output_file])
+
+        assert output_file.read_text() == "Response"
+        with pytest.raises(FileNotFoundError):
+            gateway.close()
+
+    def should_not_serve_contents_whose_write_failed(self, tmp_path):
+        """It should forget the contents of a failed write, so reads see what is on disk."""
+        gateway = WriteBehindFileGateway(max_bytes=1024, max_pending_writes=2)
+        output_file = tmp_path / "missing-folder" / "prompt-plain-output-model.md"
+        gateway.write_file(output_file, "Response")
+
+        with pytest.raises(FileNotFoundError):
+            gateway.flush()
+
+        assert gateway.file_exists(output_file) is False
+        with pytest.raises(FileNotFoundError):
+            gateway.read_file(output_file)
+        gateway.close()
@@ -2,16 +2,17 @@
 File processing utilities for the assessor module.
 """
 
-import re
 from pathlib import Path
 from typing import Optional, Union
 
 from assessor.file_gateway import FileGateway
+from assessor.folder_index import FileKind, FolderIndex
 
 
 def get_available_prompt_styles(
     folder_path: Union[str, Path],
-    file_gateway: Optional[FileGateway] = None
+    file_gateway: Optional[FileGateway] = None,
+    index: Optional[FolderIndex] = None
 ):
     """
     Extract all available prompt styles from the folder.
@@ -19,34 +20,21 @@ def get_available_prompt_styles(
     Args:
         folder_path: Path to the folder containing prompt files
         file_gateway: Optional FileGateway instance (defaults to a new instance)
+        index: Optional FolderIndex of the folder (defaults to scanning the folder)
 
     Returns:
         list: List of available prompt styles
     """
-    # Use provided file gateway or create a new one
-    file_gateway = file_gateway or FileGateway()
+    # Use provided index or scan the folder
+    index = index or FolderIndex.from_folder(folder_path, file_gateway)
 
-    styles = []
-
-    # Get all markdown files that are not output or assessment files
-    files = file_gateway.list_files_with_pattern(
-        folder_path, 
-        suffix='.md', 
-        exclude_patterns=["output", "assessment"]
-    )
-
-    for file_path in files:
-        # Extract style from prompt filename (pattern: "prompt-{style}.md")
-        match = re.match(r'prompt-(.+)\.md$', file_path.name)
-        if match:
-            styles.append(match.group(1))
-
-    return styles
+    return index.prompt_styles()
 
 def get_prompt_files(
     folder_path: Union[str, Path], 
     prompt_pattern: Optional[str] = None,
-    file_gateway: Optional[FileGateway] = None
+    file_gateway: Optional[FileGateway] = None,
+    index: Optional[FolderIndex] = None
 ):
     """
     Get prompt files from the folder, optionally filtered by prompt pattern.
@@ -55,51 +43,55 @@ def get_prompt_files(
         folder_path: Path to the folder containing prompt files
         prompt_pattern: Optional comma-separated list of style names to filter prompt files
         file_gateway: Optional FileGateway instance (defaults to a new instance)
+        index: Optional FolderIndex of the folder (defaults to scanning the folder)
 
     Returns:
         list: List of pathlib.Path objects for prompt files
     """
-    # Use provided file gateway or create a new one
-    file_gateway = file_gateway or FileGateway()
-
-    # Ensure the folder exists
-    if not file_gateway.folder_exists(folder_path):
-        raise ValueError(f"The path {folder_path} does not exist or is not a directory")
+    # Use provided index or scan the folder
+    index = index or FolderIndex.from_folder(folder_path, file_gateway)
 
-    # Get all markdown files that are not output or assessment files
-    files = file_gateway.list_files_with_pattern(
-        folder_path, 
-        suffix='.md', 
-        exclude_patterns=["output", "assessment"]
-    )
+    prompts = index.files(FileKind.PROMPT)
 
-    prompt_files = []
+    # If prompt_pattern is provided, keep only the files of the specified styles
+    if prompt_pattern:
+        styles = {style.strip() for style in prompt_pattern.split(',')}
+        prompts = [record for record in prompts if record.style in styles]
 
-    for file_path in files:
-        # If prompt_pattern is provided, check if the file matches any of the specified styles
-        if prompt_pattern:
-            styles = [style.strip() for style in prompt_pattern.split(',')]
-            if not any(file_path.stem == f"prompt-{style}" for style in styles):
-                continue
+    return [record.path for record in prompts]
 
-        prompt_files.append(file_path)
-
-    return prompt_files
-
-def create_output_file_path(file_path: Union[str, Path], model_name: str) -> Path:
+def create_output_file_path(
+    file_path: Union[str, Path],
+    model_name: str,
+    sample: Optional[int] = None
+) -> Path:
     """
     Create the output file path for a given file and model.
 
     Args:
         file_path: Path to the source file
         model_name: Name of the model
+        sample: Optional replicate number of a multi-sample run, added as a "-s{sample}" suffix
 
     Returns:
         Path object for the output file
     """
     path = Path(file_path)
+    replicate = f"-s{sample}" if sample is not None else ""
     return path.with_name(
-        f"{path.stem}-output-{model_name.replace(':','-')}{path.suffix}")
+        f"{path.stem}-output-{output_model_name(model_name)}{replicate}{path.suffix}")
+
+def output_model_name(model_name: str) -> str:
+    """
+    Get a model's name as it appears in output and cross-prompt assessment filenames.
+
+    Args:
+        model_name: Name of the model
+
+    Returns:
+        The model name with characters that are awkward in filenames replaced
+    """
+    return model_name.replace(':', '-')
 
 def create_assessment_file_path(file_path: Union[str, Path]) -> Path:
     """
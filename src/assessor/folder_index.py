@@ -0,0 +1,226 @@
+"""
+Folder index module for the assessor package.
+
+This module scans a prompt folder once and parses every filename into a structured record, so
+the processing and assessment phases can look files up by kind, style and model instead of each
+listing the folder again and matching substrings against whole paths.
+"""
+
+import re
+import threading
+from collections import defaultdict
+from enum import Enum
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Union
+
+from assessor.file_gateway import FileGateway
+
+OUTPUT_SEPARATOR = "-output-"
+ASSESSMENT_SUFFIX = "-assessment"
+CROSS_ASSESSMENT_PREFIX = "cross-prompt-assessment-"
+PROMPT_PREFIX = "prompt-"
+
+# Replicate outputs of a multi-sample run end in "-s{k}"
+SAMPLE_PATTERN = re.compile(r"^(?P<model>.+)-s(?P<sample>\d+)$")
+
+
+class FileKind(Enum):
+    """Role of a file in a prompt folder."""
+
+    PROMPT = "prompt"
+    OUTPUT = "output"
+    ASSESSMENT = "assessment"
+    CROSS_ASSESSMENT = "cross-assessment"
+
+
+class IndexedFile(NamedTuple):
+    """A file in a prompt folder, with the style, model and sample parsed from its name."""
+
+    path: Path
+    kind: FileKind
+    style: Optional[str] = None
+    model: Optional[str] = None
+    sample: Optional[int] = None
+
+
+def parse_file_name(file_path: Union[str, Path], samples: int = 1) -> Optional[IndexedFile]:
+    """
+    Work out what a file in a prompt folder is from its name.
+
+    Names follow the patterns "prompt-{style}.md", "prompt-{style}-output-{model}.md",
+    "prompt-{style}-output-{model}-s{sample}.md" (a replicate of a multi-sample run),
+    "prompt-{style}-assessment.md" and "cross-prompt-assessment-{model}.md". A single-sample
+    run writes no replicates, so it reads a "-s{sample}" suffix as part of the model name.
+
+    Args:
+        file_path: Path to the file
+        samples: Number of replicate generations per prompt file and model in the run
+
+    Returns:
+        Optional[IndexedFile]: The parsed record, or None for files that are not part of a run
+    """
+    path = Path(file_path)
+    if path.suffix.lower() != ".md":
+        return None
+
+    stem = path.stem
+    if stem.startswith(CROSS_ASSESSMENT_PREFIX):
+        return IndexedFile(
+            path, FileKind.CROSS_ASSESSMENT, model=stem[len(CROSS_ASSESSMENT_PREFIX):])
+
+    if not stem.startswith(PROMPT_PREFIX):
+        return None
+
+    name = stem[len(PROMPT_PREFIX):]
+    if OUTPUT_SEPARATOR in name:
+        style, model = name.split(OUTPUT_SEPARATOR, 1)
+        replicate = SAMPLE_PATTERN.match(model) if samples > 1 else None
+        if replicate:
+            return IndexedFile(
+                path, FileKind.OUTPUT, style=style, model=replicate.group("model"),
+                sample=int(replicate.group("sample")))
+        return IndexedFile(path, FileKind.OUTPUT, style=style, model=model)
+
+    if name.endswith(ASSESSMENT_SUFFIX):
+        return IndexedFile(path, FileKind.ASSESSMENT, style=name[:-len(ASSESSMENT_SUFFIX)])
+
+    return IndexedFile(path, FileKind.PROMPT, style=name)
+
+
+class FolderIndex:
+    """Parsed listing of a prompt folder, built once per run and shared by every phase."""
+
+    def __init__(self, folder_path: Union[str, Path], file_paths: List[Path], samples: int = 1):
+        """
+        Initialize the index.
+
+        Args:
+            folder_path: Folder the files belong to
+            file_paths: Paths of the files in the folder
+            samples: Number of replicate generations per prompt file and model in the run
+        """
+        self.folder = Path(folder_path)
+        self.samples = samples
+        self._files: Dict[Path, IndexedFile] = {}
+        self._prompts: Dict[str, Path] = {}
+        self._outputs: Dict[str, Dict[str, List[IndexedFile]]] = defaultdict(
+            lambda: defaultdict(list))
+        self._lock = threading.Lock()
+        for file_path in file_paths:
+            self.add(file_path)
+
+    @classmethod
+    def from_folder(
+        cls,
+        folder_path: Union[str, Path],
+        file_gateway: Optional[FileGateway] = None,
+        samples: int = 1
+    ) -> "FolderIndex":
+        """
+        Scan a folder in a single pass and index its files.
+
+        Args:
+            folder_path: Path to the folder to index
+            file_gateway: Optional FileGateway instance (defaults to a new instance)
+            samples: Number of replicate generations per prompt file and model in the run
+
+        Returns:
+            FolderIndex: The index of the folder
+        """
+        # Use provided file gateway or create a new one
+        file_gateway = file_gateway or FileGateway()
+
+        # Ensure the folder exists
+        if not file_gateway.folder_exists(folder_path):
+            raise ValueError(f"The path {folder_path} does not exist or is not a directory")
+
+        return cls(folder_path, file_gateway.scan_folder(folder_path), samples)
+
+    def add(self, file_path: Union[str, Path]) -> None:
+        """
+        Index a file, e.g. an output written after the folder was scanned.
+
+        Args:
+            file_path: Path to the file
+        """
+        record = parse_file_name(file_path, self.samples)
+        if record is None:
+            return
+        with self._lock:
+            if record.path in self._files:
+                return
+            self._files[record.path] = record
+            if record.kind == FileKind.PROMPT:
+                self._prompts[record.style] = record.path
+            elif record.kind == FileKind.OUTPUT:
+                self._outputs[record.style][record.model].append(record)
+
+    def files(self, kind: FileKind) -> List[IndexedFile]:
+        """
+        Get the indexed files of one kind.
+
+        Args:
+            kind: The kind of file to return
+
+        Returns:
+            list: Records of that kind, in the order they were indexed
+        """
+        with self._lock:
+            return [record for record in self._files.values() if record.kind == kind]
+
+    def prompt_styles(self) -> List[str]:
+        """Get the styles of the prompt files in the folder."""
+        with self._lock:
+            return list(self._prompts)
+
+    def prompt_file(self, style: str) -> Optional[Path]:
+        """
+        Look up the prompt file of a style.
+
+        Args:
+            style: The prompt style, matched exactly
+
+        Returns:
+            Optional[Path]: The prompt file, or None if the folder has none for the style
+        """
+        with self._lock:
+            return self._prompts.get(style)
+
+    def outputs_by_model(self, prompt_styles: List[str]) -> Dict[str, Dict[str, List[Path]]]:
+        """
+        Group the output files of the given prompt styles by model.
+
+        Styles are matched exactly, so "plain" does not pick up the outputs of "plain-v2". The
+        replicates of a multi-sample run are grouped under their model, in sample order. Outputs
+        left from an earlier run with a different number of samples are left out: replicates
+        numbered beyond the run's samples, unnumbered outputs in a multi-sample run, and
+        replicates beside a model's unnumbered output in a single-sample run.
+
+        Args:
+            prompt_styles: List of prompt styles to look for
+
+        Returns:
+            dict: Nested dictionary of model name -> prompt style -> list of output files
+        """
+        model_outputs = defaultdict(dict)
+        with self._lock:
+            for style in prompt_styles:
+                for model_name, outputs in self._outputs.get(style, {}).items():
+                    outputs = [record for record in outputs if self._in_run(record)]
+                    if outputs:
+                        model_outputs[model_name][style] = [
+                            record.path for record in
+                            sorted(outputs, key=lambda record: (record.sample or 0, record.path))
+                        ]
+        if self.samples == 1:
+            for model_name in list(model_outputs):
+                replicate = SAMPLE_PATTERN.match(model_name)
+                if replicate and replicate.group("model") in model_outputs:
+                    del model_outputs[model_name]
+        return model_outputs
+
+    def _in_run(self, record: IndexedFile) -> bool:
+        # A multi-sample run numbers every output from 1 to its number of samples
+        if self.samples == 1:
+            return True
+        return record.sample is not None and 1 <= record.sample <= self.samples
@@ -0,0 +1,143 @@
+"""
+Tests for the folder_index module.
+"""
+
+from pathlib import Path
+
+from assessor.folder_index import FileKind, FolderIndex, IndexedFile, parse_file_name
+
+
+class DescribeParseFileName:
+    """Tests for the parse_file_name function."""
+
+    def should_parse_prompt_files(self):
+        """It should read the style from a prompt filename."""
+        result = parse_file_name(Path("prompts/prompt-plain-v2.md"))
+
+        assert result == IndexedFile(Path("prompts/prompt-plain-v2.md"), FileKind.PROMPT, "plain-v2")
+
+    def should_parse_output_files(self):
+        """It should read the style and model from an output filename."""
+        result = parse_file_name(Path("prompt-fancy-output-qwen2.5-coder-32b.md"))
+
+        assert (result.kind, result.style, result.model) == (
+            FileKind.OUTPUT, "fancy", "qwen2.5-coder-32b")
+
+    def should_parse_replicate_output_files(self):
+        """It should read the sample number of a multi-sample run apart from the model."""
+        result = parse_file_name(Path("prompt-fancy-output-qwen3-32b-s2.md"), samples=3)
+
+        assert (result.kind, result.style, result.model, result.sample) == (
+            FileKind.OUTPUT, "fancy", "qwen3-32b", 2)
+
+    def should_read_a_sample_suffix_as_part_of_the_model_in_a_single_sample_run(self):
+        """It should not take a model whose name ends in -s{digits} for a replicate."""
+        result = parse_file_name(Path("prompt-fancy-output-acme-s2.md"))
+
+        assert (result.model, result.sample) == ("acme-s2", None)
+
+    def should_parse_cross_prompt_assessment_files(self):
+        """It should read the model from a cross-prompt assessment filename."""
+        result = parse_file_name(Path("cross-prompt-assessment-gpt-4o.md"))
+
+        assert (result.kind, result.model) == (FileKind.CROSS_ASSESSMENT, "gpt-4o")
+
+    def should_ignore_the_folder_name(self):
+        """It should classify a prompt by its own name even inside a folder named output."""
+        result = parse_file_name(Path("output/prompt-plain.md"))
+
+        assert result.kind == FileKind.PROMPT
+
+
+class DescribeFolderIndex:
+    """Tests for the FolderIndex class."""
+
+    def should_list_prompt_styles_without_outputs_or_assessments(self):
+        """It should only report styles of prompt files."""
+        index = FolderIndex("prompts", [
+            Path("prompts/prompt-plain.md"),
+            Path("prompts/prompt-plain-output-gpt-4o.md"),
+            Path("prompts/prompt-plain-assessment.md"),
+            Path("prompts/prompt-fancy.md"),
+        ])
+
+        result = index.prompt_styles()
+
+        assert result == ["plain", "fancy"]
+
+    def should_include_files_added_after_the_scan(self):
+        """It should index outputs written during the run."""
+        index = FolderIndex("prompts", [Path("prompts/prompt-plain.md")])
+        index.add(Path("prompts/prompt-plain-output-gpt-4o.md"))
+
+        result = [record.path for record in index.files(FileKind.OUTPUT)]
+
+        assert result == [Path("prompts/prompt-plain-output-gpt-4o.md")]
+
+    def should_group_outputs_by_model_with_exact_style_matching(self):
+        """It should not mix the outputs of styles that share a prefix."""
+        index = FolderIndex("prompts", [
+            Path("prompts/prompt-plain-output-gpt-4o.md"),
+            Path("prompts/prompt-plain-v2-output-gpt-4o.md"),
+            Path("prompts/prompt-fancy-output-gpt-4o.md"),
+        ])
+
+        result = index.outputs_by_model(["plain", "fancy"])
+
+        assert result == {"gpt-4o": {
+            "plain": [Path("prompts/prompt-plain-output-gpt-4o.md")],
+            "fancy": [Path("prompts/prompt-fancy-output-gpt-4o.md")],
+        }}
+
+    def should_group_replicates_under_their_model_in_sample_order(self):
+        """It should hand the samples of a multi-sample run to the assessments together."""
+        index = FolderIndex("prompts", [
+            Path("prompts/prompt-plain-output-gpt-4o-s10.md"),
+            Path("prompts/prompt-plain-output-gpt-4o-s2.md"),
+        ], samples=10)
+
+        result = index.outputs_by_model(["plain"])
+
+        assert result == {"gpt-4o": {"plain": [
+            Path("prompts/prompt-plain-output-gpt-4o-s2.md"),
+            Path("prompts/prompt-plain-output-gpt-4o-s10.md"),
+        ]}}
+
+    def should_leave_out_replicates_beyond_the_run_s_samples(self):
+        """It should not compare outputs left from a run with more or fewer samples."""
+        index = FolderIndex("prompts", [
+            Path("prompts/prompt-plain-output-gpt-4o.md"),
+            Path("prompts/prompt-plain-output-gpt-4o-s1.md"),
+            Path("prompts/prompt-plain-output-gpt-4o-s2.md"),
+            Path("prompts/prompt-plain-output-gpt-4o-s3.md"),
+        ], samples=2)
+
+        result = index.outputs_by_model(["plain"])
+
+        assert result == {"gpt-4o": {"plain": [
+            Path("prompts/prompt-plain-output-gpt-4o-s1.md"),
+            Path("prompts/prompt-plain-output-gpt-4o-s2.md"),
+        ]}}
+
+    def should_leave_out_earlier_replicates_in_a_single_sample_run(self):
+        """It should compare a model's unnumbered output, not replicates an earlier run left."""
+        index = FolderIndex("prompts", [
+            Path("prompts/prompt-plain-output-gpt-4o.md"),
+            Path("prompts/prompt-plain-output-gpt-4o-s1.md"),
+            Path("prompts/prompt-plain-output-acme-s2.md"),
+        ])
+
+        result = index.outputs_by_model(["plain"])
+
+        assert result == {
+            "gpt-4o": {"plain": [Path("prompts/prompt-plain-output-gpt-4o.md")]},
+            "acme-s2": {"plain": [Path("prompts/prompt-plain-output-acme-s2.md")]},
+        }
+
+    def should_look_up_prompt_files_by_style(self):
+        """It should find a style's prompt file without touching the file system."""
+        index = FolderIndex("prompts", [Path("prompts/prompt-plain.md")])
+
+        result = (index.prompt_file("plain"), index.prompt_file("plain-v2"))
+
+        assert result == (Path("prompts/prompt-plain.md"), None)
@@ -0,0 +1,299 @@
+"""
+Job queue module for the assessor package.
+
+This module keeps the generation and assessment work of a sweep as serializable jobs in a
+durable SQLite queue beside the prompt files. Any number of worker processes lease jobs from it,
+keep their leases alive with heartbeats while they work, and record each job's result; a job
+whose worker died is leased again once its lease expires.
+
+Leases rely on SQLite's file locks, which network filesystems such as NFS and SMB do not
+implement reliably: two hosts sharing the file could lease the same job. Keep the queue on a
+local filesystem; workers on other machines reach it through a JobQueueServer instead of
+opening the file.
+"""
+
+import json
+import pathlib
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Union
+
+QUEUE_FILE_NAME = ".assessor-queue.sqlite"
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL UNIQUE,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT
+)
+"""
+
+
+class Job(NamedTuple):
+    """A job leased from the queue."""
+
+    id: int
+    key: str
+    kind: str
+    payload: Dict[str, Any]
+    attempts: int
+
+
+class JobQueue:
+    """Durable queue of jobs shared by a coordinator and its workers through a SQLite file."""
+
+    def __init__(
+        self,
+        folder_path: Union[str, pathlib.Path],
+        max_attempts: int = 3,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Initialize the queue, creating its file if necessary.
+
+        Args:
+            folder_path: Folder holding the queue file, on a local filesystem
+            max_attempts: Number of times a failing job is leased before it is marked failed
+            clock: Function returning the current time in seconds; leases are compared across
+                   processes, so this is wall-clock time
+        """
+        self.path = pathlib.Path(folder_path) / QUEUE_FILE_NAME
+        self.max_attempts = max_attempts
+        self._clock = clock
+        self._lock = threading.Lock()
+        with self._connect() as connection:
+            connection.execute(_SCHEMA)
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], key: str) -> bool:
+        """
+        Add a job, unless a job with the same key was added before.
+
+        Args:
+            kind: Kind of job, which selects the function a worker runs it with
+            payload: JSON-serializable arguments of the job
+            key: Unique name of the job, so enqueueing a sweep twice does not duplicate it
+
+        Returns:
+            True if the job was added, False if it was already queued
+        """
+        with self._lock, self._connect() as connection:
+            cursor = connection.execute(
+                "INSERT OR IGNORE INTO jobs (key, kind, payload) VALUES (?, ?, ?)",
+                (key, kind, json.dumps(payload)))
+            return cursor.rowcount == 1
+
+    def lease(
+        self,
+        worker: str,
+        lease_seconds: float,
+        kinds: Optional[List[str]] = None
+    ) -> Optional[Job]:
+        """
+        Claim the oldest job that is pending or whose previous lease expired.
+
+        A job whose lease expired after its last allowed attempt is marked failed instead, so a
+        job that kills every worker running it is not leased forever.
+
+        Args:
+            worker: Name of the worker claiming the job
+            lease_seconds: Time the worker has to finish or send a heartbeat
+            kinds: Optional kinds of job to claim (defaults to any)
+
+        Returns:
+            Optional[Job]: The claimed job, or None if there is nothing to do right now
+        """
+        now = self._clock()
+        kind_filter = ""
+        parameters: List[Any] = [PENDING, LEASED, now]
+        if kinds:
+            kind_filter = f" AND kind IN ({', '.join('?' for _ in kinds)})"
+            parameters.extend(kinds)
+        with self._lock, self._connect() as connection:
+            # Take the write lock before reading, so two workers never claim the same job
+            connection.execute("BEGIN IMMEDIATE")
+            connection.execute(
+                "UPDATE jobs SET state = ?, error = ?, lease_expires = NULL "
+                "WHERE state = ? AND lease_expires < ? AND attempts >= ?",
+                (FAILED, "Lease expired on the last attempt", LEASED, now, self.max_attempts))
+            row = connection.execute(
+                "SELECT id, key, kind, payload, attempts FROM jobs "
+                "WHERE (state = ? OR (state = ? AND lease_expires < ?))"
+                f"{kind_filter} ORDER BY id LIMIT 1", parameters).fetchone()
+            if row is None:
+                return None
+            job_id, key, kind, payload, attempts = row
+            connection.execute(
+                "UPDATE jobs SET state = ?, worker = ?, lease_expires = ?, attempts = ? "
+                "WHERE id = ?", (LEASED, worker, now + lease_seconds, attempts + 1, job_id))
+            return Job(job_id, key, kind, json.loads(payload), attempts + 1)
+
+    def heartbeat(self, job: Job, worker: str, lease_seconds: float) -> bool:
+        """
+        Extend the lease of a job the worker is still working on.
+
+        Args:
+            job: The leased job
+            worker: Name of the worker holding the lease
+            lease_seconds: Time from now the worker has to finish or send the next heartbeat
+
+        Returns:
+            True if the worker still holds the lease, False if it expired and was taken over
+        """
+        with self._lock, self._connect() as connection:
+            cursor = connection.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE id = ? AND worker = ? AND state = ?",
+                (self._clock() + lease_seconds, job.id, worker, LEASED))
+            return cursor.rowcount == 1
+
+    def complete(self, job: Job, worker: str, result: Any) -> bool:
+        """
+        Record the result of a finished job.
+
+        Args:
+            job: The leased job
+            worker: Name of the worker that ran it
+            result: JSON-serializable result of the job
+
+        Returns:
+            True if the result was recorded, False if the job was leased to another worker
+        """
+        with self._lock, self._connect() as connection:
+            cursor = connection.execute(
+                "UPDATE jobs SET state = ?, result = ?, error = NULL, lease_expires = NULL "
+                "WHERE id = ? AND worker = ?", (DONE, json.dumps(result), job.id, worker))
+            return cursor.rowcount == 1
+
+    def fail(self, job: Job, worker: str, error: str) -> None:
+        """
+        Record a failed attempt, putting the job back in the queue unless it used up its attempts.
+
+        Args:
+            job: The leased job
+            worker: Name of the worker that ran it
+            error: Description of the failure
+        """
+        state = FAILED if job.attempts >= self.max_attempts else PENDING
+        with self._lock, self._connect() as connection:
+            connection.execute(
+                "UPDATE jobs SET state = ?, error = ?, lease_expires = NULL "
+                "WHERE id = ? AND worker = ?", (state, error, job.id, worker))
+
+    def retry_failed(self) -> int:
+        """
+        Put every failed job back in the queue with all of its attempts.
+
+        Returns:
+            int: The number of jobs to be tried again
+        """
+        with self._lock, self._connect() as connection:
+            cursor = connection.execute(
+                "UPDATE jobs SET state = ?, attempts = 0, worker = NULL, error = NULL "
+                "WHERE state = ?", (PENDING, FAILED))
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        """Remove every job, so the next sweep starts from scratch."""
+        with self._lock, self._connect() as connection:
+            connection.execute("DELETE FROM jobs")
+
+    def counts(self, kind: Optional[str] = None) -> Dict[str, int]:
+        """
+        Count the jobs in each state.
+
+        Args:
+            kind: Optional kind of job to count (defaults to every kind)
+
+        Returns:
+            dict: Number of jobs per state, including states with none
+        """
+        query = "SELECT state, COUNT(*) FROM jobs"
+        parameters: List[Any] = []
+        if kind is not None:
+            query += " WHERE kind = ?"
+            parameters.append(kind)
+        with self._lock, self._connect() as connection:
+            rows = connection.execute(f"{query} GROUP BY state", parameters).fetchall()
+        counts = {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        counts.update(dict(rows))
+        return counts
+
+    def results(self, kind: str) -> Dict[str, Any]:
+        """
+        Get the results of the finished jobs of a kind.
+
+        Args:
+            kind: Kind of job
+
+        Returns:
+            dict: Job key -> result, in the order the jobs were enqueued
+        """
+        with self._lock, self._connect() as connection:
+            rows = connection.execute(
+                "SELECT key, result FROM jobs WHERE kind = ? AND state = ? ORDER BY id",
+                (kind, DONE)).fetchall()
+        return {key: json.loads(result) for key, result in rows}
+
+    def wait(
+        self,
+        kind: str,
+        poll_seconds: float,
+        on_progress: Optional[Callable[[Dict[str, int]], None]] = None,
+        sleep: Callable[[float], None] = time.sleep
+    ) -> Dict[str, int]:
+        """
+        Wait until every job of a kind is done or failed.
+
+        Args:
+            kind: Kind of job to wait for
+            poll_seconds: Time between checks of the queue
+            on_progress: Optional callable given the counts whenever they change
+            sleep: Function used to wait between checks
+
+        Returns:
+            dict: The final number of jobs per state
+        """
+        previous = None
+        while True:
+            counts = self.counts(kind)
+            if counts != previous and on_progress is not None:
+                on_progress(counts)
+            previous = counts
+            if counts[PENDING] == 0 and counts[LEASED] == 0:
+                return counts
+            sleep(poll_seconds)
+
+    def _connect(self) -> "_closing":
+        # Autocommit mode, so lease can open its own immediate transaction; a connection per
+        # call keeps the queue usable from any thread
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        return _closing(connection)
+
+
+class _closing:
+    """Context manager committing (or rolling back) an open transaction and closing a connection."""
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+
+    def __enter__(self) -> sqlite3.Connection:
+        return self.connection
+
+    def __exit__(self, error_type, error, traceback) -> None:
+        try:
+            if self.connection.in_transaction:
+                self.connection.execute("ROLLBACK" if error_type else "COMMIT")
+        finally:
+            self.connection.close()
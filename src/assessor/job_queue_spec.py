@@ -0,0 +1,133 @@
+"""
+Tests for the job_queue module.
+"""
+
+from assessor.job_queue import DONE, FAILED, PENDING, JobQueue
+
+
+class FakeClock:
+    """Clock that only advances when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class DescribeJobQueue:
+    """Tests for the JobQueue class."""
+
+    def should_not_add_a_job_twice(self, tmp_path):
+        """It should ignore a job whose key is already queued."""
+        queue = JobQueue(tmp_path)
+        queue.enqueue("generate", {"prompt": "prompt-plain.md"}, "generate:a")
+
+        result = queue.enqueue("generate", {"prompt": "prompt-plain.md"}, "generate:a")
+
+        assert result is False
+        assert queue.counts()[PENDING] == 1
+
+    def should_lease_each_job_to_one_worker(self, tmp_path):
+        """It should hand a leased job to no other worker while the lease lasts."""
+        queue = JobQueue(tmp_path)
+        queue.enqueue("generate", {"prompt": "prompt-plain.md"}, "generate:a")
+
+        first = queue.lease("worker-1", 60)
+        second = JobQueue(tmp_path).lease("worker-2", 60)
+
+        assert first.payload == {"prompt": "prompt-plain.md"}
+        assert second is None
+
+    def should_lease_a_job_again_once_its_lease_expired(self, tmp_path):
+        """It should give the job of a worker that stopped sending heartbeats to another."""
+        clock = FakeClock()
+        queue = JobQueue(tmp_path, clock=clock)
+        queue.enqueue("generate", {}, "generate:a")
+        queue.lease("worker-1", 60)
+        clock.now += 61
+
+        result = queue.lease("worker-2", 60)
+
+        assert result.attempts == 2
+        assert queue.heartbeat(result, "worker-1", 60) is False
+
+    def should_keep_a_job_leased_while_heartbeats_arrive(self, tmp_path):
+        """It should extend the lease of a worker that sends heartbeats."""
+        clock = FakeClock()
+        queue = JobQueue(tmp_path, clock=clock)
+        queue.enqueue("generate", {}, "generate:a")
+        job = queue.lease("worker-1", 60)
+        clock.now += 50
+        queue.heartbeat(job, "worker-1", 60)
+        clock.now += 50
+
+        result = queue.lease("worker-2", 60)
+
+        assert result is None
+
+    def should_not_record_the_result_of_a_job_another_worker_took_over(self, tmp_path):
+        """It should report that a worker whose lease was taken over did not complete the job."""
+        clock = FakeClock()
+        queue = JobQueue(tmp_path, clock=clock)
+        queue.enqueue("generate", {}, "generate:a")
+        job = queue.lease("worker-1", 60)
+        clock.now += 61
+        queue.lease("worker-2", 60)
+
+        result = queue.complete(job, "worker-1", {"output": "late"})
+
+        assert result is False
+        assert queue.counts()[DONE] == 0
+
+    def should_retry_a_failed_job_until_it_used_up_its_attempts(self, tmp_path):
+        """It should put a failed job back in the queue, and give up after the last attempt."""
+        queue = JobQueue(tmp_path, max_attempts=2)
+        queue.enqueue("generate", {}, "generate:a")
+        queue.fail(queue.lease("worker-1", 60), "worker-1", "timeout")
+        queue.fail(queue.lease("worker-1", 60), "worker-1", "timeout")
+
+        result = queue.counts()
+
+        assert result[FAILED] == 1
+        assert result[PENDING] == 0
+
+    def should_give_up_on_a_job_whose_last_lease_expired(self, tmp_path):
+        """It should mark a job failed once the lease of its last attempt expired."""
+        clock = FakeClock()
+        queue = JobQueue(tmp_path, max_attempts=2, clock=clock)
+        queue.enqueue("generate", {}, "generate:a")
+        queue.lease("worker-1", 60)
+        clock.now += 61
+        queue.lease("worker-2", 60)
+        clock.now += 61
+
+        result = queue.lease("worker-3", 60)
+
+        assert result is None
+        assert queue.counts()[FAILED] == 1
+
+    def should_retry_failed_jobs_with_all_their_attempts(self, tmp_path):
+        """It should put failed jobs back in the queue with their attempts reset."""
+        queue = JobQueue(tmp_path, max_attempts=1)
+        queue.enqueue("generate", {}, "generate:a")
+        queue.fail(queue.lease("worker-1", 60), "worker-1", "timeout")
+
+        result = queue.retry_failed()
+
+        assert result == 1
+        assert queue.lease("worker-1", 60).attempts == 1
+
+    def should_return_the_results_of_finished_jobs(self, tmp_path):
+        """It should return each finished job's result under its key, in enqueue order."""
+        queue = JobQueue(tmp_path)
+        queue.enqueue("generate", {}, "generate:a")
+        queue.enqueue("generate", {}, "generate:b")
+        for _ in range(2):
+            job = queue.lease("worker-1", 60)
+            queue.complete(job, "worker-1", {"output": job.key})
+
+        result = queue.results("generate")
+
+        assert list(result) == ["generate:a", "generate:b"]
+        assert queue.counts("generate")[DONE] == 2
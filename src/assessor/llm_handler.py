@@ -2,22 +2,38 @@
 LLM interaction utilities for the assessor module.
 """
 
+import asyncio
+import time
 from pathlib import Path
-from typing import Union
+from typing import Optional, Union
 
-from mojentic.llm import LLMBroker
 from mojentic.llm.gateways.models import LLMMessage
 
-from assessor.config import default_config
+from assessor.config import default_config, get_llm_broker
 from assessor.file_gateway import FileGateway
-from assessor.utils import strip_thinking
+from assessor.metrics import RunMetrics, measure
+from assessor.rate_limiter import gateway_name
+from assessor.response_cache import ResponseCache
+from assessor.token_budget import estimate_tokens
+from assessor.utils import ThinkingFilter, run_in_thread, strip_thinking
+
+# Generation parameters sent with every prompt; part of the response cache key
+GENERATION_PARAMS = {
+    "temperature": 1.0,
+    "num_ctx": 32768,
+    "num_predict": -1,
+    "max_tokens": 16384,
+}
 
 
 def process_with_model(
     file_path: Union[str, Path], 
     model_name: str, 
     gateway, 
-    file_gateway: FileGateway = None
+    file_gateway: FileGateway = None,
+    cache: Optional[ResponseCache] = None,
+    metrics: Optional[RunMetrics] = None,
+    sample: Optional[int] = None
 ):
     """
     Process a file with a specific LLM model.
@@ -27,6 +43,10 @@ def process_with_model(
         model_name: Name of the model to use
         gateway: LLM gateway (OpenAI or Ollama)
         file_gateway: Optional FileGateway instance (defaults to a new instance)
+        cache: Optional ResponseCache consulted before calling the model
+        metrics: Optional RunMetrics the call's timings and token counts are added to
+        sample: Optional replicate number of a multi-sample run; each replicate is cached
+                separately
 
     Returns:
         str: The processed response
@@ -34,23 +54,171 @@ def process_with_model(
     # Use provided file gateway or create a new one
     file_gateway = file_gateway or FileGateway()
 
-    # Read the file contents
-    file_contents = file_gateway.read_file(file_path)
+    with measure(metrics, "generation", model_name, file_path) as call:
+        # Read the file contents
+        file_contents = file_gateway.read_file(file_path)
+        call.input_tokens = estimate_tokens(file_contents)
+
+        # Reuse a previous response for the same prompt, model and parameters
+        if cache is not None:
+            cache_key = cache.make_key(
+                file_contents, model_name, gateway_name(gateway), _cache_params(sample))
+            cached_response = cache.get(cache_key)
+            if cached_response is not None:
+                call.cache_hit = True
+                call.output_tokens = estimate_tokens(cached_response)
+                return cached_response
+
+        # Create an LLMMessage with the file contents
+        message = LLMMessage(content=file_contents)
 
-    # Create an LLMMessage with the file contents
-    message = LLMMessage(content=file_contents)
+        # Reuse the broker for this model and gateway across calls
+        llm = get_llm_broker(model_name, gateway)
 
-    # Create LLM broker with the specified model and gateway
-    llm = LLMBroker(model=model_name, gateway=gateway)
+        # Send the message to the LLM
+        raw_response = llm.generate(messages=[message], **GENERATION_PARAMS)
 
-    # Send the message to the LLM
-    response = llm.generate(messages=[message])
+        # Strip out thinking text
+        response = strip_thinking(raw_response)
+        call.output_tokens = estimate_tokens(response)
+        call.thinking_tokens = max(0, estimate_tokens(raw_response) - call.output_tokens)
 
-    # Strip out thinking text
-    response = strip_thinking(response)
+    if cache is not None:
+        cache.put(cache_key, response)
 
     return response
 
+def stream_with_model(
+    file_path: Union[str, Path],
+    model_name: str,
+    gateway,
+    output_path: Union[str, Path],
+    file_gateway: FileGateway = None,
+    cache: Optional[ResponseCache] = None,
+    metrics: Optional[RunMetrics] = None,
+    sample: Optional[int] = None
+):
+    """
+    Process a file with a specific LLM model, writing the response to a file as it arrives.
+
+    Thinking sections are filtered out while streaming, so the response is never held in memory
+    as a whole and an interrupted run leaves the partial output on disk. Gateways that cannot
+    stream fall back to a single chunk holding the full response.
+
+    Args:
+        file_path: Path to the file to process
+        model_name: Name of the model to use
+        gateway: LLM gateway (OpenAI or Ollama)
+        output_path: Path of the output file to write the response to
+        file_gateway: Optional FileGateway instance (defaults to a new instance)
+        cache: Optional ResponseCache consulted before calling the model
+        metrics: Optional RunMetrics the call's timings and token counts are added to
+        sample: Optional replicate number of a multi-sample run; each replicate is cached
+                separately
+    """
+    # Use provided file gateway or create a new one
+    file_gateway = file_gateway or FileGateway()
+
+    with measure(metrics, "generation", model_name, file_path) as call:
+        # Read the file contents
+        file_contents = file_gateway.read_file(file_path)
+        call.input_tokens = estimate_tokens(file_contents)
+
+        # Reuse a previous response for the same prompt, model and parameters
+        if cache is not None:
+            cache_key = cache.make_key(
+                file_contents, model_name, gateway_name(gateway), _cache_params(sample))
+            cached_response = cache.get(cache_key)
+            if cached_response is not None:
+                call.cache_hit = True
+                call.output_tokens = estimate_tokens(cached_response)
+                file_gateway.write_file(output_path, cached_response)
+                return
+
+        # Start from an empty output file and append the visible text chunk by chunk
+        file_gateway.write_file(output_path, "")
+        thinking_filter = ThinkingFilter()
+        generated = []
+        written = []
+        started = time.perf_counter()
+        for chunk in _stream_chunks(model_name, gateway, [LLMMessage(content=file_contents)]):
+            if call.first_token_seconds is None:
+                call.first_token_seconds = time.perf_counter() - started
+            generated.append(chunk)
+            visible = thinking_filter.feed(chunk)
+            if visible:
+                file_gateway.append_file(output_path, visible)
+                written.append(visible)
+        written.append(thinking_filter.flush())
+        file_gateway.append_file(output_path, written[-1])
+        call.output_tokens = estimate_tokens("".join(written))
+        call.thinking_tokens = max(0, estimate_tokens("".join(generated)) - call.output_tokens)
+
+    if cache is not None:
+        cache.put(cache_key, file_gateway.read_file(output_path))
+
+def _cache_params(sample: Optional[int]):
+    # Replicates share prompt, model and parameters, so the sample number tells them apart
+    if sample is None:
+        return GENERATION_PARAMS
+    return {**GENERATION_PARAMS, "sample": sample}
+
+def _stream_chunks(model_name: str, gateway, messages):
+    """
+    Yield the text of a model's response as the gateway produces it.
+
+    Args:
+        model_name: Name of the model to use
+        gateway: LLM gateway (OpenAI or Ollama)
+        messages: Messages to send to the model
+
+    Yields:
+        str: Successive pieces of the response
+    """
+    complete_stream = getattr(gateway, "complete_stream", None)
+    if complete_stream is None:
+        yield get_llm_broker(model_name, gateway).generate(messages=messages, **GENERATION_PARAMS)
+        return
+
+    # The same parameters as a broker call, so both paths generate under the same limits
+    for chunk in complete_stream(model=model_name, messages=messages, **GENERATION_PARAMS):
+        if chunk.content:
+            yield chunk.content
+
+async def aprocess_with_model(
+    file_path: Union[str, Path],
+    model_name: str,
+    gateway,
+    file_gateway: FileGateway = None,
+    cache: Optional[ResponseCache] = None,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    metrics: Optional[RunMetrics] = None,
+    sample: Optional[int] = None
+):
+    """
+    Process a file with a specific LLM model without blocking the event loop.
+
+    The LLM call runs on a worker thread; pass a semaphore to bound how many are in flight.
+
+    Args:
+        file_path: Path to the file to process
+        model_name: Name of the model to use
+        gateway: LLM gateway (OpenAI or Ollama)
+        file_gateway: Optional FileGateway instance (defaults to a new instance)
+        cache: Optional ResponseCache consulted before calling the model
+        semaphore: Optional asyncio.Semaphore limiting concurrent requests
+        metrics: Optional RunMetrics the call's timings and token counts are added to
+        sample: Optional replicate number of a multi-sample run; each replicate is cached
+                separately
+
+    Returns:
+        str: The processed response
+    """
+    return await run_in_thread(
+        process_with_model, file_path, model_name, gateway, file_gateway, cache, metrics, sample,
+        semaphore=semaphore
+    )
+
 def get_assessment_llm(config=None):
     """
     Get the LLM broker for generating assessments.
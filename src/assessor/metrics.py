@@ -0,0 +1,190 @@
+"""
+Run metrics module for the assessor package.
+
+This module records the wall time, time to first token, token counts, stripped thinking, retries,
+cache hits and prompt-cached input tokens of every generation and assessment call in a run, and reports them as a JSON
+metrics file and a summary table showing which models dominate runtime and cost.
+"""
+
+import contextlib
+import contextvars
+import dataclasses
+import datetime
+import json
+import pathlib
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional, Union
+
+from assessor.token_budget import PromptPrefixTracker
+
+METRICS_FILE_PREFIX = "assessor-metrics-"
+
+# The call being measured in the current thread or task, so code deep below it (such as the
+# rate limiter retrying a request) can add to its record
+_current_call: contextvars.ContextVar = contextvars.ContextVar("current_call", default=None)
+
+
+@dataclasses.dataclass
+class CallMetrics:
+    """Measurements of one model call; token counts are estimates from the text lengths."""
+
+    phase: str
+    model: str
+    prompt: str
+    wall_seconds: float = 0.0
+    first_token_seconds: Optional[float] = None
+    input_tokens: int = 0
+    cached_input_tokens: int = 0
+    output_tokens: int = 0
+    thinking_tokens: int = 0
+    retries: int = 0
+    cache_hit: bool = False
+
+
+class RunMetrics:
+    """Thread-safe collection of the call metrics of one run."""
+
+    def __init__(self):
+        """Initialize the collection, starting the run's clock."""
+        self.started_at = datetime.datetime.now()
+        self.calls: List[CallMetrics] = []
+        # Prompts this run sent to each model, for estimating its prompt-cached tokens
+        self.sent_prompts = PromptPrefixTracker()
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add(self, call: CallMetrics) -> None:
+        """
+        Add the metrics of a finished call.
+
+        Args:
+            call: The call's metrics
+        """
+        with self._lock:
+            self.calls.append(call)
+
+    def wall_seconds(self) -> float:
+        """Get the time since the run started."""
+        return time.perf_counter() - self._started
+
+    def totals(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Sum the call metrics per phase and model.
+
+        Returns:
+            dict: Nested dictionary of phase -> model -> totals
+        """
+        totals = defaultdict(lambda: defaultdict(lambda: defaultdict(float)))
+        with self._lock:
+            calls = list(self.calls)
+        for call in calls:
+            total = totals[call.phase][call.model]
+            total["calls"] += 1
+            total["wall_seconds"] += call.wall_seconds
+            total["input_tokens"] += call.input_tokens
+            total["cached_input_tokens"] += call.cached_input_tokens
+            total["output_tokens"] += call.output_tokens
+            total["thinking_tokens"] += call.thinking_tokens
+            total["retries"] += call.retries
+            total["cache_hits"] += call.cache_hit
+            if call.first_token_seconds is not None:
+                total["first_token_calls"] += 1
+                total["first_token_seconds"] += call.first_token_seconds
+        return {
+            phase: {model: dict(total) for model, total in models.items()}
+            for phase, models in totals.items()
+        }
+
+    def write(self, folder_path: Union[str, pathlib.Path]) -> pathlib.Path:
+        """
+        Write the run's metrics to a JSON file named after the run's start time.
+
+        Args:
+            folder_path: Folder to write the metrics file to
+
+        Returns:
+            Path: The metrics file path
+        """
+        path = pathlib.Path(folder_path) / (
+            f"{METRICS_FILE_PREFIX}{self.started_at:%Y%m%d-%H%M%S}.json")
+        with self._lock:
+            calls = [dataclasses.asdict(call) for call in self.calls]
+        path.write_text(json.dumps({
+            "started_at": self.started_at.isoformat(),
+            "wall_seconds": self.wall_seconds(),
+            "totals": self.totals(),
+            "calls": calls,
+        }, indent=2))
+        return path
+
+    def summary(self) -> str:
+        """
+        Format the totals per phase and model as a fixed-width table, slowest first.
+
+        Returns:
+            str: The summary table
+        """
+        header = (
+            f"{'phase':<11} {'model':<28} {'calls':>6} {'wall s':>9} {'ttft s':>7} "
+            f"{'in tok':>9} {'cache tok':>9} {'out tok':>9} {'think tok':>9} {'retries':>7} {'cached':>6}"
+        )
+        rows = [f"Run wall time: {self.wall_seconds():.1f} s", header, "-" * len(header)]
+        entries = [
+            (phase, model, total)
+            for phase, models in self.totals().items() for model, total in models.items()
+        ]
+        for phase, model, total in sorted(entries, key=lambda entry: -entry[2]["wall_seconds"]):
+            first_token_calls = total.get("first_token_calls", 0)
+            ttft = (
+                f"{total['first_token_seconds'] / first_token_calls:>7.2f}"
+                if first_token_calls else f"{'-':>7}"
+            )
+            rows.append(
+                f"{phase:<11} {model:<28} {int(total['calls']):>6} {total['wall_seconds']:>9.1f} "
+                f"{ttft} {int(total['input_tokens']):>9} "
+                f"{int(total['cached_input_tokens']):>9} {int(total['output_tokens']):>9} "
+                f"{int(total['thinking_tokens']):>9} {int(total['retries']):>7} "
+                f"{int(total['cache_hits']):>6}"
+            )
+        return "\n".join(rows)
+
+
+@contextlib.contextmanager
+def measure(
+    metrics: Optional[RunMetrics],
+    phase: str,
+    model: str,
+    prompt: Union[str, pathlib.Path]
+) -> Iterator[CallMetrics]:
+    """
+    Measure a model call, adding its metrics to the run once it finishes.
+
+    The caller fills in the token counts and cache hit on the yielded record; the wall time is
+    measured here. Without a RunMetrics the record is simply discarded.
+
+    Args:
+        metrics: Optional RunMetrics of the run
+        phase: Kind of call, e.g. "generation" or "assessment"
+        model: Name of the model called
+        prompt: The prompt file or other subject of the call
+
+    Yields:
+        CallMetrics: The call's record
+    """
+    call = CallMetrics(phase=phase, model=model, prompt=pathlib.Path(prompt).name)
+    token = _current_call.set(call)
+    started = time.perf_counter()
+    try:
+        yield call
+    finally:
+        call.wall_seconds = time.perf_counter() - started
+        _current_call.reset(token)
+        if metrics is not None:
+            metrics.add(call)
+
+
+def current_call() -> Optional[CallMetrics]:
+    """Get the record of the call being measured in the current thread or task, if any."""
+    return _current_call.get()
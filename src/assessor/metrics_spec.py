@@ -0,0 +1,96 @@
+"""
+Tests for the metrics module.
+"""
+
+import json
+
+import pytest
+
+from assessor.metrics import RunMetrics, current_call, measure
+
+
+class DescribeMeasure:
+    """Tests for the measure context manager."""
+
+    def should_add_the_call_to_the_run(self):
+        """It should add the measured call, with its wall time, once the call finishes."""
+        metrics = RunMetrics()
+
+        with measure(metrics, "generation", "gpt-4.1-nano", "prompts/prompt-plain.md") as call:
+            call.output_tokens = 12
+
+        assert metrics.calls == [call]
+        assert call.prompt == "prompt-plain.md"
+        assert call.wall_seconds >= 0
+
+    def should_expose_the_call_being_measured(self):
+        """It should let code running inside the call add to its record."""
+        with measure(None, "generation", "qwen3:32b", "prompt-plain.md") as call:
+            current_call().retries += 1
+
+        assert call.retries == 1
+        assert current_call() is None
+
+    def should_add_a_call_that_failed(self):
+        """It should still record a call that raised, so failed attempts show in the report."""
+        metrics = RunMetrics()
+
+        with pytest.raises(RuntimeError):
+            with measure(metrics, "generation", "qwen3:32b", "prompt-plain.md"):
+                raise RuntimeError("model crashed")
+
+        assert len(metrics.calls) == 1
+
+
+class DescribeRunMetrics:
+    """Tests for the RunMetrics class."""
+
+    def should_total_calls_per_phase_and_model(self):
+        """It should sum the tokens, retries and cache hits of each model's calls."""
+        metrics = RunMetrics()
+        for cache_hit in (False, True):
+            with measure(metrics, "generation", "gpt-4.1-nano", "prompt-plain.md") as call:
+                call.input_tokens = 10
+                call.output_tokens = 100
+                call.cache_hit = cache_hit
+
+        result = metrics.totals()["generation"]["gpt-4.1-nano"]
+
+        assert result["calls"] == 2
+        assert result["input_tokens"] == 20
+        assert result["output_tokens"] == 200
+        assert result["cache_hits"] == 1
+
+    def should_not_count_prompts_sent_by_another_run_as_cached(self):
+        """It should estimate prompt-cached tokens from the prompts of its own run alone."""
+        prompt = "Assess these outputs. " * 1000
+        earlier_run = RunMetrics()
+        earlier_run.sent_prompts.cached_tokens("gpt-4.1", prompt)
+
+        result = RunMetrics().sent_prompts.cached_tokens("gpt-4.1", prompt)
+
+        assert result == 0
+        assert earlier_run.sent_prompts.cached_tokens("gpt-4.1", prompt) > 0
+
+    def should_write_a_machine_readable_metrics_file(self, tmp_path):
+        """It should write every call and the totals to a JSON file in the folder."""
+        metrics = RunMetrics()
+        with measure(metrics, "assessment", "o1", "prompt-plain.md") as call:
+            call.thinking_tokens = 5
+
+        path = metrics.write(tmp_path)
+
+        written = json.loads(path.read_text())
+        assert path.parent == tmp_path
+        assert written["calls"][0]["thinking_tokens"] == 5
+        assert written["totals"]["assessment"]["o1"]["calls"] == 1
+
+    def should_summarize_each_model_in_a_table(self):
+        """It should list each phase and model in the summary table."""
+        metrics = RunMetrics()
+        with measure(metrics, "generation", "qwen3:32b", "prompt-plain.md"):
+            pass
+
+        result = metrics.summary()
+
+        assert "qwen3:32b" in result
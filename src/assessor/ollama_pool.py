@@ -0,0 +1,245 @@
+"""
+Ollama host pool module for the assessor package.
+
+This module spreads Ollama requests over several hosts, each with its own model inventory and
+capacity, so a sweep's local models can run on every available GPU workstation instead of
+queueing on one. Each request goes to the least-loaded host that serves its model, preferring
+hosts that already have the model loaded so models are not swapped in and out of memory.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+# Seconds to wait for a host to list its loaded models before assuming none are
+RESIDENT_PROBE_TIMEOUT = 5.0
+
+
+class OllamaEndpoint(NamedTuple):
+    """An Ollama host, the models it serves and how much work it takes on at once."""
+
+    url: str
+    models: Optional[Tuple[str, ...]] = None
+    capacity: int = 1
+    resident_models: int = 1
+
+
+def ollama_endpoint(host: Union[str, Dict[str, Any], OllamaEndpoint]) -> OllamaEndpoint:
+    """
+    Make an OllamaEndpoint from its URL, a dictionary of its fields, or an endpoint.
+
+    Args:
+        host: The host's URL, e.g. "http://gpu-1:11434", or a dictionary with the url and
+              optionally the models, capacity and resident_models of the host
+
+    Returns:
+        OllamaEndpoint: The endpoint, with its models as a tuple so it can be a pool key
+    """
+    if isinstance(host, str):
+        return OllamaEndpoint(host)
+    endpoint = OllamaEndpoint(**host) if isinstance(host, dict) else host
+    if endpoint.models is not None:
+        endpoint = endpoint._replace(models=tuple(endpoint.models))
+    return endpoint
+
+
+def model_tag(model_name: str) -> str:
+    """
+    Name a model the way Ollama lists it, with the default ":latest" tag if it has none.
+
+    Args:
+        model_name: Name of the model, e.g. "qwen2.5-coder" or "qwen3:32b"
+
+    Returns:
+        str: The tagged name, e.g. "qwen2.5-coder:latest"
+    """
+    # A registry host may carry a port, so only a colon after the last slash is a tag
+    return model_name if ":" in model_name.rsplit("/", 1)[-1] else f"{model_name}:latest"
+
+
+class _Host:
+    """A pooled endpoint with its gateway and the pool's view of its load and loaded models."""
+
+    def __init__(self, endpoint: OllamaEndpoint, gateway):
+        self.endpoint = endpoint
+        self.gateway = gateway
+        self.in_flight = 0
+        self.resident: Optional[OrderedDict] = None
+
+    def serves(self, model_name: str) -> bool:
+        return self.endpoint.models is None or model_tag(model_name) in map(
+            model_tag, self.endpoint.models)
+
+    def load(self) -> float:
+        return self.in_flight / self.endpoint.capacity
+
+    def mark_resident(self, model_name: str) -> None:
+        # Ollama unloads the least recently used model once its resident slots are full
+        self.resident[model_name] = True
+        self.resident.move_to_end(model_name)
+        while len(self.resident) > self.endpoint.resident_models:
+            self.resident.popitem(last=False)
+
+
+class OllamaHostPool:
+    """
+    Gateway sending each request to the least-loaded of several Ollama hosts.
+
+    A request waits while every host serving its model is at capacity. Among the hosts with
+    room, one that already has the model loaded is preferred, so a model stays on the hosts it
+    was loaded on and is only loaded elsewhere when they are busy and another host is free.
+    """
+
+    # Responses are the same whichever host serves them, so cache keys name the gateway kind
+    GATEWAY_NAME = "OllamaGateway"
+
+    def __init__(
+        self,
+        endpoints: Iterable[OllamaEndpoint],
+        gateway_factory: Optional[Callable[[str], Any]] = None,
+        probe_resident: Optional[Callable[[str], List[str]]] = None
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            endpoints: The Ollama hosts to spread requests over
+            gateway_factory: Creates the gateway of a host from its URL (defaults to an
+                             OllamaGateway for the host)
+            probe_resident: Lists the models a host has loaded, given its URL (defaults to
+                            asking the host's /api/ps endpoint)
+        """
+        gateway_factory = gateway_factory or _ollama_gateway
+        self.hosts = [
+            _Host(endpoint, gateway_factory(endpoint.url))
+            for endpoint in (ollama_endpoint(endpoint) for endpoint in endpoints)
+        ]
+        if not self.hosts:
+            raise ValueError("An Ollama host pool needs at least one host")
+        self.requests: Dict[str, int] = {host.endpoint.url: 0 for host in self.hosts}
+        self._probe_resident = probe_resident or list_resident_models
+        self._available = threading.Condition()
+        if all(hasattr(host.gateway, "complete_stream") for host in self.hosts):
+            self.complete_stream = self._complete_stream
+
+    @property
+    def capacity(self) -> int:
+        """Total number of requests the hosts take on at once."""
+        return sum(host.endpoint.capacity for host in self.hosts)
+
+    @property
+    def resident_models(self) -> int:
+        """Total number of models the hosts keep loaded at once."""
+        return sum(host.endpoint.resident_models for host in self.hosts)
+
+    def complete(self, **kwargs):
+        """Complete a request on the least-loaded host serving its model."""
+        host = self.acquire(kwargs["model"])
+        try:
+            return host.gateway.complete(**kwargs)
+        finally:
+            self.release(host)
+
+    def _complete_stream(self, **kwargs):
+        host = self.acquire(kwargs["model"])
+        try:
+            yield from host.gateway.complete_stream(**kwargs)
+        finally:
+            self.release(host)
+
+    def preload(self, model_name: str, keep_alive: str) -> None:
+        """
+        Load a model on the host its next request would go to.
+
+        Args:
+            model_name: Name of the model to load
+            keep_alive: How long Ollama keeps the model loaded after its last request
+        """
+        host = self.acquire(model_name)
+        try:
+            host.gateway.client.generate(model=model_name, prompt="", keep_alive=keep_alive)
+        finally:
+            self.release(host)
+
+    def acquire(self, model_name: str) -> _Host:
+        """
+        Reserve room on a host for a request, waiting while every host serving it is busy.
+
+        Args:
+            model_name: Name of the model the request is for
+
+        Returns:
+            The host to send the request to; pass it to release once the request is done
+        """
+        candidates = [host for host in self.hosts if host.serves(model_name)]
+        if not candidates:
+            raise ValueError(f"No Ollama host serves the model {model_name}")
+        self._discover_resident(candidates)
+        model_name = model_tag(model_name)
+
+        with self._available:
+            while True:
+                free = [host for host in candidates if host.in_flight < host.endpoint.capacity]
+                if free:
+                    break
+                self._available.wait()
+            host = min(free, key=lambda host: (model_name not in host.resident, host.load()))
+            host.in_flight += 1
+            host.mark_resident(model_name)
+            self.requests[host.endpoint.url] += 1
+            return host
+
+    def release(self, host: _Host) -> None:
+        """
+        Free the room a finished request took on its host.
+
+        Args:
+            host: The host returned by acquire
+        """
+        with self._available:
+            host.in_flight -= 1
+            self._available.notify_all()
+
+    def stats(self) -> str:
+        """Describe the number of requests sent to each host for display."""
+        return ", ".join(f"{url}: {count}" for url, count in self.requests.items())
+
+    def _discover_resident(self, hosts: List[_Host]) -> None:
+        # Ask each host once which models it already has loaded, outside the lock
+        for host in hosts:
+            if host.resident is not None:
+                continue
+            loaded = self._probe_resident(host.endpoint.url)
+            with self._available:
+                if host.resident is None:
+                    host.resident = OrderedDict()
+                    for model_name in loaded[:host.endpoint.resident_models]:
+                        host.resident[model_tag(model_name)] = True
+
+
+def _ollama_gateway(url: str):
+    from mojentic.llm.gateways import OllamaGateway
+
+    return OllamaGateway(host=url)
+
+
+def list_resident_models(url: str) -> List[str]:
+    """
+    Ask an Ollama host which models it has loaded.
+
+    Args:
+        url: The host's URL
+
+    Returns:
+        list: Names of the loaded models, or an empty list if the host does not answer
+    """
+    import urllib.request
+
+    try:
+        with urllib.request.urlopen(
+                f"{url.rstrip('/')}/api/ps", timeout=RESIDENT_PROBE_TIMEOUT) as response:
+            models = json.load(response).get("models", [])
+    except (OSError, ValueError):
+        return []
+    return [model.get("name") or model.get("model") for model in models]
@@ -0,0 +1,176 @@
+"""
+Tests for the ollama_pool module.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from mojentic.llm.gateways.models import LLMMessage
+
+from assessor.ollama_pool import OllamaEndpoint, OllamaHostPool, list_resident_models, \
+    model_tag
+
+
+class FakeOllamaServer:
+    """Local HTTP server answering the Ollama endpoints the pool uses."""
+
+    def __init__(self, name, loaded=()):
+        self.name = name
+        self.loaded = list(loaded)
+        self.chats = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/api/ps":
+                    self._reply({"models": [{"name": model, "model": model}
+                                            for model in server.loaded]})
+                else:
+                    self.send_error(404)
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                if self.path == "/api/chat":
+                    server.chats.append(request["model"])
+                    self._reply({
+                        "model": request["model"],
+                        "created_at": "2026-01-01T00:00:00Z",
+                        "message": {"role": "assistant", "content": f"response from {server.name}"},
+                        "done": True,
+                        "done_reason": "stop",
+                    })
+                else:
+                    self.send_error(404)
+
+            def _reply(self, body):
+                content = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_port}"
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class DescribeOllamaHostPool:
+    """Tests for the OllamaHostPool class."""
+
+    def should_send_a_request_to_a_host_with_the_model_loaded(self):
+        """It should prefer the host that already has the model loaded over an idle one."""
+        with FakeOllamaServer("gpu-1") as first, \
+                FakeOllamaServer("gpu-2", loaded=["qwen3:32b"]) as second:
+            pool = OllamaHostPool([OllamaEndpoint(first.url), OllamaEndpoint(second.url)])
+
+            result = pool.complete(model="qwen3:32b", messages=[LLMMessage(content="Hello")])
+
+        assert result.content == "response from gpu-2"
+        assert second.chats == ["qwen3:32b"]
+        assert first.chats == []
+
+    def should_only_use_hosts_serving_the_model(self, mocker):
+        """It should leave out hosts whose inventory lacks the model."""
+        pool = OllamaHostPool(
+            [OllamaEndpoint("http://gpu-1", models=("qwen2.5:72b",)),
+             OllamaEndpoint("http://gpu-2", models=("qwen3:32b",))],
+            gateway_factory=lambda url: mocker.Mock(), probe_resident=lambda url: [])
+
+        result = pool.acquire("qwen3:32b")
+
+        assert result.endpoint.url == "http://gpu-2"
+
+    def should_match_an_untagged_model_to_its_latest_tag(self, mocker):
+        """It should treat a model named without a tag as the ":latest" one the host lists."""
+        pool = OllamaHostPool(
+            [OllamaEndpoint("http://gpu-1"),
+             OllamaEndpoint("http://gpu-2", models=("qwen2.5-coder:latest",))],
+            gateway_factory=lambda url: mocker.Mock(),
+            probe_resident=lambda url: ["qwen2.5-coder:latest"] if url == "http://gpu-2" else [])
+
+        result = pool.acquire("qwen2.5-coder")
+
+        assert result.endpoint.url == "http://gpu-2"
+
+    def should_load_the_model_on_another_host_when_its_host_is_busy(self, mocker):
+        """It should spread requests to the least-loaded free host once the first is full."""
+        pool = OllamaHostPool(
+            [OllamaEndpoint("http://gpu-1"), OllamaEndpoint("http://gpu-2")],
+            gateway_factory=lambda url: mocker.Mock(), probe_resident=lambda url: [])
+
+        first = pool.acquire("qwen3:32b")
+        second = pool.acquire("qwen3:32b")
+
+        assert {first.endpoint.url, second.endpoint.url} == {"http://gpu-1", "http://gpu-2"}
+
+    def should_wait_while_every_host_is_at_capacity(self, mocker):
+        """It should hold a request back until a running one on a serving host finishes."""
+        pool = OllamaHostPool(
+            [OllamaEndpoint("http://gpu-1")],
+            gateway_factory=lambda url: mocker.Mock(), probe_resident=lambda url: [])
+        running = pool.acquire("qwen3:32b")
+        waiting = threading.Thread(target=pool.acquire, args=("qwen3:32b",))
+
+        waiting.start()
+        waiting.join(0.05)
+        blocked = waiting.is_alive()
+        pool.release(running)
+        waiting.join(1)
+
+        assert blocked
+        assert not waiting.is_alive()
+
+    def should_reject_a_model_no_host_serves(self, mocker):
+        """It should raise for a model missing from every host's inventory."""
+        pool = OllamaHostPool(
+            [OllamaEndpoint("http://gpu-1", models=("qwen2.5:72b",))],
+            gateway_factory=lambda url: mocker.Mock(), probe_resident=lambda url: [])
+
+        with pytest.raises(ValueError):
+            pool.acquire("qwen3:32b")
+
+
+class DescribeModelTag:
+    """Tests for the model_tag function."""
+
+    def should_add_the_latest_tag_to_an_untagged_model(self):
+        """It should name an untagged model, even one from a registry with a port, as latest."""
+        result = [model_tag(name) for name in (
+            "qwen2.5-coder", "qwen3:32b", "registry.local:5000/team/model")]
+
+        assert result == [
+            "qwen2.5-coder:latest", "qwen3:32b", "registry.local:5000/team/model:latest",
+        ]
+
+
+class DescribeListResidentModels:
+    """Tests for the list_resident_models function."""
+
+    def should_list_the_models_a_host_has_loaded(self):
+        """It should return the names reported by the host's /api/ps endpoint."""
+        with FakeOllamaServer("gpu-1", loaded=["qwen3:32b", "qwen2.5:72b"]) as server:
+            result = list_resident_models(server.url)
+
+        assert result == ["qwen3:32b", "qwen2.5:72b"]
+
+    def should_assume_nothing_is_loaded_on_an_unreachable_host(self):
+        """It should return an empty list when the host does not answer."""
+        with FakeOllamaServer("gpu-1") as server:
+            url = server.url
+
+        result = list_resident_models(url)
+
+        assert result == []
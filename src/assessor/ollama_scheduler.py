@@ -0,0 +1,78 @@
+"""
+Ollama scheduling utilities for the assessor module.
+
+Loading a large local model takes far longer than generating a short response with it, so the
+Ollama work of a run is grouped per model and at most as many models as fit in memory are active
+at once, instead of interleaving requests to different models.
+"""
+
+import asyncio
+from collections import defaultdict
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+
+async def run_model_major(
+    jobs: List[Tuple],
+    run_job: Callable[[Tuple], Awaitable],
+    resident_models: int,
+    preload: Optional[Callable[[str], None]] = None
+) -> List:
+    """
+    Run (file path, model name, ...) jobs grouped per model, in the order the models first appear.
+
+    A model's jobs start once one of the resident model slots is free, so with one slot each
+    model runs to completion before the next is loaded. With more slots, the next model is
+    loaded (and, if preload is given, warmed up) while the current one finishes its last jobs.
+
+    Args:
+        jobs: List of jobs whose second item is the model name
+        run_job: Coroutine function running a single job
+        resident_models: Number of models that fit in memory at once
+        preload: Optional blocking callable that loads a model before its first job
+
+    Returns:
+        list: The result of each job, in the same order as the jobs
+    """
+    resident = asyncio.Semaphore(resident_models)
+
+    async def run_model(model_name, model_jobs):
+        async with resident:
+            if preload is not None:
+                await asyncio.to_thread(preload, model_name)
+            return await asyncio.gather(*(run_job(job) for job in model_jobs))
+
+    # Group jobs per model, keeping the order in which the models first appear
+    groups = defaultdict(list)
+    for index, job in enumerate(jobs):
+        model_name = job[1]
+        groups[model_name].append((index, job))
+
+    group_results = await asyncio.gather(*(
+        run_model(model_name, [job for _, job in group]) for model_name, group in groups.items()
+    ))
+
+    # Put results back in the order the jobs were given
+    results = [None] * len(jobs)
+    for group, model_results in zip(groups.values(), group_results):
+        for (index, _), result in zip(group, model_results):
+            results[index] = result
+    return results
+
+def preload_ollama_model(gateway, model_name: str, keep_alive: str) -> None:
+    """
+    Load a model into Ollama's memory ahead of its first request.
+
+    An empty prompt makes Ollama load the model without generating anything; keep_alive keeps
+    it resident between the run's requests. A gateway spreading requests over several hosts
+    loads the model on the host its next request would go to.
+
+    Args:
+        gateway: Ollama gateway whose client sends the request, or an OllamaHostPool
+        model_name: Name of the model to load
+        keep_alive: How long Ollama keeps the model loaded after its last request (e.g. "10m")
+    """
+    preload = getattr(gateway, "preload", None)
+    if preload is not None:
+        preload(model_name, keep_alive)
+        return
+    gateway.client.generate(model=model_name, prompt="", keep_alive=keep_alive)
@@ -0,0 +1,46 @@
+"""
+Tests for the ollama_scheduler module.
+"""
+
+import asyncio
+
+from assessor.ollama_scheduler import run_model_major
+
+
+def _recording_job(events):
+    async def run_job(job):
+        file_path, model_name = job
+        events.append(model_name)
+        await asyncio.sleep(0)
+        return f"{file_path}-{model_name}"
+    return run_job
+
+
+class DescribeRunModelMajor:
+    """Tests for the run_model_major coroutine."""
+
+    def should_run_all_jobs_of_a_model_before_the_next_model(self):
+        """It should not interleave models when only one fits in memory."""
+        events = []
+        jobs = [("a", "qwen3:32b"), ("a", "qwen2.5:72b"), ("b", "qwen3:32b"), ("b", "qwen2.5:72b")]
+
+        asyncio.run(run_model_major(jobs, _recording_job(events), resident_models=1))
+
+        assert events == ["qwen3:32b", "qwen3:32b", "qwen2.5:72b", "qwen2.5:72b"]
+
+    def should_return_results_in_job_order(self):
+        """It should map each result back to its job even though jobs run grouped by model."""
+        jobs = [("a", "qwen3:32b"), ("a", "qwen2.5:72b"), ("b", "qwen3:32b")]
+
+        result = asyncio.run(run_model_major(jobs, _recording_job([]), resident_models=1))
+
+        assert result == ["a-qwen3:32b", "a-qwen2.5:72b", "b-qwen3:32b"]
+
+    def should_preload_each_model_once(self, mocker):
+        """It should load every model once, before its first job."""
+        preload = mocker.Mock()
+        jobs = [("a", "qwen3:32b"), ("b", "qwen3:32b"), ("a", "qwen2.5:72b")]
+
+        asyncio.run(run_model_major(jobs, _recording_job([]), 2, preload=preload))
+
+        assert [call.args for call in preload.call_args_list] == [("qwen3:32b",), ("qwen2.5:72b",)]
@@ -2,15 +2,28 @@
 Main processing logic for the assessor module.
 """
 
-from collections import defaultdict
-from typing import Optional
+import asyncio
+from pathlib import Path
+from typing import List, Optional
 
-from assessor.assessment import generate_assessment
+from assessor.assessment import ASSESSMENT_TEMPLATE_VERSION, CrossPromptComparison, \
+    build_assessment_message, file_hashes, generate_assessment, group_similar_outputs, \
+    plan_assessment_groups, write_cross_prompt_assessment
+from assessor.assessment_pipeline import AssessmentPipeline
+from assessor.batch import make_batch_request, run_batch
+from assessor.build_manifest import BuildManifest
 from assessor.config import default_config, Config
 from assessor.file_gateway import FileGateway
 from assessor.file_processor import get_prompt_files, create_output_file_path, \
-    create_assessment_file_path
-from assessor.llm_handler import process_with_model
+    create_assessment_file_path, output_model_name
+from assessor.folder_index import FolderIndex
+from assessor.llm_handler import GENERATION_PARAMS, process_with_model, stream_with_model
+from assessor.metrics import RunMetrics
+from assessor.ollama_scheduler import preload_ollama_model, run_model_major
+from assessor.rate_limiter import gateway_name
+from assessor.response_cache import ResponseCache
+from assessor.run_journal import RunJournal
+from assessor.utils import run_in_thread
 
 
 def process_folder(
@@ -19,14 +32,25 @@ def process_folder(
     use_ollama: bool = True, 
     prompt_pattern: str = None,
     config: Optional[Config] = None,
-    file_gateway: Optional[FileGateway] = None
+    file_gateway: Optional[FileGateway] = None,
+    cache: Optional[ResponseCache] = None,
+    manifest: Optional[BuildManifest] = None,
+    stream: bool = False,
+    batch_gateway=None,
+    comparison: Optional[CrossPromptComparison] = None,
+    index: Optional[FolderIndex] = None,
+    journal: Optional[RunJournal] = None,
+    metrics: Optional[RunMetrics] = None,
+    samples: int = 1
 ):
     """
     Process all files in the given folder:
     1. Read each file's contents
-    2. Send the contents to the LLM (both OpenAI and Ollama models if specified)
+    2. Send the contents to the LLM (both OpenAI and Ollama models if specified), running each
+       provider's requests concurrently, bounded by the configured concurrency
     3. Write the output to a new file with "-output" suffix
-    4. After all outputs are created, assess them using the assessment model
+    4. As soon as every model has processed a file, assess its outputs using the assessment
+       model while the remaining generations continue
     5. Write the assessment to a new file with "-assessment" suffix
 
     Args:
@@ -37,6 +61,74 @@ def process_folder(
                        Files are expected to follow the pattern "prompt-{style}.md"
         config: Optional Config instance (defaults to default_config)
         file_gateway: Optional FileGateway instance (defaults to a new instance)
+        cache: Optional ResponseCache used to skip regenerating unchanged outputs
+        manifest: Optional BuildManifest; when given, outputs and assessments whose inputs are
+                  unchanged since the last run are kept instead of regenerated
+        stream: Whether to write each response to its output file as it arrives
+        batch_gateway: Optional OpenAIBatchGateway or LocalBatchGateway; when given, OpenAI
+                       generations and the assessments are each submitted as one batch job
+        comparison: Optional CrossPromptComparison; when given, each model's cross-prompt
+                    assessment is written as soon as its outputs for every compared style exist,
+                    and recorded in comparison.assessment_files
+        index: Optional FolderIndex of the folder, shared with later phases; outputs written
+               by this run are added to it
+        journal: Optional RunJournal recording each output and assessment as it is written;
+                 files it already holds are not generated again
+        metrics: Optional RunMetrics collecting the timings and token counts of every
+                 generation and assessment request
+        samples: Number of replicate generations per prompt file and model; with more than
+                 one, outputs are named "-output-{model}-s{k}" and the assessments compare
+                 each model's replicates as a group
+
+    Returns:
+        dict: Dictionary mapping source files to their output files
+    """
+    return asyncio.run(aprocess_folder(
+        folder_path, use_openai, use_ollama, prompt_pattern, config, file_gateway, cache,
+        manifest, stream, batch_gateway, comparison, index, journal, metrics, samples))
+
+async def aprocess_folder(
+    folder_path: str,
+    use_openai: bool = True,
+    use_ollama: bool = True,
+    prompt_pattern: str = None,
+    config: Optional[Config] = None,
+    file_gateway: Optional[FileGateway] = None,
+    cache: Optional[ResponseCache] = None,
+    manifest: Optional[BuildManifest] = None,
+    stream: bool = False,
+    batch_gateway=None,
+    comparison: Optional[CrossPromptComparison] = None,
+    index: Optional[FolderIndex] = None,
+    journal: Optional[RunJournal] = None,
+    metrics: Optional[RunMetrics] = None,
+    samples: int = 1
+):
+    """
+    Process all files in the given folder without blocking the event loop.
+
+    See process_folder for the steps performed. Each provider's requests share a semaphore sized
+    by its configured concurrency, and assessments share one sized by the assessment concurrency.
+
+    Args:
+        folder_path: Path to the folder containing files to process
+        use_openai: Whether to use OpenAI models
+        use_ollama: Whether to use Ollama models
+        prompt_pattern: Optional comma-separated list of style names to filter prompt files
+        config: Optional Config instance (defaults to default_config)
+        file_gateway: Optional FileGateway instance (defaults to a new instance)
+        cache: Optional ResponseCache used to skip regenerating unchanged outputs
+        manifest: Optional BuildManifest used to skip outputs and assessments whose inputs
+                  are unchanged
+        stream: Whether to write each response to its output file as it arrives
+        batch_gateway: Optional batch gateway used to submit OpenAI generations and the
+                       assessments as batch jobs
+        comparison: Optional CrossPromptComparison whose cross-prompt assessments are written
+                    as soon as each model's outputs are complete
+        index: Optional FolderIndex of the folder, updated with the outputs written
+        journal: Optional RunJournal used to record and skip completed outputs and assessments
+        metrics: Optional RunMetrics collecting the timings and token counts of every request
+        samples: Number of replicate generations per prompt file and model
 
     Returns:
         dict: Dictionary mapping source files to their output files
@@ -48,68 +140,462 @@ def process_folder(
     file_gateway = file_gateway or FileGateway()
 
     # Get prompt files to process
-    prompt_files = get_prompt_files(folder_path, prompt_pattern)
+    prompt_files = get_prompt_files(folder_path, prompt_pattern, file_gateway, index)
+
+    # Replicates of a multi-sample run are separate jobs, so they run concurrently
+    sample_numbers = [None] if samples == 1 else list(range(1, samples + 1))
+    openai_jobs = [
+        (file_path, model_name, sample)
+        for model_name in (config.openai_models if use_openai else [])
+        for file_path in prompt_files
+        for sample in sample_numbers
+    ]
+    ollama_jobs = [
+        (file_path, model_name, sample)
+        for model_name in (config.ollama_models if use_ollama else [])
+        for file_path in prompt_files
+        for sample in sample_numbers
+    ]
+
+    # Assessments start as soon as the outputs they depend on are complete
+    assessment_semaphore = asyncio.Semaphore(config.assessment_concurrency)
 
-    # Dictionary to store output files for each source document
-    output_files = defaultdict(list)
+    async def assess_source(source_file, outputs):
+        await run_in_thread(
+            write_assessment,
+            source_file,
+            outputs,
+            config,
+            file_gateway,
+            manifest,
+            journal,
+            metrics,
+            # The groups of an oversized assessment run one by one in this slot
+            group_concurrency=1,
+            semaphore=assessment_semaphore
+        )
 
-    # Process OpenAI models if specified
-    if use_openai:
-        # Get OpenAI gateway
-        openai_gateway = config.get_openai_gateway()
+    async def assess_model(model_name, style_outputs):
+        name = output_model_name(model_name)
+        comparison.assessment_files[name] = await run_in_thread(
+            write_cross_prompt_assessment,
+            Path(folder_path),
+            name,
+            comparison.prompt_styles,
+            style_outputs,
+            config,
+            file_gateway,
+            manifest,
+            journal=journal,
+            metrics=metrics,
+            semaphore=assessment_semaphore
+        )
+        print(f"Created cross-prompt assessment for {name}")
 
-        for model_name in config.openai_models:
-            for file_path in prompt_files:
-                # Process the file with the model
-                response = process_with_model(file_path, model_name, openai_gateway, file_gateway)
+    pipeline = AssessmentPipeline(
+        openai_jobs + ollama_jobs,
+        # Batched assessments are submitted together once every output exists
+        on_source_complete=assess_source if batch_gateway is None else None,
+        on_model_complete=assess_model if comparison is not None else None,
+        compare_styles=comparison.prompt_styles if comparison is not None else None
+    )
 
-                # Create the output file path
-                output_file_path = create_output_file_path(file_path, model_name)
+    def output_ready(job, output_file_path):
+        if index is not None and output_file_path is not None:
+            index.add(output_file_path)
+        pipeline.output_ready(job, output_file_path)
 
-                # Write the response to the output file
-                file_gateway.write_file(output_file_path, response)
+    def generate(gateway, semaphore):
+        async def run_job(job):
+            file_path, model_name, sample = job
+            output_file_path = await run_in_thread(
+                generate_output,
+                file_path,
+                model_name,
+                gateway,
+                file_gateway,
+                cache,
+                manifest,
+                stream,
+                journal,
+                metrics,
+                sample,
+                semaphore=semaphore
+            )
+            output_ready(job, output_file_path)
+            return output_file_path
+        return run_job
 
-                # Store the output file path for later assessment
-                output_files[file_path].append(output_file_path)
+    async def generate_in_batch():
+        output_paths = await run_in_thread(
+            _generate_outputs_in_batch,
+            openai_jobs,
+            config,
+            file_gateway,
+            batch_gateway,
+            manifest,
+            journal
+        )
+        for job, output_file_path in zip(openai_jobs, output_paths):
+            output_ready(job, output_file_path)
 
-                print(f"Processed {file_path.name} -> {output_file_path.name}")
+    # Each provider gets its own gateway and concurrency limit
+    if not openai_jobs:
+        openai_generation = _no_outputs()
+    elif batch_gateway is not None:
+        # OpenAI generations go out as one batch job instead of individual requests
+        openai_generation = generate_in_batch()
+    else:
+        run_openai_job = generate(
+            config.get_openai_gateway(), asyncio.Semaphore(config.openai_concurrency))
+        openai_generation = asyncio.gather(*(run_openai_job(job) for job in openai_jobs))
 
-    # Process Ollama models if specified
-    if use_ollama:
-        # Get Ollama gateway
+    # Ollama work is grouped per model so large models are not swapped in and out of memory
+    if not ollama_jobs:
+        ollama_generation = _no_outputs()
+    else:
         ollama_gateway = config.get_ollama_gateway()
+        ollama_generation = run_model_major(
+            ollama_jobs,
+            generate(ollama_gateway, asyncio.Semaphore(config.get_ollama_concurrency())),
+            config.get_ollama_resident_models(),
+            preload=_ollama_preloader(ollama_gateway, config)
+        )
+
+    await asyncio.gather(openai_generation, ollama_generation)
+
+    # Outputs are listed in submission order, so the mapping is the same as a sequential run
+    output_files = pipeline.output_files()
+
+    if batch_gateway is not None:
+        await asyncio.gather(pipeline.wait(), run_in_thread(
+            _write_assessments_in_batch,
+            output_files,
+            config,
+            file_gateway,
+            batch_gateway,
+            manifest,
+            journal,
+            metrics
+        ))
+    else:
+        await pipeline.wait()
+
+    # Every output and assessment of the phase is on disk before the manifest vouches for it
+    await run_in_thread(file_gateway.flush)
+
+    if manifest is not None:
+        manifest.save()
+
+    return output_files
+
+async def _no_outputs():
+    return []
+
+def _ollama_preloader(gateway, config: Config):
+    """
+    Get the function that loads the next Ollama model while the current one finishes.
+
+    Args:
+        gateway: The Ollama gateway
+        config: Config instance
+
+    Returns:
+        Optional callable taking a model name, or None when preloading is disabled
+    """
+    if not config.ollama_preload:
+        return None
+    return lambda model_name: preload_ollama_model(gateway, model_name, config.ollama_keep_alive)
+
+def generate_output(
+    file_path: Path,
+    model_name: str,
+    gateway,
+    file_gateway: FileGateway,
+    cache: Optional[ResponseCache],
+    manifest: Optional[BuildManifest],
+    stream: bool = False,
+    journal: Optional[RunJournal] = None,
+    metrics: Optional[RunMetrics] = None,
+    sample: Optional[int] = None
+) -> Path:
+    """
+    Process a prompt file with a model and write the response to its output file.
+
+    Args:
+        file_path: Path to the prompt file
+        model_name: Name of the model to use
+        gateway: LLM gateway (OpenAI or Ollama)
+        file_gateway: FileGateway instance used to write the output
+        cache: Optional ResponseCache consulted before calling the model
+        manifest: Optional BuildManifest used to skip an output whose inputs are unchanged
+        stream: Whether to write the response to the output file as it arrives
+        journal: Optional RunJournal used to skip an output completed earlier in the run
+        metrics: Optional RunMetrics the request's timings and token counts are added to
+        sample: Optional replicate number of a multi-sample run
+
+    Returns:
+        Path: The output file path
+    """
+    # Create the output file path
+    output_file_path = create_output_file_path(file_path, model_name, sample)
+
+    # Keep an output finished before an interrupted run stopped
+    if journal is not None and journal.is_complete(output_file_path):
+        print(f"Already completed {output_file_path.name}")
+        return output_file_path
 
-        for model_name in config.ollama_models:
-            for file_path in prompt_files:
-                # Process the file with the model
-                response = process_with_model(file_path, model_name, ollama_gateway, file_gateway)
+    # Keep the existing output if the prompt, model and parameters are unchanged
+    if manifest is not None:
+        fingerprint = _output_fingerprint(file_path, model_name, gateway, file_gateway)
+        if manifest.is_current(output_file_path, fingerprint):
+            print(f"Up to date {output_file_path.name}")
+            return output_file_path
 
-                # Create the output file path
-                output_file_path = create_output_file_path(file_path, model_name)
+    if stream:
+        # Process the file with the model, writing the response as it arrives
+        stream_with_model(
+            file_path, model_name, gateway, output_file_path, file_gateway, cache, metrics,
+            sample)
+        response = file_gateway.read_file(output_file_path) if journal is not None else None
+    else:
+        # Process the file with the model
+        response = process_with_model(
+            file_path, model_name, gateway, file_gateway, cache, metrics, sample)
 
-                # Write the response to the output file
-                file_gateway.write_file(output_file_path, response)
+        # Write the response to the output file
+        file_gateway.write_file(output_file_path, response)
 
-                # Store the output file path for later assessment
-                output_files[file_path].append(output_file_path)
+    if manifest is not None:
+        manifest.record(output_file_path, fingerprint)
+    if journal is not None:
+        journal.record(output_file_path, response)
 
-                print(f"Processed {file_path.name} -> {output_file_path.name}")
+    print(f"Processed {file_path.name} -> {output_file_path.name}")
 
-    # Generate assessments for each source file
+    return output_file_path
+
+def write_assessment(
+    source_file: Path,
+    outputs: List[Path],
+    config: Config,
+    file_gateway: FileGateway,
+    manifest: Optional[BuildManifest],
+    journal: Optional[RunJournal] = None,
+    metrics: Optional[RunMetrics] = None,
+    group_concurrency: Optional[int] = None
+) -> Optional[Path]:
+    """
+    Generate the assessment for a source file's outputs and write it to its assessment file.
+
+    Args:
+        source_file: Path to the prompt file
+        outputs: Output files generated from the prompt file
+        config: Config instance
+        file_gateway: FileGateway instance used to write the assessment
+        manifest: Optional BuildManifest used to skip an assessment whose inputs are unchanged
+        journal: Optional RunJournal used to skip an assessment completed earlier in the run
+        metrics: Optional RunMetrics the requests' timings and token counts are added to
+        group_concurrency: Optional number of groups of an oversized assessment assessed at
+                           once (defaults to config.assessment_concurrency)
+
+    Returns:
+        Optional[Path]: The assessment file path, or None if no assessment was produced
+    """
+    # Create assessment file path
+    assessment_file_path = create_assessment_file_path(source_file)
+
+    # Keep an assessment finished before an interrupted run stopped
+    if journal is not None and journal.is_complete(assessment_file_path):
+        print(f"Already completed {assessment_file_path.name}")
+        return assessment_file_path
+
+    # Keep the existing assessment if the source, its outputs and the assessor are unchanged
+    if manifest is not None:
+        fingerprint = _assessment_fingerprint(source_file, outputs, config, file_gateway)
+        if manifest.is_current(assessment_file_path, fingerprint):
+            print(f"Up to date {assessment_file_path.name}")
+            return assessment_file_path
+
+    # Generate assessment
+    assessment = generate_assessment(
+        source_file, outputs, config, file_gateway, metrics, group_concurrency=group_concurrency)
+
+    if not assessment:
+        return None
+
+    # Write the assessment to a file
+    file_gateway.write_file(assessment_file_path, assessment)
+
+    if manifest is not None:
+        manifest.record(assessment_file_path, fingerprint)
+    if journal is not None:
+        journal.record(assessment_file_path, assessment)
+
+    print(f"Created assessment for {source_file.name} -> {assessment_file_path.name}")
+
+    return assessment_file_path
+
+def _generate_outputs_in_batch(
+    jobs,
+    config: Config,
+    file_gateway: FileGateway,
+    batch_gateway,
+    manifest: Optional[BuildManifest],
+    journal: Optional[RunJournal] = None
+) -> List[Optional[Path]]:
+    """
+    Submit OpenAI generations as a single batch job and write each response to its output file.
+
+    Args:
+        jobs: List of (prompt file, model name, sample) jobs
+        config: Config instance
+        file_gateway: FileGateway instance used to read prompts and write outputs
+        batch_gateway: Batch gateway the job is submitted to
+        manifest: Optional BuildManifest used to leave out outputs whose inputs are unchanged
+        journal: Optional RunJournal used to leave out outputs completed earlier in the run
+
+    Returns:
+        list: The output file path for each job, or None where the batch returned no response
+    """
+    if not jobs:
+        return []
+
+    gateway = config.get_openai_gateway()
+    output_paths = [
+        create_output_file_path(file_path, model_name, sample)
+        for file_path, model_name, sample in jobs
+    ]
+
+    # Only outputs that are out of date are submitted; the output file name identifies each request
+    fingerprints = {}
+    requests = []
+    for (file_path, model_name, _), output_file_path in zip(jobs, output_paths):
+        if journal is not None and journal.is_complete(output_file_path):
+            continue
+        if manifest is not None:
+            fingerprint = _output_fingerprint(file_path, model_name, gateway, file_gateway)
+            if manifest.is_current(output_file_path, fingerprint):
+                continue
+            fingerprints[output_file_path] = fingerprint
+        requests.append(make_batch_request(
+            output_file_path.name,
+            model_name,
+            file_gateway.read_file(file_path),
+            GENERATION_PARAMS["max_tokens"]
+        ))
+
+    responses = run_batch(requests, batch_gateway, config.batch_poll_seconds)
+
+    submitted = {request["custom_id"] for request in requests}
+    results = []
+    for (file_path, _, _), output_file_path in zip(jobs, output_paths):
+        if output_file_path.name not in submitted:
+            results.append(output_file_path)
+        elif output_file_path.name in responses:
+            file_gateway.write_file(output_file_path, responses[output_file_path.name])
+            if manifest is not None:
+                manifest.record(output_file_path, fingerprints[output_file_path])
+            if journal is not None:
+                journal.record(output_file_path, responses[output_file_path.name])
+            print(f"Processed {file_path.name} -> {output_file_path.name}")
+            results.append(output_file_path)
+        else:
+            print(f"No batch response for {output_file_path.name}")
+            results.append(None)
+
+    return results
+
+def _write_assessments_in_batch(
+    output_files,
+    config: Config,
+    file_gateway: FileGateway,
+    batch_gateway,
+    manifest: Optional[BuildManifest],
+    journal: Optional[RunJournal] = None,
+    metrics: Optional[RunMetrics] = None
+):
+    """
+    Submit every source file's assessment as a single batch job and write the results.
+
+    Assessments too large for one request under the token budget are generated group by group
+    after the batch instead.
+
+    Args:
+        output_files: Dictionary mapping source files to their output files
+        config: Config instance
+        file_gateway: FileGateway instance used to read the files and write the assessments
+        batch_gateway: Batch gateway the job is submitted to
+        manifest: Optional BuildManifest used to leave out assessments whose inputs are unchanged
+        journal: Optional RunJournal used to leave out assessments completed earlier in the run
+        metrics: Optional RunMetrics collecting the requests of assessments too large to batch
+    """
+    fingerprints = {}
+    requests = []
+    oversized = {}
     for source_file, outputs in output_files.items():
-        if not outputs:
+        assessment_file_path = create_assessment_file_path(source_file)
+        if journal is not None and journal.is_complete(assessment_file_path):
+            continue
+        if manifest is not None:
+            fingerprint = _assessment_fingerprint(source_file, outputs, config, file_gateway)
+            if manifest.is_current(assessment_file_path, fingerprint):
+                continue
+            fingerprints[assessment_file_path] = fingerprint
+        similar_outputs = group_similar_outputs(outputs, config, file_gateway)
+        representatives = list(similar_outputs)
+        groups = plan_assessment_groups(
+            source_file, representatives, config, file_gateway, similar_outputs)
+        if len(groups) > 1:
+            oversized[source_file] = outputs
             continue
+        requests.append(make_batch_request(
+            assessment_file_path.name,
+            config.assessment_model,
+            build_assessment_message(
+                source_file, representatives, file_gateway, similar_outputs).content,
+            GENERATION_PARAMS["max_tokens"]
+        ))
 
-        # Generate assessment
-        assessment = generate_assessment(source_file, outputs, config, file_gateway)
+    responses = run_batch(requests, batch_gateway, config.batch_poll_seconds)
 
-        if assessment:
-            # Create assessment file path
-            assessment_file_path = create_assessment_file_path(source_file)
+    for source_file in output_files:
+        assessment_file_path = create_assessment_file_path(source_file)
+        assessment = responses.get(assessment_file_path.name)
+        if not assessment:
+            continue
 
-            # Write the assessment to a file
-            file_gateway.write_file(assessment_file_path, assessment)
+        file_gateway.write_file(assessment_file_path, assessment)
+        if manifest is not None:
+            manifest.record(assessment_file_path, fingerprints[assessment_file_path])
+        if journal is not None:
+            journal.record(assessment_file_path, assessment)
 
-            print(f"Created assessment for {source_file.name} -> {assessment_file_path.name}")
+        print(f"Created assessment for {source_file.name} -> {assessment_file_path.name}")
 
-    return output_files
+    for source_file, outputs in oversized.items():
+        write_assessment(source_file, outputs, config, file_gateway, manifest, journal, metrics)
+
+def _output_fingerprint(file_path: Path, model_name: str, gateway, file_gateway: FileGateway):
+    """Fingerprint the inputs an output is generated from, for the build manifest."""
+    return BuildManifest.fingerprint(
+        prompt=file_hashes([file_path], file_gateway),
+        model=model_name,
+        gateway=gateway_name(gateway),
+        params=GENERATION_PARAMS
+    )
+
+def _assessment_fingerprint(
+    source_file: Path,
+    outputs: List[Path],
+    config: Config,
+    file_gateway: FileGateway
+):
+    """Fingerprint the inputs a per-source assessment is generated from, for the build manifest."""
+    return BuildManifest.fingerprint(
+        source=file_hashes([source_file], file_gateway),
+        outputs=file_hashes(outputs, file_gateway),
+        model=config.assessment_model,
+        similarity=config.similarity_threshold,
+        template=ASSESSMENT_TEMPLATE_VERSION
+    )
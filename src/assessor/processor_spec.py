@@ -2,11 +2,13 @@
 Tests for the processor module.
 """
 
+import asyncio
+import time
 from pathlib import Path
 
 from assessor.config import Config
 from assessor.file_gateway import FileGateway
-from assessor.processor import process_folder
+from assessor.processor import aprocess_folder, process_folder
 
 
 class DescribeProcessFolder:
@@ -18,6 +20,8 @@ class DescribeProcessFolder:
         # Mock dependencies
         mock_config = mocker.Mock(spec=Config)
         mock_config.openai_models = ["test-model"]
+        mock_config.openai_concurrency = 1
+        mock_config.assessment_concurrency = 1
         mock_config.get_openai_gateway.return_value = "openai-gateway"
 
         mock_file_gateway = mocker.Mock(spec=FileGateway)
@@ -53,21 +57,24 @@ class DescribeProcessFolder:
 
         # Assert
         # Verify that get_prompt_files was called with the correct arguments
-        mock_get_prompt_files.assert_called_once_with("test_folder", None, mock_file_gateway)
+        mock_get_prompt_files.assert_called_once_with("test_folder", None, mock_file_gateway, None)
 
         # Verify that process_with_model was called with the correct arguments
         mock_process_with_model.assert_called_once_with(
             Path("test_file.md"), 
             "test-model", 
             "openai-gateway", 
-            mock_file_gateway
+            mock_file_gateway,
+            None,
+            None,
+            None
         )
 
         # Verify that create_output_file_path was called with the correct arguments
-        mock_create_output_file_path.assert_called_once_with(Path("test_file.md"), "test-model")
+        mock_create_output_file_path.assert_called_once_with(Path("test_file.md"), "test-model", None)
 
         # Verify that file_gateway.write_file was called with the correct arguments
-        mock_file_gateway.write_file.assert_called_with(
+        mock_file_gateway.write_file.assert_any_call(
             Path("test_file-output-test-model.md"), 
             "test response"
         )
@@ -77,7 +84,9 @@ class DescribeProcessFolder:
             Path("test_file.md"), 
             [Path("test_file-output-test-model.md")],
             mock_config,
-            mock_file_gateway
+            mock_file_gateway,
+            None,
+            group_concurrency=1
         )
 
         # Verify that create_assessment_file_path was called with the correct arguments
@@ -93,3 +102,98 @@ class DescribeProcessFolder:
         assert len(result) == 1
         assert Path("test_file.md") in result
         assert result[Path("test_file.md")] == [Path("test_file-output-test-model.md")]
+
+    def should_keep_output_order_deterministic_when_running_concurrently(self, mocker):
+        """It should list outputs in model order even when later models finish first."""
+        # Arrange
+        mock_config = mocker.Mock(spec=Config)
+        mock_config.openai_models = ["slow-model", "fast-model"]
+        mock_config.openai_concurrency = 2
+        mock_config.assessment_concurrency = 1
+        mock_config.get_openai_gateway.return_value = "openai-gateway"
+
+        mock_file_gateway = mocker.Mock(spec=FileGateway)
+
+        mocker.patch("assessor.processor.get_prompt_files", return_value=[Path("test_file.md")])
+        mocker.patch("assessor.processor.generate_assessment", return_value=None)
+
+        def respond_slowly_for_slow_model(
+                file_path, model_name, gateway, file_gateway, cache, metrics, sample):
+            if model_name == "slow-model":
+                time.sleep(0.05)
+            return f"{model_name} response"
+
+        mocker.patch(
+            "assessor.processor.process_with_model", side_effect=respond_slowly_for_slow_model)
+
+        # Act
+        result = process_folder(
+            folder_path="test_folder",
+            use_openai=True,
+            use_ollama=False,
+            config=mock_config,
+            file_gateway=mock_file_gateway
+        )
+
+        # Assert
+        assert result[Path("test_file.md")] == [
+            Path("test_file-output-slow-model.md"),
+            Path("test_file-output-fast-model.md"),
+        ]
+
+
+class DescribeAprocessFolder:
+    """Tests for the aprocess_folder coroutine."""
+
+    def should_process_files_from_a_running_event_loop(self, mocker):
+        """It should produce the same mapping as process_folder when awaited."""
+        mock_config = mocker.Mock(spec=Config)
+        mock_config.ollama_models = ["test-model"]
+        mock_config.get_ollama_concurrency.return_value = 1
+        mock_config.get_ollama_resident_models.return_value = 1
+        mock_config.ollama_preload = False
+        mock_config.assessment_concurrency = 1
+        mock_config.get_ollama_gateway.return_value = "ollama-gateway"
+        mocker.patch("assessor.processor.get_prompt_files", return_value=[Path("test_file.md")])
+        mocker.patch("assessor.processor.process_with_model", return_value="test response")
+        mocker.patch("assessor.processor.generate_assessment", return_value=None)
+
+        result = asyncio.run(aprocess_folder(
+            folder_path="test_folder",
+            use_openai=False,
+            use_ollama=True,
+            config=mock_config,
+            file_gateway=mocker.Mock(spec=FileGateway)
+        ))
+
+        assert result == {Path("test_file.md"): [Path("test_file-output-test-model.md")]}
+
+    def should_keep_oversized_assessments_within_the_assessment_concurrency(self, tmp_path, mocker):
+        """It should send no more assessment requests at once than assessment_concurrency."""
+        for style in ("plain", "fancy", "terse"):
+            (tmp_path / f"prompt-{style}.md").write_text(f"Write a {style} haiku")
+        config = Config(
+            openai_models=["model-a", "model-b", "model-c"], assessment_concurrency=2,
+            assessment_token_budget=600, similarity_threshold=None, max_pending_writes=0)
+        config.get_openai_gateway = mocker.Mock()
+        mocker.patch(
+            "assessor.processor.process_with_model",
+            side_effect=lambda file_path, model_name, *args: f"{model_name} says " * 200)
+        running = []
+        peak = []
+
+        def generate(messages, **kwargs):
+            running.append(1)
+            peak.append(len(running))
+            time.sleep(0.02)
+            running.pop()
+            return "assessment"
+
+        mocker.patch("assessor.assessment.get_assessment_llm").return_value.generate = generate
+
+        asyncio.run(aprocess_folder(
+            folder_path=str(tmp_path), use_openai=True, use_ollama=False, config=config,
+            file_gateway=FileGateway()))
+
+        assert len(peak) == 12
+        assert max(peak) <= 2
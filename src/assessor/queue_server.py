@@ -0,0 +1,193 @@
+"""
+Job queue server module for the assessor package.
+
+This module lets workers on other machines run a sweep's jobs. The coordinator keeps the SQLite
+queue on its own local filesystem and serves the queue operations a worker needs over HTTP;
+a RemoteJobQueue on each remote worker sends its leases, heartbeats and results there. Only
+the coordinator's process touches the queue file, so the queue never relies on file locks of a
+network filesystem. The workers still read the prompt files and write their outputs in the
+folder, which they reach through a shared folder.
+"""
+
+import hmac
+import json
+import sqlite3
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+from assessor.job_queue import Job, JobQueue
+
+# Seconds a remote worker waits for the coordinator to answer a queue request
+REMOTE_QUEUE_TIMEOUT = 30.0
+
+
+class JobQueueServer:
+    """
+    HTTP server giving workers on other machines the queue operations of a JobQueue.
+
+    Requests carry the shared token, if one is set, as a bearer token. The server has no other
+    protection, so run it on a trusted network.
+    """
+
+    # The JobQueue methods a worker calls, by request path
+    OPERATIONS = ("lease", "heartbeat", "complete", "fail")
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        port: int,
+        host: str = "",
+        token: Optional[str] = None
+    ):
+        """
+        Initialize the server and start listening.
+
+        Args:
+            queue: The JobQueue to serve
+            port: Port to listen on (0 picks a free one)
+            host: Address to listen on (defaults to every interface)
+            token: Optional secret every request must carry
+        """
+        self.queue = queue
+        self.token = token
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="queue-server", daemon=True)
+
+    @property
+    def port(self) -> int:
+        """The port the server listens on."""
+        return self._server.server_address[1]
+
+    def start(self) -> "JobQueueServer":
+        """Serve requests on a background thread."""
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        """Stop serving requests and release the port."""
+        if self._thread.is_alive():
+            self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "JobQueueServer":
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def call(self, operation: str, arguments: Dict[str, Any]) -> Any:
+        """
+        Run a queue operation with the arguments of a request.
+
+        Args:
+            operation: Name of the JobQueue method
+            arguments: Its keyword arguments, with a job given as a dictionary of its fields
+
+        Returns:
+            The method's result, with a job given as a dictionary of its fields
+        """
+        if "job" in arguments:
+            arguments = {**arguments, "job": Job(**arguments["job"])}
+        result = getattr(self.queue, operation)(**arguments)
+        return result._asdict() if isinstance(result, Job) else result
+
+    def _handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                operation = self.path.strip("/")
+                if operation not in server.OPERATIONS:
+                    self._reply(404, {"error": f"Unknown queue operation {operation}"})
+                    return
+                if server.token is not None and not hmac.compare_digest(
+                        self.headers.get("Authorization", ""), f"Bearer {server.token}"):
+                    self._reply(401, {"error": "Missing or wrong queue token"})
+                    return
+                try:
+                    arguments = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                    result = server.call(operation, arguments)
+                except sqlite3.Error as error:
+                    # A busy queue file; the worker tries again
+                    self._reply(503, {"error": str(error)})
+                except (TypeError, ValueError, KeyError) as error:
+                    self._reply(400, {"error": str(error)})
+                else:
+                    self._reply(200, {"result": result})
+
+            def _reply(self, status: int, body: Dict[str, Any]):
+                content = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+class RemoteJobQueue:
+    """
+    The worker's side of a JobQueue served by a JobQueueServer on another machine.
+
+    A request the coordinator refuses or cannot be reached for raises an OSError, which the
+    worker treats like a busy local queue and retries.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        token: Optional[str] = None,
+        timeout: float = REMOTE_QUEUE_TIMEOUT
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            url: URL of the coordinator's queue server, e.g. "http://coordinator:8765"
+            token: Optional secret the server requires
+            timeout: Seconds to wait for each answer
+        """
+        self.url = url.rstrip("/")
+        self.token = token
+        self.timeout = timeout
+
+    def lease(
+        self,
+        worker: str,
+        lease_seconds: float,
+        kinds: Optional[List[str]] = None
+    ) -> Optional[Job]:
+        """Claim the next job; see JobQueue.lease."""
+        job = self._call("lease", worker=worker, lease_seconds=lease_seconds, kinds=kinds)
+        return Job(**job) if job is not None else None
+
+    def heartbeat(self, job: Job, worker: str, lease_seconds: float) -> bool:
+        """Extend the lease of a job; see JobQueue.heartbeat."""
+        return self._call(
+            "heartbeat", job=job._asdict(), worker=worker, lease_seconds=lease_seconds)
+
+    def complete(self, job: Job, worker: str, result: Any) -> bool:
+        """Record the result of a finished job; see JobQueue.complete."""
+        return self._call("complete", job=job._asdict(), worker=worker, result=result)
+
+    def fail(self, job: Job, worker: str, error: str) -> None:
+        """Record a failed attempt; see JobQueue.fail."""
+        self._call("fail", job=job._asdict(), worker=worker, error=error)
+
+    def _call(self, operation: str, **arguments) -> Any:
+        headers = {"Content-Type": "application/json"}
+        if self.token is not None:
+            headers["Authorization"] = f"Bearer {self.token}"
+        request = urllib.request.Request(
+            f"{self.url}/{operation}", data=json.dumps(arguments).encode(), headers=headers,
+            method="POST")
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.load(response)["result"]
@@ -0,0 +1,49 @@
+"""
+Tests for the queue_server module.
+"""
+
+import pytest
+
+from assessor.job_queue import DONE, PENDING, JobQueue
+from assessor.queue_server import JobQueueServer, RemoteJobQueue
+
+
+class DescribeRemoteJobQueue:
+    """Tests for the RemoteJobQueue class."""
+
+    def should_run_a_job_leased_from_a_served_queue(self, tmp_path):
+        """It should lease, keep and complete a job through the coordinator's server."""
+        queue = JobQueue(tmp_path)
+        queue.enqueue("generate", {"prompt": "prompt-plain.md"}, "generate:a")
+        with JobQueueServer(queue, 0, host="127.0.0.1", token="secret") as server:
+            remote = RemoteJobQueue(f"http://127.0.0.1:{server.port}", token="secret")
+
+            job = remote.lease("worker-1", 60)
+            held = remote.heartbeat(job, "worker-1", 60)
+            completed = remote.complete(job, "worker-1", {"output": "prompt-plain-output.md"})
+
+        assert job.payload == {"prompt": "prompt-plain.md"}
+        assert held is True
+        assert completed is True
+        assert queue.counts()[DONE] == 1
+
+    def should_report_an_empty_queue(self, tmp_path):
+        """It should return no job when the served queue has nothing to do."""
+        with JobQueueServer(JobQueue(tmp_path), 0, host="127.0.0.1") as server:
+            remote = RemoteJobQueue(f"http://127.0.0.1:{server.port}")
+
+            result = remote.lease("worker-1", 60)
+
+        assert result is None
+
+    def should_be_refused_without_the_queue_token(self, tmp_path):
+        """It should raise an OSError, which workers retry, when the server refuses it."""
+        queue = JobQueue(tmp_path)
+        queue.enqueue("generate", {}, "generate:a")
+        with JobQueueServer(queue, 0, host="127.0.0.1", token="secret") as server:
+            remote = RemoteJobQueue(f"http://127.0.0.1:{server.port}", token="guess")
+
+            with pytest.raises(OSError):
+                remote.lease("worker-1", 60)
+
+        assert queue.counts()[PENDING] == 1
@@ -0,0 +1,338 @@
+"""
+Rate limiter module for the assessor package.
+
+This module paces the requests sent to each provider with token buckets for requests per minute
+and tokens per minute, slows down when the provider reports a rate limit, and retries transient
+failures with jittered exponential backoff, so concurrent runs stay at the provider's ceiling
+instead of aborting on the first 429.
+"""
+
+import random
+import threading
+import time
+from typing import Any, Callable, Iterator, Optional
+
+from assessor.metrics import current_call
+from assessor.token_budget import estimate_tokens
+
+# HTTP statuses worth retrying; 429 additionally slows the provider's request rate
+RATE_LIMIT_STATUS = 429
+TRANSIENT_STATUSES = {408, 409, 500, 502, 503, 504}
+
+# Connection and timeout errors of the provider SDKs and their HTTP client, matched by name so
+# the limiter does not import either SDK
+TRANSIENT_ERROR_NAMES = {
+    "APIConnectionError", "APITimeoutError", "ConnectError", "ConnectTimeout", "ReadTimeout",
+    "RemoteProtocolError",
+}
+
+# Lowest fraction of the configured rates the adaptive backoff slows a provider down to
+MIN_RATE_FACTOR = 0.1
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at a per-minute rate."""
+
+    def __init__(
+        self,
+        per_minute: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Initialize the bucket, full.
+
+        Args:
+            per_minute: Amount added to the bucket per minute, which is also its capacity
+            clock: Function returning the current time in seconds
+            sleep: Function used to wait for the bucket to refill
+        """
+        self.per_minute = per_minute
+        self.rate_factor = 1.0
+        self._clock = clock
+        self._sleep = sleep
+        self._level = float(per_minute)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: float = 1) -> None:
+        """
+        Take an amount from the bucket, waiting until enough has refilled.
+
+        An amount larger than the capacity is granted once the bucket is full.
+
+        Args:
+            amount: Amount to take
+        """
+        amount = min(amount, self.per_minute)
+        while True:
+            with self._lock:
+                self._refill()
+                if self._level >= amount:
+                    self._level -= amount
+                    return
+                wait = (amount - self._level) / self._rate_per_second()
+            self._sleep(wait)
+
+    def debit(self, amount: float) -> None:
+        """
+        Take an amount from the bucket without waiting, e.g. tokens only known after a response.
+
+        The bucket may go into debt, which later acquisitions wait to pay off.
+
+        Args:
+            amount: Amount to take
+        """
+        with self._lock:
+            self._refill()
+            self._level -= amount
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._level = min(
+            self.per_minute, self._level + (now - self._updated) * self._rate_per_second())
+        self._updated = now
+
+    def _rate_per_second(self) -> float:
+        return self.per_minute * self.rate_factor / 60
+
+
+class RateLimiter:
+    """Paces and retries the requests of one provider, shared by all of its concurrent calls."""
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_retries: int = 5,
+        retry_base_seconds: float = 1.0,
+        retry_max_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        jitter: Callable[[], float] = random.random
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            requests_per_minute: Request rate to stay under, or None for no request limit
+            tokens_per_minute: Token rate to stay under, or None for no token limit
+            max_retries: Number of times a failed request is retried
+            retry_base_seconds: Backoff before the first retry, doubled for every further one
+            retry_max_seconds: Upper bound on a single backoff
+            clock: Function returning the current time in seconds
+            sleep: Function used to wait
+            jitter: Function returning a random fraction used to spread out retries
+        """
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.retries = 0
+        self.rate_limited = 0
+        self._clock = clock
+        self._sleep = sleep
+        self._jitter = jitter
+        limits = {"requests": requests_per_minute, "tokens": tokens_per_minute}
+        self._buckets = {
+            name: TokenBucket(per_minute, clock, sleep)
+            for name, per_minute in limits.items() if per_minute
+        }
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def call(self, func: Callable[[], Any], tokens: int = 0) -> Any:
+        """
+        Call a provider once the rate limits allow it, retrying rate limits and transient errors.
+
+        Args:
+            func: Function sending the request
+            tokens: Estimated tokens of the request
+
+        Returns:
+            Whatever func returns
+        """
+        attempt = 0
+        while True:
+            self._wait_for_capacity(tokens)
+            try:
+                result = func()
+            except Exception as error:
+                attempt = self._handle_failure(error, attempt)
+                continue
+            self._succeeded()
+            return result
+
+    def stream(self, func: Callable[[], Iterator[Any]], tokens: int = 0) -> Iterator[Any]:
+        """
+        Stream a provider's response once the rate limits allow it.
+
+        Failures before the first chunk are retried like in call; once chunks have been yielded
+        the error is raised, since the caller has already consumed part of the response.
+
+        Args:
+            func: Function starting the streamed request
+            tokens: Estimated tokens of the request
+
+        Yields:
+            The chunks produced by func
+        """
+        attempt = 0
+        while True:
+            self._wait_for_capacity(tokens)
+            started = False
+            try:
+                for chunk in func():
+                    started = True
+                    yield chunk
+            except Exception as error:
+                if started:
+                    raise
+                attempt = self._handle_failure(error, attempt)
+                continue
+            self._succeeded()
+            return
+
+    def debit_tokens(self, tokens: int) -> None:
+        """
+        Charge tokens that were only known after a response, such as the generated tokens.
+
+        Args:
+            tokens: Number of tokens to charge
+        """
+        if "tokens" in self._buckets:
+            self._buckets["tokens"].debit(tokens)
+
+    def stats(self) -> str:
+        """Describe the retry counts for display."""
+        return f"{self.retries} retries, {self.rate_limited} rate limited"
+
+    def _wait_for_capacity(self, tokens: int) -> None:
+        with self._lock:
+            pause = self._paused_until - self._clock()
+        if pause > 0:
+            self._sleep(pause)
+        if "requests" in self._buckets:
+            self._buckets["requests"].acquire(1)
+        if "tokens" in self._buckets and tokens:
+            self._buckets["tokens"].acquire(tokens)
+
+    def _handle_failure(self, error: Exception, attempt: int) -> int:
+        rate_limited = _status_code(error) == RATE_LIMIT_STATUS
+        if attempt >= self.max_retries or not (rate_limited or is_transient(error)):
+            raise error
+
+        delay = min(self.retry_max_seconds, self.retry_base_seconds * 2 ** attempt)
+        delay = delay / 2 + delay / 2 * self._jitter()
+        call = current_call()
+        if call is not None:
+            call.retries += 1
+        with self._lock:
+            self.retries += 1
+            if rate_limited:
+                # Every caller of the provider waits, and the pace drops until requests succeed
+                self.rate_limited += 1
+                delay = max(delay, _retry_after(error) or 0)
+                self._paused_until = max(self._paused_until, self._clock() + delay)
+                for bucket in self._buckets.values():
+                    bucket.rate_factor = max(MIN_RATE_FACTOR, bucket.rate_factor / 2)
+
+        self._sleep(delay)
+        return attempt + 1
+
+    def _succeeded(self) -> None:
+        # Recover the configured pace gradually after a rate limit
+        with self._lock:
+            for bucket in self._buckets.values():
+                if bucket.rate_factor < 1.0:
+                    bucket.rate_factor = min(1.0, bucket.rate_factor + 0.05)
+
+
+class RateLimitedGateway:
+    """LLM gateway wrapper sending every request through a provider's RateLimiter."""
+
+    def __init__(self, gateway, rate_limiter: RateLimiter):
+        """
+        Initialize the wrapper.
+
+        Args:
+            gateway: The wrapped OpenAI or Ollama gateway
+            rate_limiter: The limiter shared by every request to the provider
+        """
+        self.gateway = gateway
+        self.rate_limiter = rate_limiter
+        if hasattr(gateway, "complete_stream"):
+            self.complete_stream = self._complete_stream
+
+    def complete(self, **kwargs):
+        """Complete a request once the provider's rate limits allow it."""
+        response = self.rate_limiter.call(
+            lambda: self.gateway.complete(**kwargs), _request_tokens(kwargs))
+        self.rate_limiter.debit_tokens(estimate_tokens(getattr(response, "content", None) or ""))
+        return response
+
+    def _complete_stream(self, **kwargs):
+        generated = 0
+        for chunk in self.rate_limiter.stream(
+                lambda: self.gateway.complete_stream(**kwargs), _request_tokens(kwargs)):
+            generated += estimate_tokens(getattr(chunk, "content", None) or "")
+            yield chunk
+        self.rate_limiter.debit_tokens(generated)
+
+    def __getattr__(self, name: str):
+        # Everything else, e.g. the Ollama client used for preloading, goes to the gateway
+        if name == "gateway":
+            raise AttributeError(name)
+        return getattr(self.gateway, name)
+
+
+def gateway_name(gateway) -> str:
+    """
+    Get the class name of the gateway serving requests, looking through a RateLimitedGateway.
+
+    A gateway spreading requests over several hosts of one kind names that kind with its
+    GATEWAY_NAME class attribute.
+
+    Args:
+        gateway: An LLM gateway, possibly rate limited
+
+    Returns:
+        str: The name of the underlying gateway class
+    """
+    if isinstance(gateway, RateLimitedGateway):
+        gateway = gateway.gateway
+    return getattr(type(gateway), "GATEWAY_NAME", type(gateway).__name__)
+
+
+def is_transient(error: Exception) -> bool:
+    """
+    Check whether a failed request is worth retrying as it is.
+
+    Args:
+        error: The error raised by the provider
+
+    Returns:
+        True for connection problems, timeouts and server errors
+    """
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    if _status_code(error) in TRANSIENT_STATUSES:
+        return True
+    return type(error).__name__ in TRANSIENT_ERROR_NAMES
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    return getattr(error, "status_code", None)
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _request_tokens(kwargs) -> int:
+    messages = kwargs.get("messages") or []
+    return sum(estimate_tokens(getattr(message, "content", None) or "") for message in messages)
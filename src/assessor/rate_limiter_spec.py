@@ -0,0 +1,167 @@
+"""
+Tests for the rate_limiter module.
+"""
+
+import pytest
+
+from assessor.rate_limiter import RateLimitedGateway, RateLimiter, TokenBucket, gateway_name
+
+
+class FakeClock:
+    """Clock that only advances when something sleeps."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class ProviderError(Exception):
+    """Error carrying an HTTP status like the provider SDKs' errors."""
+
+    def __init__(self, status_code):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+class DescribeTokenBucket:
+    """Tests for the TokenBucket class."""
+
+    def should_grant_a_full_bucket_without_waiting(self):
+        """It should not wait while the bucket holds enough."""
+        clock = FakeClock()
+        bucket = TokenBucket(60, clock, clock.sleep)
+
+        bucket.acquire(60)
+
+        assert clock.sleeps == []
+
+    def should_wait_for_the_bucket_to_refill(self):
+        """It should wait as long as the missing amount takes to refill."""
+        clock = FakeClock()
+        bucket = TokenBucket(60, clock, clock.sleep)
+        bucket.acquire(60)
+
+        bucket.acquire(2)
+
+        assert clock.sleeps == [2.0]
+
+    def should_make_later_acquisitions_pay_off_a_debit(self):
+        """It should wait for a debt taken on after a response to be paid off."""
+        clock = FakeClock()
+        bucket = TokenBucket(60, clock, clock.sleep)
+        bucket.debit(90)
+
+        bucket.acquire(30)
+
+        assert clock.sleeps == [60.0]
+
+
+class DescribeRateLimiter:
+    """Tests for the RateLimiter class."""
+
+    def should_retry_a_rate_limited_request(self):
+        """It should back off and retry when the provider answers 429."""
+        clock = FakeClock()
+        limiter = RateLimiter(
+            requests_per_minute=60, clock=clock, sleep=clock.sleep, jitter=lambda: 1.0)
+        responses = iter([ProviderError(429), "response"])
+
+        def request():
+            response = next(responses)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        result = limiter.call(request)
+
+        assert result == "response"
+        assert limiter.stats() == "1 retries, 1 rate limited"
+
+    def should_slow_down_after_a_rate_limit(self):
+        """It should lower the request rate once the provider reports a rate limit."""
+        clock = FakeClock()
+        limiter = RateLimiter(
+            requests_per_minute=60, clock=clock, sleep=clock.sleep, jitter=lambda: 1.0)
+        responses = iter([ProviderError(429), "response"])
+
+        def request():
+            response = next(responses)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        limiter.call(request)
+
+        assert limiter._buckets["requests"].rate_factor < 1.0
+
+    def should_not_retry_a_request_the_provider_rejected(self):
+        """It should raise errors that retrying cannot fix straight away."""
+        clock = FakeClock()
+        limiter = RateLimiter(clock=clock, sleep=clock.sleep)
+
+        def request():
+            raise ProviderError(400)
+
+        with pytest.raises(ProviderError):
+            limiter.call(request)
+
+        assert limiter.retries == 0
+
+    def should_give_up_after_the_maximum_retries(self):
+        """It should raise the last error once every retry failed."""
+        clock = FakeClock()
+        limiter = RateLimiter(max_retries=2, clock=clock, sleep=clock.sleep)
+
+        def request():
+            raise ConnectionError("connection reset")
+
+        with pytest.raises(ConnectionError):
+            limiter.call(request)
+
+        assert limiter.retries == 2
+
+    def should_spread_retries_with_exponential_jittered_backoff(self):
+        """It should double the backoff for every retry, randomized within its upper half."""
+        clock = FakeClock()
+        limiter = RateLimiter(
+            max_retries=3, retry_base_seconds=1.0, clock=clock, sleep=clock.sleep,
+            jitter=lambda: 0.5)
+
+        def request():
+            raise ProviderError(503)
+
+        with pytest.raises(ProviderError):
+            limiter.call(request)
+
+        assert clock.sleeps == [0.75, 1.5, 3.0]
+
+
+class DescribeRateLimitedGateway:
+    """Tests for the RateLimitedGateway class."""
+
+    def should_send_requests_through_the_limiter(self, mocker):
+        """It should retry a gateway request that failed transiently."""
+        clock = FakeClock()
+        gateway = mocker.Mock(spec=["complete"])
+        gateway.complete.side_effect = [ProviderError(502), mocker.Mock(content="response")]
+        limited = RateLimitedGateway(gateway, RateLimiter(clock=clock, sleep=clock.sleep))
+
+        result = limited.complete(model="gpt-4.1-nano", messages=[])
+
+        assert result.content == "response"
+        assert gateway.complete.call_count == 2
+
+    def should_name_the_wrapped_gateway(self):
+        """It should report the wrapped gateway's class so cache keys are unchanged."""
+        limited = RateLimitedGateway(FakeClock(), RateLimiter())
+
+        result = gateway_name(limited)
+
+        assert result == "FakeClock"
@@ -0,0 +1,128 @@
+"""
+Response cache module for the assessor package.
+
+This module stores model responses on disk, keyed by a hash of everything that determines them,
+so that re-running the assessor does not regenerate outputs whose prompt and model are unchanged.
+"""
+
+import hashlib
+import json
+import os
+import pathlib
+import threading
+from typing import Any, Dict, Optional, Union
+
+
+class ResponseCache:
+    """Persistent, size-bounded, least-recently-used cache of model responses."""
+
+    def __init__(
+        self,
+        cache_folder: Union[str, pathlib.Path],
+        max_bytes: int,
+        refresh: bool = False
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_folder: Folder holding one file per cached response
+            max_bytes: Total size the cached responses may occupy before the least recently
+                       used entries are evicted
+            refresh: Ignore existing entries (every lookup misses) while still storing new ones
+        """
+        self.cache_folder = pathlib.Path(cache_folder)
+        self.max_bytes = max_bytes
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self._size = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(
+        prompt: str,
+        model_name: str,
+        gateway_type: str,
+        params: Dict[str, Any]
+    ) -> str:
+        """
+        Build the cache key for a generation request.
+
+        Args:
+            prompt: The prompt text sent to the model
+            model_name: Name of the model
+            gateway_type: Name of the gateway class serving the model
+            params: Generation parameters passed to the model
+
+        Returns:
+            Hex digest identifying the request
+        """
+        request = json.dumps(
+            {"prompt": prompt, "model": model_name, "gateway": gateway_type, "params": params},
+            sort_keys=True
+        )
+        return hashlib.sha256(request.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response, marking it as recently used.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            The cached response, or None on a miss
+        """
+        entry = self._entry_path(key)
+        with self._lock:
+            if self.refresh or not entry.is_file():
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            os.utime(entry)
+            return entry.read_text()
+
+    def put(self, key: str, response: str) -> None:
+        """
+        Store a response, evicting least recently used entries if the cache grows too large.
+
+        Args:
+            key: Cache key from make_key
+            response: The response to store
+        """
+        entry = self._entry_path(key)
+        with self._lock:
+            self.cache_folder.mkdir(parents=True, exist_ok=True)
+            if self._size is None:
+                self._size = sum(path.stat().st_size for path in self._entries())
+
+            replaced_size = entry.stat().st_size if entry.is_file() else 0
+
+            # Write to a temporary file first so a crash never leaves a truncated entry
+            temporary = entry.with_suffix(".tmp")
+            temporary.write_text(response)
+            temporary.replace(entry)
+
+            self._size += entry.stat().st_size - replaced_size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def stats(self) -> str:
+        """Describe the hit and miss counts for display."""
+        return f"{self.hits} hits, {self.misses} misses"
+
+    def _entry_path(self, key: str) -> pathlib.Path:
+        return self.cache_folder / f"{key}.md"
+
+    def _entries(self):
+        return self.cache_folder.glob("*.md")
+
+    def _evict(self) -> None:
+        entries = [(path, path.stat()) for path in self._entries()]
+        for path, stat in sorted(entries, key=lambda entry: entry[1].st_mtime_ns):
+            if self._size <= self.max_bytes:
+                break
+            path.unlink()
+            self._size -= stat.st_size
@@ -0,0 +1,59 @@
+"""
+Tests for the response_cache module.
+"""
+
+import os
+
+from assessor.response_cache import ResponseCache
+
+
+class DescribeResponseCache:
+    """Tests for the ResponseCache class."""
+
+    def should_return_stored_response_for_same_key(self, tmp_path):
+        """It should return a stored response and count a hit."""
+        cache = ResponseCache(tmp_path, max_bytes=1024)
+        key = cache.make_key("prompt", "model", "Gateway", {"temperature": 1.0})
+        cache.put(key, "response")
+
+        result = cache.get(key)
+
+        assert (result, cache.hits, cache.misses) == ("response", 1, 0)
+
+    def should_miss_for_unknown_key(self, tmp_path):
+        """It should return None and count a miss for a key that was never stored."""
+        cache = ResponseCache(tmp_path, max_bytes=1024)
+
+        result = cache.get("unknown")
+
+        assert (result, cache.hits, cache.misses) == (None, 0, 1)
+
+    def should_derive_distinct_keys_for_different_models(self):
+        """It should key the same prompt differently for different models."""
+        params = {"temperature": 1.0}
+
+        first = ResponseCache.make_key("prompt", "model-a", "Gateway", params)
+        second = ResponseCache.make_key("prompt", "model-b", "Gateway", params)
+
+        assert first != second
+
+    def should_ignore_existing_entries_when_refreshing(self, tmp_path):
+        """It should miss on existing entries when refresh is requested."""
+        ResponseCache(tmp_path, max_bytes=1024).put("key", "old response")
+        cache = ResponseCache(tmp_path, max_bytes=1024, refresh=True)
+
+        result = cache.get("key")
+
+        assert result is None
+
+    def should_evict_least_recently_used_entry_when_over_budget(self, tmp_path):
+        """It should evict the entry that was used least recently once the budget is exceeded."""
+        cache = ResponseCache(tmp_path, max_bytes=20)
+        cache.put("old", "0123456789")
+        cache.put("recent", "0123456789")
+        os.utime(tmp_path / "old.md", ns=(1, 1))
+        os.utime(tmp_path / "recent.md", ns=(2, 2))
+
+        cache.put("new", "0123456789")
+
+        assert sorted(path.stem for path in tmp_path.glob("*.md")) == ["new", "recent"]
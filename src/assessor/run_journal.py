@@ -0,0 +1,115 @@
+"""
+Run journal module for the assessor package.
+
+This module appends a line to a journal as each output and assessment of a run is written, so a
+run that dies halfway can be resumed without regenerating the files it already completed.
+"""
+
+import datetime
+import json
+import os
+import pathlib
+import threading
+from typing import Dict, Optional, Union
+
+from assessor.build_manifest import BuildManifest
+from assessor.file_gateway import FileGateway
+
+JOURNAL_FILE_NAME = ".assessor-journal.jsonl"
+
+
+class RunJournal:
+    """Append-only record of the files a run has completed, in JSON Lines format."""
+
+    def __init__(
+        self,
+        folder_path: Union[str, pathlib.Path],
+        resume: bool = False,
+        file_gateway: Optional[FileGateway] = None
+    ):
+        """
+        Initialize the journal.
+
+        Args:
+            folder_path: Folder holding the generated files and the journal
+            resume: Whether to continue the journal of a previous run; otherwise it is cleared
+                    and this run starts a new one
+            file_gateway: Optional FileGateway the run writes its files through, used to check
+                          them (defaults to a new instance)
+        """
+        self.path = pathlib.Path(folder_path) / JOURNAL_FILE_NAME
+        self.file_gateway = file_gateway or FileGateway()
+        self.resumed = 0
+        self.completed = 0
+        self._lock = threading.Lock()
+        if resume:
+            self._hashes = self._load()
+        else:
+            self._hashes = {}
+            self.path.unlink(missing_ok=True)
+
+    def is_complete(self, target: Union[str, pathlib.Path]) -> bool:
+        """
+        Check whether a file was completed earlier in the run and is still intact.
+
+        Counts the target as resumed when it is complete.
+
+        Args:
+            target: Path to the generated file
+
+        Returns:
+            True if the file was journaled and still has the journaled contents
+        """
+        target = pathlib.Path(target)
+        with self._lock:
+            recorded = self._hashes.get(target.name)
+        # Ask the run's gateway, which knows about writes it has queued or cached
+        if recorded is None or not self.file_gateway.file_exists(target):
+            return False
+        try:
+            content = self.file_gateway.read_file(target)
+        except OSError:
+            return False
+        if BuildManifest.content_hash(content) != recorded:
+            return False
+        with self._lock:
+            self.resumed += 1
+        return True
+
+    def record(self, target: Union[str, pathlib.Path], content: str) -> None:
+        """
+        Append a completed file to the journal, making sure the line reaches the disk.
+
+        Args:
+            target: Path to the generated file
+            content: The contents written to it
+        """
+        entry = {
+            "target": pathlib.Path(target).name,
+            "hash": BuildManifest.content_hash(content),
+            "completed_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        }
+        with self._lock:
+            with open(self.path, "a") as journal:
+                journal.write(json.dumps(entry) + "\n")
+                journal.flush()
+                os.fsync(journal.fileno())
+            self._hashes[entry["target"]] = entry["hash"]
+            self.completed += 1
+
+    def stats(self) -> str:
+        """Describe the resumed and completed counts for display."""
+        return f"{self.resumed} resumed, {self.completed} completed"
+
+    def _load(self) -> Dict[str, str]:
+        if not self.path.is_file():
+            return {}
+        hashes = {}
+        for line in self.path.read_text().splitlines():
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # A line cut short by the crash being recovered from
+                continue
+            hashes[entry["target"]] = entry["hash"]
+        return hashes
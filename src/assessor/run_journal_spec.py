@@ -0,0 +1,68 @@
+"""
+Tests for the run_journal module.
+"""
+
+from assessor.file_gateway import FileGateway
+from assessor.run_journal import RunJournal
+
+
+class DescribeRunJournal:
+    """Tests for the RunJournal class."""
+
+    def should_resume_a_file_completed_by_an_interrupted_run(self, tmp_path):
+        """It should treat a journaled file as complete when the run is resumed."""
+        target = tmp_path / "prompt-plain-output-model.md"
+        target.write_text("output")
+        RunJournal(tmp_path).record(target, "output")
+
+        journal = RunJournal(tmp_path, resume=True)
+        result = journal.is_complete(target)
+
+        assert result is True
+        assert journal.stats() == "1 resumed, 0 completed"
+
+    def should_start_a_new_journal_unless_resuming(self, tmp_path):
+        """It should forget the files of a previous run when not resuming."""
+        target = tmp_path / "prompt-plain-output-model.md"
+        target.write_text("output")
+        RunJournal(tmp_path).record(target, "output")
+
+        result = RunJournal(tmp_path).is_complete(target)
+
+        assert result is False
+
+    def should_not_resume_a_file_changed_since_it_was_journaled(self, tmp_path):
+        """It should regenerate a file whose contents no longer match the journal."""
+        target = tmp_path / "prompt-plain-output-model.md"
+        RunJournal(tmp_path).record(target, "output")
+        target.write_text("partial outp")
+
+        result = RunJournal(tmp_path, resume=True).is_complete(target)
+
+        assert result is False
+
+    def should_ignore_a_line_cut_short_by_a_crash(self, tmp_path):
+        """It should load the complete lines of a journal whose last line was cut short."""
+        target = tmp_path / "prompt-plain-output-model.md"
+        target.write_text("output")
+        journal = RunJournal(tmp_path)
+        journal.record(target, "output")
+        with open(journal.path, "a") as journal_file:
+            journal_file.write('{"target": "prompt-fancy-out')
+
+        result = RunJournal(tmp_path, resume=True).is_complete(target)
+
+        assert result is True
+
+    def should_check_files_through_the_run_s_gateway(self, tmp_path, mocker):
+        """It should resume a file the gateway still holds though it has not reached the disk."""
+        target = tmp_path / "prompt-plain-output-model.md"
+        file_gateway = mocker.Mock(spec=FileGateway)
+        file_gateway.file_exists.return_value = True
+        file_gateway.read_file.return_value = "output"
+        RunJournal(tmp_path, file_gateway=file_gateway).record(target, "output")
+
+        result = RunJournal(tmp_path, resume=True, file_gateway=file_gateway).is_complete(target)
+
+        assert result is True
+        file_gateway.read_file.assert_called_once_with(target)
@@ -0,0 +1,92 @@
+"""
+Similarity module for the assessor package.
+
+This module compares outputs locally by the token n-grams they share, so near-identical outputs
+(common when many small models answer the same prompt) can be grouped and only one
+representative of each group sent to the assessment model.
+"""
+
+import re
+from typing import FrozenSet, List, Optional, Tuple
+
+# Words, numbers and individual punctuation characters, so code and prose tokenize alike
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+# Number of consecutive tokens in each compared n-gram
+NGRAM_SIZE = 3
+
+Shingles = FrozenSet[Tuple[str, ...]]
+
+
+def shingles(text: str, size: int = NGRAM_SIZE) -> Shingles:
+    """
+    Get the set of token n-grams of a text.
+
+    Args:
+        text: The text to split
+        size: Number of tokens in each n-gram
+
+    Returns:
+        frozenset: The distinct n-grams; a text shorter than one n-gram is a single n-gram
+    """
+    tokens = TOKEN_PATTERN.findall(text)
+    if len(tokens) < size:
+        return frozenset([tuple(tokens)]) if tokens else frozenset()
+    return frozenset(tuple(tokens[start:start + size]) for start in range(len(tokens) - size + 1))
+
+
+def jaccard(first: Shingles, second: Shingles) -> float:
+    """
+    Get the Jaccard similarity of two n-gram sets.
+
+    Args:
+        first: N-grams of the first text
+        second: N-grams of the second text
+
+    Returns:
+        float: Shared n-grams divided by all n-grams, 1.0 for two empty texts
+    """
+    if not first and not second:
+        return 1.0
+    return len(first & second) / len(first | second)
+
+
+def group_similar(
+    texts: List[str],
+    threshold: Optional[float],
+    size: int = NGRAM_SIZE
+) -> List[List[int]]:
+    """
+    Group texts whose n-gram similarity to a group's first text reaches a threshold.
+
+    Each text joins the first group whose representative (its first text) is similar enough, or
+    starts a new group, so every text is compared with the representatives only.
+
+    Args:
+        texts: The texts to group, in order
+        threshold: Minimum Jaccard similarity to join a group, or None to keep every text apart
+        size: Number of tokens in each n-gram
+
+    Returns:
+        list: Groups of text indexes, in order of their representatives
+    """
+    if threshold is None:
+        return [[index] for index in range(len(texts))]
+
+    groups: List[List[int]] = []
+    representatives: List[Shingles] = []
+    for index, text in enumerate(texts):
+        text_shingles = shingles(text, size)
+        for group, representative in zip(groups, representatives):
+            # The similarity cannot exceed the ratio of the set sizes, so skip the intersection
+            # for texts of very different lengths
+            smaller, larger = sorted((len(text_shingles), len(representative)))
+            if larger and smaller / larger < threshold:
+                continue
+            if jaccard(text_shingles, representative) >= threshold:
+                group.append(index)
+                break
+        else:
+            groups.append([index])
+            representatives.append(text_shingles)
+    return groups
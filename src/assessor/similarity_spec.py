@@ -0,0 +1,60 @@
+"""
+Tests for the similarity module.
+"""
+
+from assessor.similarity import group_similar, jaccard, shingles
+
+
+class DescribeShingles:
+    """Tests for the shingles function."""
+
+    def should_split_a_text_into_token_ngrams(self):
+        """It should return each run of consecutive tokens once."""
+        result = shingles("def f(x): return x", size=3)
+
+        assert ("def", "f", "(") in result
+        assert ("return", "x") not in result
+        assert len(result) == 6
+
+    def should_keep_a_short_text_as_one_ngram(self):
+        """It should treat a text shorter than an n-gram as a single n-gram."""
+        result = shingles("hello world", size=3)
+
+        assert result == frozenset([("hello", "world")])
+
+
+class DescribeJaccard:
+    """Tests for the jaccard function."""
+
+    def should_divide_shared_ngrams_by_all_ngrams(self):
+        """It should return the share of n-grams the texts have in common."""
+        result = jaccard(shingles("a b c d", size=2), shingles("a b c e", size=2))
+
+        assert result == 0.5
+
+
+class DescribeGroupSimilar:
+    """Tests for the group_similar function."""
+
+    def should_group_near_identical_texts(self):
+        """It should put texts above the threshold in the group of the first such text."""
+        code = "def add(a, b):\n    return a + b\n"
+        texts = [code, "Something else entirely, with no code at all.", code + "\n"]
+
+        result = group_similar(texts, 0.9)
+
+        assert result == [[0, 2], [1]]
+
+    def should_keep_texts_below_the_threshold_apart(self):
+        """It should give texts that differ too much groups of their own."""
+        texts = ["def add(a, b): return a + b", "def sub(a, b): return a - b"]
+
+        result = group_similar(texts, 0.9)
+
+        assert result == [[0], [1]]
+
+    def should_keep_every_text_apart_without_a_threshold(self):
+        """It should not group anything when grouping is turned off."""
+        result = group_similar(["same", "same"], None)
+
+        assert result == [[0], [1]]
@@ -0,0 +1,104 @@
+"""
+Sweep plan module for the assessor package.
+
+This module works out from the folder's filenames which outputs and assessments a sweep
+produces and which of them already exist, so a sweep can be previewed, or scripted around,
+without loading the LLM clients or calling a model.
+"""
+
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Union
+
+from assessor.config import default_config, Config
+from assessor.file_gateway import FileGateway
+from assessor.file_processor import create_assessment_file_path, create_output_file_path, \
+    get_prompt_files, output_model_name
+from assessor.folder_index import CROSS_ASSESSMENT_PREFIX, FileKind, FolderIndex
+
+
+class PlannedFile(NamedTuple):
+    """A file a sweep produces, and whether the folder already has it."""
+
+    path: Path
+    kind: FileKind
+    exists: bool
+
+
+def plan_sweep(
+    folder_path: Union[str, Path],
+    use_openai: bool = True,
+    use_ollama: bool = True,
+    prompt_pattern: Optional[str] = None,
+    config: Optional[Config] = None,
+    file_gateway: Optional[FileGateway] = None,
+    samples: int = 1,
+    compare_styles: Optional[List[str]] = None,
+    index: Optional[FolderIndex] = None
+) -> List[PlannedFile]:
+    """
+    List the outputs, assessments and cross-prompt assessments a sweep produces.
+
+    Args:
+        folder_path: Path to the folder containing the prompt files
+        use_openai: Whether to use OpenAI models
+        use_ollama: Whether to use Ollama models
+        prompt_pattern: Optional comma-separated list of style names to filter prompt files
+        config: Optional Config instance providing the models (defaults to default_config)
+        file_gateway: Optional FileGateway instance (defaults to a new instance)
+        samples: Number of replicate generations per prompt file and model
+        compare_styles: Optional prompt styles compared in cross-prompt assessments
+        index: Optional FolderIndex of the folder (defaults to scanning the folder)
+
+    Returns:
+        list: The planned files, outputs first, each marked with whether it exists
+    """
+    # Use provided config or default
+    config = config or default_config
+
+    # Use provided index or scan the folder
+    index = index or FolderIndex.from_folder(folder_path, file_gateway, samples)
+
+    existing = {record.path.name for kind in FileKind for record in index.files(kind)}
+    prompt_files = get_prompt_files(folder_path, prompt_pattern, file_gateway, index)
+    sample_numbers = [None] if samples == 1 else list(range(1, samples + 1))
+    model_names = [
+        *(config.openai_models if use_openai else []),
+        *(config.ollama_models if use_ollama else []),
+    ]
+
+    planned = [
+        (create_output_file_path(file_path, model_name, sample), FileKind.OUTPUT)
+        for model_name in model_names
+        for file_path in prompt_files
+        for sample in sample_numbers
+    ]
+    planned.extend(
+        (create_assessment_file_path(file_path), FileKind.ASSESSMENT) for file_path in prompt_files
+        if model_names
+    )
+    if compare_styles and len(compare_styles) >= 2:
+        planned.extend(
+            (Path(folder_path) / f"{CROSS_ASSESSMENT_PREFIX}{output_model_name(model_name)}.md",
+             FileKind.CROSS_ASSESSMENT)
+            for model_name in model_names
+        )
+    return [PlannedFile(path, kind, path.name in existing) for path, kind in planned]
+
+
+def format_plan(plan: List[PlannedFile]) -> str:
+    """
+    Format a sweep plan as one line per file followed by the totals of each kind.
+
+    Args:
+        plan: The planned files
+
+    Returns:
+        str: The plan, with missing files marked "new"
+    """
+    rows = [f"{'exists' if file.exists else 'new':<7} {file.path.name}" for file in plan]
+    for kind in (FileKind.OUTPUT, FileKind.ASSESSMENT, FileKind.CROSS_ASSESSMENT):
+        files = [file for file in plan if file.kind == kind]
+        if files:
+            missing = sum(not file.exists for file in files)
+            rows.append(f"{kind.value}: {len(files)} planned, {missing} new")
+    return "\n".join(rows)
@@ -0,0 +1,53 @@
+"""
+Tests for the sweep_plan module.
+"""
+
+from assessor.config import Config
+from assessor.folder_index import FileKind
+from assessor.sweep_plan import format_plan, plan_sweep
+
+
+class DescribePlanSweep:
+    """Tests for the plan_sweep function."""
+
+    def should_plan_an_output_per_prompt_model_and_sample(self, tmp_path):
+        """It should list every output of the sweep's matrix, marking the existing ones."""
+        (tmp_path / "prompt-plain.md").write_text("Write a haiku")
+        (tmp_path / "prompt-plain-output-gpt-4.1-nano-s1.md").write_text("A haiku")
+        config = Config(openai_models=["gpt-4.1-nano"], ollama_models=["qwen3:32b"])
+
+        result = plan_sweep(tmp_path, use_ollama=False, config=config, samples=2)
+
+        outputs = [file for file in result if file.kind == FileKind.OUTPUT]
+        assert [(file.path.name, file.exists) for file in outputs] == [
+            ("prompt-plain-output-gpt-4.1-nano-s1.md", True),
+            ("prompt-plain-output-gpt-4.1-nano-s2.md", False),
+        ]
+
+    def should_plan_a_cross_prompt_assessment_per_model_when_comparing(self, tmp_path):
+        """It should name each model's cross-prompt assessment as the assessment phase does."""
+        (tmp_path / "prompt-plain.md").write_text("Write a haiku")
+        (tmp_path / "prompt-fancy.md").write_text("Compose a haiku")
+        config = Config(openai_models=["gpt-4.1-nano"], ollama_models=["qwen3:32b"])
+
+        result = plan_sweep(tmp_path, config=config, compare_styles=["plain", "fancy"])
+
+        assert [file.path.name for file in result if file.kind == FileKind.CROSS_ASSESSMENT] == [
+            "cross-prompt-assessment-gpt-4.1-nano.md", "cross-prompt-assessment-qwen3-32b.md",
+        ]
+
+
+class DescribeFormatPlan:
+    """Tests for the format_plan function."""
+
+    def should_total_the_new_files_of_each_kind(self, tmp_path):
+        """It should end with the number of planned and new files of each kind."""
+        (tmp_path / "prompt-plain.md").write_text("Write a haiku")
+        (tmp_path / "prompt-plain-assessment.md").write_text("An assessment")
+        config = Config(openai_models=["gpt-4.1-nano", "gpt-4.1-mini"])
+
+        result = format_plan(plan_sweep(tmp_path, use_ollama=False, config=config))
+
+        assert result.splitlines()[-2:] == [
+            "output: 2 planned, 2 new", "assessment: 1 planned, 0 new",
+        ]
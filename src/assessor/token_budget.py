@@ -0,0 +1,123 @@
+"""
+Token budget module for the assessor package.
+
+This module estimates how many tokens a request will use and splits the files of an assessment
+into groups that each fit the assessment model's token budget, so large output sets can be
+assessed group by group and the partial assessments merged afterwards. It also estimates how
+much of a request the provider can serve from its prompt cache, which holds the prefixes of
+recent requests to the same model.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List
+
+# Rough number of characters per token for English prose and code
+CHARS_PER_TOKEN = 4
+
+# Providers only cache prompt prefixes of at least this many tokens, extended in blocks of
+# this many tokens, and keep them for a few minutes after their last use
+PROMPT_CACHE_MIN_TOKENS = 1024
+PROMPT_CACHE_BLOCK_TOKENS = 128
+PROMPT_CACHE_SECONDS = 300
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text without calling a tokenizer.
+
+    Args:
+        text: The text to estimate
+
+    Returns:
+        int: The estimated token count, rounded up
+    """
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def plan_groups(item_tokens: List[int], budget: int, fixed_tokens: int = 0) -> List[List[int]]:
+    """
+    Split items into consecutive groups that each fit a token budget.
+
+    Every group is sent together with the same fixed content (the instructions and the source
+    file), so only the budget left after the fixed tokens is available for the items. An item
+    too large to share a group is placed in a group of its own.
+
+    Args:
+        item_tokens: Estimated token count of each item, in order
+        budget: Maximum tokens of one request
+        fixed_tokens: Tokens every request spends before the items
+
+    Returns:
+        list: Groups of item indexes, in order; a single group when everything fits
+    """
+    available = budget - fixed_tokens
+    groups: List[List[int]] = []
+    group_tokens = 0
+    for index, tokens in enumerate(item_tokens):
+        if groups and group_tokens + tokens <= available:
+            groups[-1].append(index)
+            group_tokens += tokens
+        else:
+            groups.append([index])
+            group_tokens = tokens
+    return groups
+
+
+class PromptPrefixTracker:
+    """
+    Thread-safe record of the prompts recently sent to each model, used to estimate how many of
+    a new prompt's tokens the provider's prompt cache will serve.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = PROMPT_CACHE_SECONDS,
+        max_prompts: int = 64,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the tracker.
+
+        Args:
+            ttl_seconds: Time after its last use a prompt is assumed to leave the cache
+            max_prompts: Number of recent prompts remembered per model
+            clock: Function returning the current time in seconds
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_prompts = max_prompts
+        self._clock = clock
+        self._sent: Dict[str, "OrderedDict[str, float]"] = {}
+        self._lock = threading.Lock()
+
+    def cached_tokens(self, model: str, prompt: str) -> int:
+        """
+        Record a prompt sent to a model and estimate how many of its tokens are cached.
+
+        Args:
+            model: Name of the model the prompt is sent to
+            prompt: The prompt text
+
+        Returns:
+            int: Estimated tokens of the longest prefix shared with a recent prompt, rounded
+                 down to what the cache holds; 0 when the prefix is too short to be cached
+        """
+        now = self._clock()
+        with self._lock:
+            sent = self._sent.setdefault(model, OrderedDict())
+            for previous, sent_at in list(sent.items()):
+                if now - sent_at > self.ttl_seconds:
+                    del sent[previous]
+            shared = max(
+                (len(os.path.commonprefix([previous, prompt])) for previous in sent), default=0)
+            sent[prompt] = now
+            sent.move_to_end(prompt)
+            while len(sent) > self.max_prompts:
+                sent.popitem(last=False)
+
+        tokens = shared // CHARS_PER_TOKEN
+        if tokens < PROMPT_CACHE_MIN_TOKENS:
+            return 0
+        return tokens - (tokens - PROMPT_CACHE_MIN_TOKENS) % PROMPT_CACHE_BLOCK_TOKENS
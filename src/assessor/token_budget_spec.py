@@ -0,0 +1,84 @@
+"""
+Tests for the token_budget module.
+"""
+
+from assessor.token_budget import PromptPrefixTracker, estimate_tokens, plan_groups
+
+
+class DescribeEstimateTokens:
+    """Tests for the estimate_tokens function."""
+
+    def should_round_partial_tokens_up(self):
+        """It should count a trailing partial token as a whole token."""
+        result = estimate_tokens("abcde")
+
+        assert result == 2
+
+    def should_estimate_empty_text_as_no_tokens(self):
+        """It should estimate zero tokens for empty text."""
+        result = estimate_tokens("")
+
+        assert result == 0
+
+
+class DescribePlanGroups:
+    """Tests for the plan_groups function."""
+
+    def should_keep_items_together_when_they_fit(self):
+        """It should plan a single group when every item fits the budget."""
+        result = plan_groups([10, 20, 30], budget=100, fixed_tokens=40)
+
+        assert result == [[0, 1, 2]]
+
+    def should_split_items_exceeding_the_budget(self):
+        """It should start a new group whenever the next item would exceed the budget."""
+        result = plan_groups([30, 30, 30, 30], budget=100, fixed_tokens=30)
+
+        assert result == [[0, 1], [2, 3]]
+
+    def should_place_an_oversized_item_in_its_own_group(self):
+        """It should give an item larger than the budget a group of its own."""
+        result = plan_groups([10, 500, 10], budget=100)
+
+        assert result == [[0], [1], [2]]
+
+    def should_plan_no_groups_for_no_items(self):
+        """It should plan nothing when there are no items."""
+        result = plan_groups([], budget=100)
+
+        assert result == []
+
+
+class DescribePromptPrefixTracker:
+    """Tests for the PromptPrefixTracker class."""
+
+    def should_count_the_prefix_shared_with_a_recent_prompt_as_cached(self):
+        """It should estimate the shared prefix, in cache blocks, as cached tokens."""
+        tracker = PromptPrefixTracker()
+        shared = "x" * 4 * 1200
+        tracker.cached_tokens("o1", shared + "first model's outputs")
+
+        result = tracker.cached_tokens("o1", shared + "second model's outputs")
+
+        assert result == 1152
+
+    def should_not_count_a_prefix_too_short_to_be_cached(self):
+        """It should estimate no cached tokens when the shared prefix is below the minimum."""
+        tracker = PromptPrefixTracker()
+        tracker.cached_tokens("o1", "guidelines" + "first")
+
+        result = tracker.cached_tokens("o1", "guidelines" + "second")
+
+        assert result == 0
+
+    def should_forget_prompts_once_they_leave_the_cache(self):
+        """It should estimate no cached tokens for a prompt sent longer ago than the cache lasts."""
+        now = [0.0]
+        tracker = PromptPrefixTracker(ttl_seconds=300, clock=lambda: now[0])
+        shared = "x" * 4 * 2048
+        tracker.cached_tokens("o1", shared + "first")
+        now[0] += 301
+
+        result = tracker.cached_tokens("o1", shared + "second")
+
+        assert result == 0
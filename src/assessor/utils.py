@@ -2,6 +2,7 @@
 Utility functions for the assessor module.
 """
 
+import asyncio
 import re
 
 def strip_thinking(text):
@@ -14,4 +15,100 @@ def strip_thinking(text):
     Returns:
         str: The text with thinking sections removed
     """
-    return re.sub(r'<think>.*?</think>', '', text, flags=re.DOTALL)
\ No newline at end of file
+    return re.sub(r'<think>.*?</think>', '', text, flags=re.DOTALL)
+
+class ThinkingFilter:
+    """
+    Incrementally remove <think>...</think> sections from a streamed response.
+
+    Outside thinking sections only a possible partial tag is held back between chunks. Inside
+    one the thinking is held until its closing tag arrives, because, as with strip_thinking, an
+    unterminated <think> section is kept in the response rather than dropped.
+    """
+
+    OPEN_TAG = "<think>"
+    CLOSE_TAG = "</think>"
+
+    def __init__(self):
+        self._buffer = ""
+        self._thinking = False
+        self._held_thinking = []
+
+    def feed(self, chunk):
+        """
+        Filter the next chunk of the response.
+
+        Args:
+            chunk (str): Text received from the model
+
+        Returns:
+            str: The text from this chunk that lies outside thinking sections and can be emitted
+        """
+        self._buffer += chunk
+        visible = []
+
+        tag = self._current_tag()
+        index = self._buffer.find(tag)
+        while index != -1:
+            if not self._thinking:
+                visible.append(self._buffer[:index])
+            self._held_thinking = []
+            self._buffer = self._buffer[index + len(tag):]
+            self._thinking = not self._thinking
+            tag = self._current_tag()
+            index = self._buffer.find(tag)
+
+        # Hold back a suffix that may turn out to be the start of the next tag
+        split = len(self._buffer) - _partial_tag_length(self._buffer, tag)
+        if self._thinking:
+            self._held_thinking.append(self._buffer[:split])
+        else:
+            visible.append(self._buffer[:split])
+        self._buffer = self._buffer[split:]
+
+        return "".join(visible)
+
+    def flush(self):
+        """
+        Finish filtering once the response is complete.
+
+        Returns:
+            str: Any held-back text that turned out not to be a tag, and an unterminated
+                 thinking section with its opening tag
+        """
+        remaining = self._buffer
+        if self._thinking:
+            remaining = self.OPEN_TAG + "".join(self._held_thinking) + remaining
+        self._buffer = ""
+        self._thinking = False
+        self._held_thinking = []
+        return remaining
+
+    def _current_tag(self):
+        return self.CLOSE_TAG if self._thinking else self.OPEN_TAG
+
+def _partial_tag_length(text, tag):
+    """Length of the longest proper prefix of tag that text ends with."""
+    for length in range(min(len(tag) - 1, len(text)), 0, -1):
+        if text.endswith(tag[:length]):
+            return length
+    return 0
+
+async def run_in_thread(func, *args, semaphore=None, **kwargs):
+    """
+    Run a blocking call on a worker thread, optionally bounded by a semaphore.
+
+    Args:
+        func: The blocking callable to run
+        *args: Positional arguments for the callable
+        semaphore: Optional asyncio.Semaphore limiting how many calls are in flight
+        **kwargs: Keyword arguments for the callable
+
+    Returns:
+        The callable's return value
+    """
+    if semaphore is None:
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    async with semaphore:
+        return await asyncio.to_thread(func, *args, **kwargs)
@@ -0,0 +1,54 @@
+"""
+Tests for the utils module.
+"""
+
+from assessor.utils import ThinkingFilter, strip_thinking
+
+
+def _filter_chunks(chunks):
+    thinking_filter = ThinkingFilter()
+    visible = "".join(thinking_filter.feed(chunk) for chunk in chunks)
+    return visible + thinking_filter.flush()
+
+
+class DescribeStripThinking:
+    """Tests for the strip_thinking function."""
+
+    def should_remove_thinking_sections(self):
+        """It should remove every <think>...</think> section, including multi-line ones."""
+        result = strip_thinking("<think>plan\nmore</think>answer<think>x</think>!")
+
+        assert result == "answer!"
+
+
+class DescribeThinkingFilter:
+    """Tests for the ThinkingFilter class."""
+
+    def should_remove_thinking_sections_split_across_chunks(self):
+        """It should recognise tags even when a chunk boundary falls inside them."""
+        result = _filter_chunks(["<th", "ink>plan</th", "ink>ans", "wer"])
+
+        assert result == "answer"
+
+    def should_emit_text_that_only_resembles_a_tag(self):
+        """It should release held-back text that turned out not to be a tag."""
+        result = _filter_chunks(["if a <", "b: return a <th"])
+
+        assert result == "if a <b: return a <th"
+
+    def should_emit_visible_text_before_the_response_completes(self):
+        """It should release text outside thinking sections as soon as it is received."""
+        thinking_filter = ThinkingFilter()
+        thinking_filter.feed("<think>plan</think>")
+
+        result = thinking_filter.feed("def add")
+
+        assert result == "def add"
+
+    def should_keep_an_unterminated_thinking_section_like_strip_thinking(self):
+        """It should give the same text as strip_thinking when a <think> is never closed."""
+        response = "<think>a</think>answer <think>never closed"
+
+        result = _filter_chunks(["<think>a</th", "ink>answer <thi", "nk>never ", "closed"])
+
+        assert result == strip_thinking(response) == "answer <think>never closed"